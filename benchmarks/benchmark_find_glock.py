@@ -0,0 +1,55 @@
+#!/usr/bin/python
+"""
+A benchmark of looking up glocks by type and inode. Each glock that has a
+holder in a snapshot is looked up in all the snapshots with
+find_glock_in_snapshots() and with a scan of the glocks of each snapshot.
+
+$ PYTHONPATH=. python benchmarks/benchmark_find_glock.py [snapshot count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+
+from glocktop_data import generate_lines
+
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.snapshot import find_glock_in_snapshots
+
+def scan_glock_in_snapshots(snapshots, glock_type, glock_inode):
+    snapshots_glock = []
+    for snapshot in snapshots:
+        for glock in snapshot.get_glocks():
+            if ((glock_type == str(glock.get_type())) and (glock_inode == str(glock.get_inode()))):
+                snapshots_glock.append((snapshot, glock))
+                break
+    return snapshots_glock
+
+def lookup(function, snapshots, glocks_keys):
+    found = 0
+    for (glock_type, glock_inode) in glocks_keys:
+        found += len(function(snapshots, glock_type, glock_inode))
+    return found
+
+if __name__ == "__main__":
+    snapshot_count = 500
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    snapshots = list(parse_snapshots([line.strip() for line in generate_lines(snapshot_count=snapshot_count)]))
+    glocks_keys = []
+    for snapshot in snapshots[:50]:
+        for glock in snapshot.get_glock_holders():
+            glocks_keys.append((str(glock.get_type()), str(glock.get_inode())))
+    results = []
+    for (name, function) in [("scan", scan_glock_in_snapshots), ("index", find_glock_in_snapshots)]:
+        start_time = time.time()
+        found = lookup(function, snapshots, glocks_keys)
+        elapsed_time = time.time() - start_time
+        results.append(found)
+        print "%-8s %8d lookups %10d found %10.3f secs" %(name, len(glocks_keys) * len(snapshots), found, elapsed_time)
+    if (not results[0] == results[1]):
+        print "The number of glocks found is not the same."
+        sys.exit(1)
@@ -0,0 +1,77 @@
+#!/usr/bin/python
+"""
+Reports the number of bytes used for each glock and each glock holder that is
+parsed. The size of an object includes the size of its attributes, and a string
+or list that is shared by more than one object is only counted once.
+
+Run it against two checkouts to compare a change:
+$ PYTHONPATH=<checkout> python benchmarks/benchmark_glock_memory.py [snapshot count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+
+from glocktop_data import generate_lines
+
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+
+def get_attributes(obj):
+    # Returns the values of the attributes in the __dict__ or __slots__ of the
+    # object.
+    if (hasattr(obj, "__dict__")):
+        return obj.__dict__.values()
+    attributes = []
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if (name.startswith("__") and (not name.endswith("__"))):
+                name = "_%s%s" %(cls.__name__.lstrip("_"), name)
+            if (hasattr(obj, name)):
+                attributes.append(getattr(obj, name))
+    return attributes
+
+def get_size(obj, seen):
+    # Returns the size of the object and the objects it references that have
+    # not been seen before.
+    if ((obj == None) or (id(obj) in seen)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if (isinstance(obj, (list, tuple))):
+        for item in obj:
+            size += get_size(item, seen)
+    elif (isinstance(obj, dict)):
+        for (key, value) in obj.items():
+            size += get_size(key, seen) + get_size(value, seen)
+    elif (hasattr(obj, "__dict__") or hasattr(type(obj), "__slots__")):
+        if (hasattr(obj, "__dict__")):
+            size += sys.getsizeof(obj.__dict__)
+        for value in get_attributes(obj):
+            size += get_size(value, seen)
+    return size
+
+if __name__ == "__main__":
+    snapshot_count = 500
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    glocks = []
+    glock_holders = []
+    for snapshot in parse_snapshots([line.strip() for line in generate_lines(snapshot_count=snapshot_count)],
+                                    show_ended_process_and_tlocks=True):
+        for glock in snapshot.get_glocks():
+            glocks.append(glock)
+            glock_holders += glock.get_holders()
+    # The holders are counted first, so that they are not counted again as part
+    # of the glocks.
+    seen = set()
+    glock_holders_size = 0
+    for glock_holder in glock_holders:
+        glock_holders_size += get_size(glock_holder, seen)
+    glocks_size = 0
+    for glock in glocks:
+        glocks_size += get_size(glock, seen)
+    print "%-14s %10d %10.1f bytes each" %("glocks", len(glocks), glocks_size / float(max(len(glocks), 1)))
+    print "%-14s %10d %10.1f bytes each" %("glock holders", len(glock_holders),
+                                         glock_holders_size / float(max(len(glock_holders), 1)))
@@ -0,0 +1,67 @@
+#!/usr/bin/python
+"""
+A benchmark of the queries of the GlocksColumns with numpy and without numpy,
+and of the time it takes to feed the snapshots to the plugins that use the
+GlocksColumns.
+
+$ PYTHONPATH=.:benchmarks python benchmarks/benchmark_glocks_columns.py [snapshot count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+
+from glocktop_data import generate_lines
+from benchmark_plugins import benchmark
+
+import glocktop_analyze.glocks_columns
+from glocktop_analyze.glocks_columns import GlocksColumns
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.plugins import PluginsDispatcher
+from glocktop_analyze.plugins.glocks_high_demote_seconds import GlocksHighDemoteSeconds
+from glocktop_analyze.plugins.glocks_in_snapshots import GlocksInSnapshots
+from glocktop_analyze.plugins.glocks_waiters_time import GlocksWaitersTime
+
+def query(glocks_columns):
+    glocks_in_snapshots = glocks_columns.get_glocks_in_snapshots(require_holders_or_object=True)
+    holders_count_sums = glocks_columns.get_holders_count_sums()
+    glocks_id = [glock_id for glock_id in range(0, len(holders_count_sums)) if (holders_count_sums[glock_id] > 2)]
+    return (glocks_in_snapshots, holders_count_sums, list(glocks_columns.get_demote_times()),
+            glocks_columns.get_holders_count_by_snapshot(glocks_id))
+
+def feed_plugins(snapshots):
+    dispatcher = PluginsDispatcher([GlocksHighDemoteSeconds([], "", {}), GlocksInSnapshots([], "", {}),
+                                    GlocksWaitersTime([], "", {})])
+    dispatcher.begin()
+    for snapshot in snapshots:
+        dispatcher.feed(snapshot)
+    dispatcher.finish()
+    return dispatcher.get_plugins()
+
+if __name__ == "__main__":
+    snapshot_count = 2000
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    snapshots = list(parse_snapshots([line.strip() for line in generate_lines(snapshot_count=snapshot_count)]))
+    glocks_columns = GlocksColumns(keep_rows=True)
+    start_time = time.time()
+    for snapshot in snapshots:
+        glocks_columns.add_snapshot(snapshot)
+    print "%-22s %8d snapshots %10.3f secs" %("add_snapshot", len(snapshots), time.time() - start_time)
+    benchmark("feed_plugins", feed_plugins, snapshots)
+    results = []
+    numpy = glocktop_analyze.glocks_columns.numpy
+    for (name, numpy_module) in [("query_numpy", numpy), ("query_python", None)]:
+        if ((name == "query_numpy") and (numpy_module == None)):
+            print "numpy is not installed."
+            continue
+        glocktop_analyze.glocks_columns.numpy = numpy_module
+        results.append(query(glocks_columns))
+        benchmark(name, lambda snapshots: query(glocks_columns), snapshots)
+    glocktop_analyze.glocks_columns.numpy = numpy
+    if ((len(results) > 1) and (not results[0] == results[1])):
+        print "The results of the queries are not the same."
+        sys.exit(1)
@@ -0,0 +1,84 @@
+#!/usr/bin/python
+"""
+A benchmark of the GlocksWaitersTime plugin on a long capture. The time it
+takes to feed the snapshots to the plugin and to create the values of the
+graphs in finish() are printed. The values of the graphs are checked against
+values created by searching the list of the snapshots times for the time of each
+value.
+
+$ PYTHONPATH=.:benchmarks python benchmarks/benchmark_glocks_waiters_time.py [snapshot count] [inodes count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+
+from glocktop_data import generate_lines
+
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.plugins import PluginsDispatcher
+from glocktop_analyze.plugins.glocks_waiters_time import GlocksWaitersTime
+
+def get_index_in_list(date_time_list, date_time):
+    for index in range(0, len(date_time_list)):
+        if (date_time_list[index] == date_time):
+            return index
+    return -1
+
+def get_y_axis_by_date(snapshots, hashkeys):
+    # Returns the values of the graphs by searching the list of the snapshots
+    # times for the time of each value.
+    snapshots_date_time = [snapshot.get_date_time() for snapshot in snapshots]
+    glocks_holder_waiters_by_date = {}
+    for snapshot in snapshots:
+        for glock in snapshot.get_glocks():
+            hashkey = "%s/%s" %(glock.get_type(), glock.get_inode())
+            if (hashkey in hashkeys):
+                glocks_holder_waiters_by_date.setdefault(hashkey, []).append((snapshot.get_date_time(),
+                                                                              len(glock.get_holders())))
+    y_axis = {}
+    for hashkey in glocks_holder_waiters_by_date.keys():
+        y_axis[hashkey] = [None] * len(snapshots_date_time)
+        for t in glocks_holder_waiters_by_date.get(hashkey):
+            y_axis[hashkey][get_index_in_list(snapshots_date_time, t[0])] = t[1]
+    return y_axis
+
+if __name__ == "__main__":
+    snapshot_count = 10000
+    inodes_count = 1700
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    if (len(sys.argv) > 2):
+        inodes_count = int(sys.argv[2])
+    snapshots = list(parse_snapshots([line.strip() for line in generate_lines(snapshot_count=snapshot_count,
+                                                                              inodes_count=inodes_count)]))
+    plugin = GlocksWaitersTime([], "", {})
+    dispatcher = PluginsDispatcher([plugin])
+    start_time = time.time()
+    dispatcher.begin()
+    for snapshot in snapshots:
+        dispatcher.feed(snapshot)
+    feed_time = time.time() - start_time
+    start_time = time.time()
+    dispatcher.finish()
+    finish_time = time.time() - start_time
+    # The glocks that are tracked are the glocks that can be graphed.
+    glocks_columns = plugin.get_glocks_columns()
+    glocks_in_snapshots = glocks_columns.get_glocks_in_snapshots()
+    holders_count_sums = glocks_columns.get_holders_count_sums()
+    tracked_count = len([glock_id for glock_id in range(0, glocks_columns.get_glocks_count())
+                         if ((glocks_in_snapshots[glock_id] > 1) and
+                             (holders_count_sums[glock_id] > plugin.get_option("mininum_waiter_count")))])
+    print "%d snapshots, %d glocks tracked" %(len(snapshots), tracked_count)
+    print "%-10s %10.3f secs" %("feed", feed_time)
+    print "%-10s %10.3f secs" %("finish", finish_time)
+    y_axis = plugin._GlocksWaitersTime__glocks_holder_waiters_by_snapshot
+    start_time = time.time()
+    y_axis_by_date = get_y_axis_by_date(snapshots, y_axis.keys())
+    print "%-10s %10.3f secs for %d glocks" %("by date", time.time() - start_time, len(y_axis))
+    if (not y_axis == y_axis_by_date):
+        print "The values of the graphs are not the same."
+        sys.exit(1)
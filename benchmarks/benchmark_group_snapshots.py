@@ -0,0 +1,49 @@
+#!/usr/bin/python
+"""
+A benchmark of grouping the snapshots of multiple nodes by the time the
+snapshots were taken. Each node has a snapshot every 5 seconds with an offset of
+up to 4 seconds between the nodes.
+
+$ PYTHONPATH=.:benchmarks python benchmarks/benchmark_group_snapshots.py [snapshot count] [nodes count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from glocktop_data import generate_header
+
+from glocktop_analyze import group_snapshots
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+
+def generate_header_lines(hostname, snapshot_count, start_date_time):
+    date_time = start_date_time
+    for index in range(0, snapshot_count):
+        yield generate_header("gfs2fs", date_time, hostname)
+        date_time += timedelta(seconds=5)
+
+if __name__ == "__main__":
+    snapshot_count = 10000
+    nodes_count = 16
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    if (len(sys.argv) > 2):
+        nodes_count = int(sys.argv[2])
+    snapshots = []
+    for node in range(0, nodes_count):
+        lines = generate_header_lines("node%d.example.com" %(node + 1), snapshot_count,
+                                      datetime(2016, 2, 9, 8, 10, 58) + timedelta(seconds=node % 5))
+        snapshots += list(parse_snapshots([line.strip() for line in lines]))
+    best_time = None
+    for i in range(0, 3):
+        start_time = time.time()
+        grouped_snapshots = group_snapshots(snapshots)
+        elapsed_time = time.time() - start_time
+        if ((best_time == None) or (elapsed_time < best_time)):
+            best_time = elapsed_time
+    print "%-22s %8d snapshots %8d groups %10.3f secs" %("group_snapshots", len(snapshots),
+                                                         len(grouped_snapshots), best_time)
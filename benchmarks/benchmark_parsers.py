@@ -0,0 +1,56 @@
+#!/usr/bin/python
+"""
+A micro-benchmark of the line parsers. It reports the number of lines per
+second that each parser handles for the @, G, H and S lines and for parsing a
+whole file with parse_snapshots().
+
+Run it against two checkouts to compare a change:
+$ PYTHONPATH=<checkout> python benchmarks/benchmark_parsers.py
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+
+from glocktop_data import generate_lines
+
+from glocktop_analyze.parsers.glock import parse_glock, parse_glock_holder
+from glocktop_analyze.parsers.glocks_stats import parse_glocks_stats
+from glocktop_analyze.parsers.snapshot import parse_snapshot
+try:
+    from glocktop_analyze.parsers.snapshot import parse_snapshots
+except ImportError:
+    parse_snapshots = None
+
+def benchmark(name, function, lines, repeat=3):
+    # Returns the best lines per second of the runs.
+    best_time = None
+    for i in range(0, repeat):
+        start_time = time.time()
+        for line in lines:
+            function(line)
+        elapsed_time = time.time() - start_time
+        if ((best_time == None) or (elapsed_time < best_time)):
+            best_time = elapsed_time
+    lines_per_second = len(lines) / max(best_time, 0.000001)
+    print "%-22s %10d lines %14.0f lines/sec" %(name, len(lines), lines_per_second)
+    return lines_per_second
+
+if __name__ == "__main__":
+    snapshot_count = 2000
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    lines = [line.strip() for line in generate_lines(snapshot_count=snapshot_count)]
+    benchmark("@ (parse_snapshot)", parse_snapshot, [line for line in lines if line.startswith("@")])
+    benchmark("G (parse_glock)", parse_glock, [line for line in lines if line.startswith("G")])
+    benchmark("H (parse_glock_holder)", parse_glock_holder, [line for line in lines if line.startswith("H")])
+    benchmark("S (parse_glocks_stats)", parse_glocks_stats, [line for line in lines if line.startswith("S")])
+    if (not parse_snapshots == None):
+        start_time = time.time()
+        for snapshot in parse_snapshots(lines):
+            pass
+        lines_per_second = len(lines) / max(time.time() - start_time, 0.000001)
+        print "%-22s %10d lines %14.0f lines/sec" %("all (parse_snapshots)", len(lines), lines_per_second)
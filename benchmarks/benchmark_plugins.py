@@ -0,0 +1,83 @@
+#!/usr/bin/python
+"""
+A benchmark of the time it takes to analyze the snapshots with all the single
+node plugins. The snapshots are fed to each plugin in turn, where each plugin
+walks the snapshot, its glocks and holders, and then fed with the
+PluginsDispatcher that walks them once for all the plugins.
+
+$ PYTHONPATH=. python benchmarks/benchmark_plugins.py [snapshot count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+
+from glocktop_data import generate_lines
+
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.plugins import PluginsDispatcher
+from glocktop_analyze.plugins.glocks_activity import GlocksActivity
+from glocktop_analyze.plugins.glocks_stats import GSStats
+from glocktop_analyze.plugins.snapshots import Snapshots
+from glocktop_analyze.plugins.glocks_high_demote_seconds import GlocksHighDemoteSeconds
+from glocktop_analyze.plugins.glocks_in_snapshots import GlocksInSnapshots
+from glocktop_analyze.plugins.glocks_waiters_time import GlocksWaitersTime
+from glocktop_analyze.plugins.pids import Pids
+from glocktop_analyze.plugins.pids_function import PidsFunction
+from glocktop_analyze.plugins.glocks_dependencies import GlocksDependencies
+
+PLUGINS_CLASSES = [GlocksActivity, GSStats, Snapshots, GlocksHighDemoteSeconds,
+                   GlocksInSnapshots, GlocksWaitersTime, Pids, PidsFunction,
+                   GlocksDependencies]
+
+def get_plugins():
+    return [plugin_class([], "", {}) for plugin_class in PLUGINS_CLASSES]
+
+def feed_each_plugin(snapshots):
+    plugins = get_plugins()
+    for plugin in plugins:
+        plugin.begin()
+    for snapshot in snapshots:
+        for plugin in plugins:
+            plugin.feed(snapshot)
+    for plugin in plugins:
+        plugin.finish()
+    return plugins
+
+def feed_dispatcher(snapshots):
+    dispatcher = PluginsDispatcher(get_plugins())
+    dispatcher.begin()
+    for snapshot in snapshots:
+        dispatcher.feed(snapshot)
+    dispatcher.finish()
+    return dispatcher.get_plugins()
+
+def benchmark(name, function, snapshots, repeat=3):
+    # Returns the best time of the runs.
+    best_time = None
+    for i in range(0, repeat):
+        start_time = time.time()
+        function(snapshots)
+        elapsed_time = time.time() - start_time
+        if ((best_time == None) or (elapsed_time < best_time)):
+            best_time = elapsed_time
+    print "%-22s %8d snapshots %10.3f secs" %(name, len(snapshots), best_time)
+    return best_time
+
+if __name__ == "__main__":
+    snapshot_count = 2000
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    snapshots = list(parse_snapshots([line.strip() for line in generate_lines(snapshot_count=snapshot_count)]))
+    # Both ways of feeding the plugins have to find the same warnings.
+    warnings_each = [str(warning) for plugin in feed_each_plugin(snapshots) for warning in plugin.get_warnings()]
+    warnings_dispatcher = [str(warning) for plugin in feed_dispatcher(snapshots) for warning in plugin.get_warnings()]
+    if (not warnings_each == warnings_dispatcher):
+        print "The warnings found by the plugins are not the same."
+        sys.exit(1)
+    each_time = benchmark("each plugin", feed_each_plugin, snapshots)
+    dispatcher_time = benchmark("PluginsDispatcher", feed_dispatcher, snapshots)
+    print "%-22s %8.2fx" %("speedup", each_time / max(dispatcher_time, 0.000001))
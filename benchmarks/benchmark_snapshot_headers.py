@@ -0,0 +1,60 @@
+#!/usr/bin/python
+"""
+A benchmark of parsing the "@" header lines of the snapshots. The headers are
+parsed with parse_snapshot() and then with parse_snapshot() when the date_time
+is converted with datetime.strptime() instead of parse_date_time(). There is a
+header for each of the filesystems every few seconds, like glocktop writes.
+
+$ PYTHONPATH=.:benchmarks python benchmarks/benchmark_snapshot_headers.py [snapshot count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from glocktop_data import generate_header
+
+import glocktop_analyze.parsers.snapshot
+from glocktop_analyze.parsers.snapshot import parse_snapshot, get_snapshot_format
+
+def strptime_date_time(month, dow, year, time):
+    return datetime.strptime("%s %s %s %s" %(month, dow, year, time), "%b %d %Y %H:%M:%S")
+
+def generate_headers(snapshot_count, filesystem_names=["gfs2fs", "gfs2fs2"],
+                     start_date_time=datetime(2016, 2, 9, 8, 10, 58),
+                     seconds_between_snapshots=5):
+    headers = []
+    date_time = start_date_time
+    for index in range(0, snapshot_count):
+        for filesystem_name in filesystem_names:
+            headers.append(generate_header(filesystem_name, date_time, "node1.example.com",
+                                           "  dlm: 1024/1024/1024 [*   ]").strip())
+        date_time += timedelta(seconds=seconds_between_snapshots)
+    return headers
+
+def parse_headers(headers):
+    snapshot_format = get_snapshot_format(headers[0])
+    return [parse_snapshot(header, snapshot_format=snapshot_format).get_date_time() for header in headers]
+
+if __name__ == "__main__":
+    snapshot_count = 100000
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    headers = generate_headers(snapshot_count)
+    results = []
+    parse_date_time = glocktop_analyze.parsers.snapshot.parse_date_time
+    for (name, function) in [("strptime", strptime_date_time), ("parse_date_time", parse_date_time)]:
+        glocktop_analyze.parsers.snapshot.parse_date_time = function
+        start_time = time.time()
+        results.append(parse_headers(headers))
+        elapsed_time = time.time() - start_time
+        print "%-16s %8d headers %10.3f secs %10d headers/sec" %(name, len(headers), elapsed_time,
+                                                                  len(headers) / elapsed_time)
+    glocktop_analyze.parsers.snapshot.parse_date_time = parse_date_time
+    if (not results[0] == results[1]):
+        print "The date_time of the headers are not the same."
+        sys.exit(1)
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+"""
+A benchmark of the GlocksWaitFor plugin on a snapshot with tens of thousands of
+holders. The pids wait on each other in one long chain that ends in a cycle, so
+the wait-for graph is deeper than the recursion limit. The time it takes to feed
+the snapshot to the plugin and to find the strongly connected components, cycles
+and longest chain of the graph are printed.
+
+$ PYTHONPATH=.:benchmarks python benchmarks/benchmark_wait_for_graph.py [pids count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+from datetime import datetime
+
+from glocktop_data import generate_header
+from benchmark_plugins import benchmark
+
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.plugins import PluginsDispatcher
+from glocktop_analyze.plugins.glocks_wait_for import GlocksWaitFor
+from glocktop_analyze.wait_for_graph import WaitForGraph
+
+def generate_chain_lines(pids_count, cycle_length=3):
+    # Each glock is held by the next pid and waited on by the pid before it, so
+    # pid 1 waits on pid 2 which waits on pid 3 and so on. The last glock is
+    # held by the pid that is cycle_length pids back from the last pid.
+    yield generate_header("gfs2fs", datetime(2016, 2, 9, 8, 10, 58), "node1.example.com")
+    for pid in range(1, pids_count + 1):
+        holding_pid = pid + 1
+        if (pid == pids_count):
+            holding_pid = pids_count - cycle_length + 1
+        yield "G:  s:EX n:2/%x f:lDpfiIqo t:UN d:UN/0 a:0 v:0 r:4 m:200 (inode)\n" %(0x100 + pid)
+        yield " H: s:EX f:H e:0 p:%d [dd] gfs2_inplace_reserve+0x2b/0x90 [gfs2]\n" %(holding_pid)
+        yield " H: s:EX f:W e:0 p:%d [cp] gfs2_glock_nq+0x1a/0x40 [gfs2]\n" %(pid)
+
+def feed_plugin(snapshots):
+    dispatcher = PluginsDispatcher([GlocksWaitFor([], "", {})])
+    dispatcher.begin()
+    for snapshot in snapshots:
+        dispatcher.feed(snapshot)
+    dispatcher.finish()
+    return dispatcher.get_plugins()
+
+def analyze_graph(graph):
+    components = graph.get_strongly_connected_components()
+    return components, graph.get_cycles(components), graph.get_longest_chain(components)
+
+if __name__ == "__main__":
+    pids_count = 50000
+    if (len(sys.argv) > 1):
+        pids_count = int(sys.argv[1])
+    snapshots = list(parse_snapshots([line.strip() for line in generate_chain_lines(pids_count)]))
+    benchmark("feed_plugin", feed_plugin, snapshots)
+    graph = WaitForGraph()
+    for snapshot in snapshots:
+        for glock in snapshot.get_glocks():
+            holders = glock.get_holders()
+            graph.add_edge(holders[1].get_pid(), holders[0].get_pid(), "%s/%s" %(glock.get_type(), glock.get_inode()))
+    start_time = time.time()
+    components, cycles, chain = analyze_graph(graph)
+    print "%-22s %8d pids %10.3f secs" %("analyze_graph", len(graph), time.time() - start_time)
+    if ((not len(cycles) == 1) or (not len(cycles[0]) == 3) or (not len(chain) == pids_count - 2)):
+        print "The cycles or longest chain of the graph are not correct."
+        sys.exit(1)
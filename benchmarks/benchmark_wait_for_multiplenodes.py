@@ -0,0 +1,49 @@
+#!/usr/bin/python
+"""
+A benchmark of the GlocksWaitForMultipleNodes plugin on the snapshots of 16
+nodes. The snapshots of the nodes are grouped by time and the time it takes to
+join the glocks of each group and find the cycles and chains of pids waiting on
+each other across the nodes is printed.
+
+$ PYTHONPATH=.:benchmarks python benchmarks/benchmark_wait_for_multiplenodes.py [snapshot count] [glocks count] [nodes count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import time
+
+from glocktop_data import generate_lines
+
+from glocktop_analyze import group_snapshots
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.plugins.glocks_wait_for_multiplenodes import GlocksWaitForMultipleNodes
+
+if __name__ == "__main__":
+    snapshot_count = 10
+    glocks_count = 2000
+    nodes_count = 16
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    if (len(sys.argv) > 2):
+        glocks_count = int(sys.argv[2])
+    if (len(sys.argv) > 3):
+        nodes_count = int(sys.argv[3])
+    snapshots = []
+    for node in range(1, nodes_count + 1):
+        lines = generate_lines(hostname="node%d.example.com" %(node), snapshot_count=snapshot_count,
+                               glocks_count=glocks_count, inodes_count=glocks_count, seed=node)
+        snapshots += list(parse_snapshots([line.strip() for line in lines]))
+    glocks_total = sum([len(snapshot.get_glocks()) for snapshot in snapshots])
+    grouped_snapshots = group_snapshots(snapshots)
+    best_time = None
+    for i in range(0, 3):
+        plugin = GlocksWaitForMultipleNodes(grouped_snapshots, "", {})
+        start_time = time.time()
+        plugin.analyze()
+        elapsed_time = time.time() - start_time
+        if ((best_time == None) or (elapsed_time < best_time)):
+            best_time = elapsed_time
+    print "%-22s %8d groups %10d glocks %10.3f secs" %("analyze", len(grouped_snapshots), glocks_total, best_time)
@@ -0,0 +1,75 @@
+#!/usr/bin/python
+"""
+Generates synthetic glocktop output that is used by the benchmarks. The output
+follows the format that glocktop writes: a "@" header line for each
+filesystem followed by the G, H, I, U, C and S lines for that snapshot.
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import random
+from datetime import datetime, timedelta
+
+COMMANDS = ["gfs2_quotad", "dd", "cp", "rsync", "httpd", "(ended)"]
+FUNCTIONS = ["gfs2_glock_nq+0x1a/0x40", "gfs2_inplace_reserve+0x2b/0x90",
+             "gfs2_getattr+0x11/0x20", "gfs2_permission+0x65/0xc0"]
+GLOCK_STATES = ["Unlocked", "Locked", "Held EX", "Held SH", "Held DF",
+                "G Waiting", "P Waiting"]
+
+def generate_header(filesystem_name, date_time, hostname, dlm=""):
+    # Returns the "@" header line (with newline) of a snapshot.
+    return "@ %s      %s  @%s%s\n" %(filesystem_name, date_time.strftime("%a %b %e %H:%M:%S %Y"),
+                                     hostname, dlm)
+
+def generate_lines(hostname="node1.example.com", snapshot_count=100,
+                   filesystem_names=["gfs2fs"], glocks_count=50,
+                   inodes_count=200, start_date_time=datetime(2016, 2, 9, 8, 10, 58),
+                   seconds_between_snapshots=5, seed=1):
+    # A generator that returns the lines (with newline) of a glocktop file.
+    rand = random.Random(seed)
+    date_time = start_date_time
+    for index in range(0, snapshot_count):
+        for filesystem_name in filesystem_names:
+            dlm = ""
+            if ((index % 4) == 0):
+                dlm = "  dlm: 1024/1024/1024 [%s   ]" %("*" * rand.randint(1, 4))
+            yield generate_header(filesystem_name, date_time, hostname, dlm)
+            for gindex in range(0, rand.randint(1, glocks_count)):
+                yield "G:  s:EX n:%d/%x f:lDpfiIqo t:UN d:UN/%d a:0 v:0 r:4 m:200 (inode)\n" %(
+                    rand.choice([2, 2, 2, 3, 5, 1]),
+                    rand.randint(0x100, 0x100 + inodes_count),
+                    rand.choice([0, 0, 0, 277000]))
+                holders_count = rand.randint(0, 4)
+                for hindex in range(0, holders_count):
+                    flags = "W"
+                    if ((hindex == 0) and (rand.random() < 0.7)):
+                        flags = "H"
+                    yield " H: s:%s f:%s e:0 p:%d [%s] %s [gfs2]\n" %(rand.choice(["EX", "SH"]), flags,
+                                                                      rand.randint(100, 120),
+                                                                      rand.choice(COMMANDS),
+                                                                      rand.choice(FUNCTIONS))
+                if (rand.random() < 0.3):
+                    yield " I: n:12/%d t:8 f:0x00 d:0x00000000 s:2/2\n" %(rand.randint(1, 999))
+                if (holders_count):
+                    yield " U: W inode     183f5     Is:Shared, Want:Exclusive  [Demote pending, Reply pending]\n"
+                    for cindex in range(0, rand.randint(0, 3)):
+                        yield " C:              %s [gfs2]\n" %(rand.choice(FUNCTIONS))
+            if ((index % 3) == 0):
+                yield "S     glocks  nondisk  inode    rgrp   iopen   flock  quota jrnl      Total\n"
+                yield "S  --------- -------- -------- -------- -------- -------- ----- -------- --------\n"
+                for glock_state in GLOCK_STATES:
+                    stats = [rand.randint(0, 50) for i in range(0, 7)]
+                    yield "S  %10s: %s %8d\n" %(glock_state, " ".join(["%8d" %(i) for i in stats]), sum(stats))
+                yield "S  DLM wait: %d\n" %(rand.randint(0, 3))
+        date_time += timedelta(seconds=seconds_between_snapshots)
+
+def write_file(path_to_filename, **kwargs):
+    fout = open(path_to_filename, "w")
+    try:
+        for line in generate_lines(**kwargs):
+            fout.write(line)
+    finally:
+        fout.close()
+    return path_to_filename
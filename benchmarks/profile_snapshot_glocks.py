@@ -0,0 +1,39 @@
+#!/usr/bin/python
+"""
+Profiles the calls to Snapshot.get_glocks() and Glock.has_ended_process()
+while the snapshots are fed to each of the single node plugins in turn and the
+glocks are looked up with Snapshot.find_glock().
+
+Run it against two checkouts to compare a change:
+$ PYTHONPATH=<checkout> python benchmarks/profile_snapshot_glocks.py [snapshot count]
+
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+"""
+import sys
+import cProfile
+import pstats
+
+from glocktop_data import generate_lines
+from benchmark_plugins import feed_each_plugin
+
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+
+def analyze(snapshots):
+    feed_each_plugin(snapshots)
+    for snapshot in snapshots:
+        for glock in snapshot.get_glock_holders():
+            snapshot.find_glock(str(glock.get_type()), str(glock.get_inode()))
+
+if __name__ == "__main__":
+    snapshot_count = 2000
+    if (len(sys.argv) > 1):
+        snapshot_count = int(sys.argv[1])
+    snapshots = list(parse_snapshots([line.strip() for line in generate_lines(snapshot_count=snapshot_count)]))
+    profiler = cProfile.Profile()
+    profiler.runcall(analyze, snapshots)
+    stats = pstats.Stats(profiler)
+    print "Total time: %.3f secs" %(stats.total_tt)
+    stats.sort_stats("cumulative").print_stats("get_glocks|has_ended_process")
@@ -31,7 +31,7 @@ logger = LogWriter(glocktop_analyze.MAIN_LOGGER_NAME,
                    glocktop_analyze.MAIN_LOGGER_FORMAT,
                    disableConsoleLog=False)
 
-from glocktop_analyze.utilities import get_data_from_file, write_to_file
+from glocktop_analyze.utilities import get_data_from_file, get_lines_from_file, write_to_file
 
 # #####################################################################
 # Global variables
@@ -86,7 +86,7 @@ class GlocksDumps():
                     logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
             for gsd in list_of_gsd:
                 glocks_dump_data = ""
-                for line in get_data_from_file(gsd.get_path_to_glockfile(), strip_leading_character=False):
+                for line in get_lines_from_file(gsd.get_path_to_glockfile(), strip_leading_character=False):
                     glocks_dump_data += "%s\n" %(line)
                 if (glocks_dump_data):
                     glocks_dump_data = "%s\n%s\n" %(gsd.get_header(), glocks_dump_data)
@@ -32,6 +32,10 @@ import os.path
 import copy
 import argparse
 import glob
+import itertools
+import multiprocessing
+import signal
+import StringIO
 
 import glocktop_analyze
 from glocktop_analyze.utilities import LogWriter
@@ -41,19 +45,24 @@ logger = LogWriter(glocktop_analyze.MAIN_LOGGER_NAME,
                    glocktop_analyze.MAIN_LOGGER_FORMAT,
                    disableConsoleLog=False)
 
-from glocktop_analyze.utilities import ColorizeConsoleText, get_data_from_file
-from glocktop_analyze.utilities import tableize, write_to_file, merge_dicts
+from glocktop_analyze.utilities import ColorizeConsoleText
+from glocktop_analyze.utilities import tableize, write_to_file, merge_dicts, open_file
+from glocktop_analyze.utilities import get_compression_type
 import glocktop_analyze.glocks_stats
 from glocktop_analyze.snapshot import Snapshot, DLMActivity
 from glocktop_analyze.glock import Glock, GlockHolder, GlockObject
 from glocktop_analyze.glocks_stats import GlocksStats, GlockStat
 from glocktop_analyze.parsers.snapshot import parse_snapshot, process_snapshot
-from glocktop_analyze.parsers.rawfile import get_hostname, get_filesystems
+from glocktop_analyze.parsers.rawfile import get_snapshots
+from glocktop_analyze.parsers.rawfile import get_file_chunks, get_snapshots_from_chunk
+from glocktop_analyze.parsers.rawfile import get_lines_from_follow
+from glocktop_analyze.parsers.snapshot import parse_snapshots
+from glocktop_analyze.parsers.cache import load_snapshots, save_snapshots, invalidate_snapshots
 from glocktop_analyze.html import generate_css_header, generate_footer
 from glocktop_analyze.html import generate_table
 
 # Plugins
-from glocktop_analyze.plugins import Admonition
+from glocktop_analyze.plugins import Admonition, PluginsDispatcher
 from glocktop_analyze.plugins.glocks_activity import GlocksActivity
 from glocktop_analyze.plugins.glocks_stats import GSStats
 from glocktop_analyze.plugins.snapshots import Snapshots
@@ -63,20 +72,46 @@ from glocktop_analyze.plugins.glocks_waiters_time import GlocksWaitersTime
 from glocktop_analyze.plugins.pids import Pids
 from glocktop_analyze.plugins.pids_function import PidsFunction
 from glocktop_analyze.plugins.glocks_dependencies import GlocksDependencies
+from glocktop_analyze.plugins.glocks_wait_for import GlocksWaitFor
 
 # Plugins that can run on multiply nodes
 from glocktop_analyze import group_snapshots
 from glocktop_analyze.plugins.snapshots_multiplenodes import SnapshotsMultipleNodes
 from glocktop_analyze.plugins.glocks_activity_multiplenodes import GlocksActivityMultipleNodes
+from glocktop_analyze.plugins.glocks_wait_for_multiplenodes import GlocksWaitForMultipleNodes
 
 # #####################################################################
 # Global variables
 # #####################################################################
 VERSION_NUMBER = "0.1-7"
 
+# A map of the path to a file and the snapshots for each filesystem parsed from
+# the file. The snapshots are shared by the single node and multiple node
+# analysis, so that each file is only parsed once.
+SNAPSHOTS_REGISTRY = {}
+
 # #####################################################################
 # Global functions
 # #####################################################################
+def __get_warnings_text(warnings, colorize=False, header="Warnings Found:"):
+    warnings_table = []
+    for warning in warnings:
+        uri = "-"
+        if (warning.get_uri()):
+            uri = warning.get_uri()
+        warnings_table += [[warning.get_hostname(),
+                            warning.get_filesystem_name(),
+                            warning.get_type(),
+                            warning.get_description(),
+                            uri]]
+    if (warnings_table and colorize):
+        header = ColorizeConsoleText.red("%s" %(header))
+    return "\n\n%s\n%s\n" %(header, tableize(warnings_table,
+                                         ["Hostname", "Filesystem",
+                                          "Type", "Description",
+                                          "Link to Article"],
+                                         colorize=colorize).strip())
+
 def __output_warnings(warnings, path_to_output_dir, disable_std_out=True, html_format=False):
     if (warnings):
         sorted_warnings = []
@@ -85,30 +120,10 @@ def __output_warnings(warnings, path_to_output_dir, disable_std_out=True, html_f
             if (not warning in sorted_warnings):
                 sorted_warnings.append(warning)
         sorted_warnings = sorted(sorted_warnings, key=lambda x: x.get_filesystem_name(), reverse=False)
-        def get_warning_text(warnings, colorize=False):
-            warnings_table = []
-            for warning in warnings:
-                uri = "-"
-                if (warning.get_uri()):
-                    uri = warning.get_uri()
-                warnings_table += [[warning.get_hostname(),
-                                    warning.get_filesystem_name(),
-                                    warning.get_type(),
-                                    warning.get_description(),
-                                    uri]]
-            header = "Warnings Found:"
-            if (warnings_table and colorize):
-                header = ColorizeConsoleText.red("%s" %(header))
-            return "\n\n%s\n%s\n" %(header, tableize(warnings_table,
-                                                 ["Hostname", "Filesystem",
-                                                  "Type", "Description",
-                                                  "Link to Article"],
-                                                 colorize=colorize).strip())
-
         if (not disable_std_out):
-            print get_warning_text(sorted_warnings, colorize=True)
+            print __get_warnings_text(sorted_warnings, colorize=True)
         # Write warnings to text file or html file
-        wdata = "%s\n" %(get_warning_text(sorted_warnings, colorize=False).strip())
+        wdata = "%s\n" %(__get_warnings_text(sorted_warnings, colorize=False).strip())
         path_to_output_file = os.path.join(path_to_output_dir, "warnings.txt")
         if (html_format):
             path_to_output_file = os.path.join(path_to_output_dir, "warnings.html")
@@ -138,50 +153,164 @@ def __output_warnings(warnings, path_to_output_dir, disable_std_out=True, html_f
 # #####################################################################
 # Functions that analyze the files for data
 # #####################################################################
-def __analyze_file(path_to_output_file, gfs2_filesystem_names, show_ended_process_and_tlocks):
+def __analyze_file(path_to_filename, gfs2_filesystem_names, show_ended_process_and_tlocks, jobs=1):
     #All the snapshots for all the filesystems.
     snapshots_by_filesystem = {}
-    # The glock that will have a container for all the lines associated with
-    # the glock.
-    gfs2_snapshot = None
-    # The lines that are related to this snapshot of the
-    # filesystem. Including glocks, waiters, etc.
-    snapshot_lines = []
-    lines = get_data_from_file(path_to_filename)
-    for line in lines:
-        # @, G, H, I, R, B, U, C, S
-        if ((line.startswith("@")) or (not len(line) > 0)):
-            if (not gfs2_snapshot == None):
-                # Process any previous snapshot lines before starting a
-                # new one. All the glocks, holder/waiters, etc.
-                if ((not gfs2_filesystem_names) or
-                    (gfs2_snapshot.get_filesystem_name().strip() in gfs2_filesystem_names)):
-                    process_snapshot(gfs2_snapshot, snapshot_lines)
-                    if (not snapshots_by_filesystem.has_key(gfs2_snapshot.get_filesystem_name())):
-                        snapshots_by_filesystem[gfs2_snapshot.get_filesystem_name()] = []
-                    snapshots_by_filesystem[gfs2_snapshot.get_filesystem_name()].append(gfs2_snapshot)
-            # Process the new snapshot
-            gfs2_snapshot = parse_snapshot(line, show_ended_process_and_tlocks)
-            snapshot_lines = []
-        else:
-            snapshot_lines.append(line)
-    # Process any remaining items
-    if (not gfs2_snapshot == None):
-        if ((not gfs2_filesystem_names) or
-            (gfs2_snapshot.get_filesystem_name().strip() in gfs2_filesystem_names)):
-            process_snapshot(gfs2_snapshot, snapshot_lines)
-            if (not snapshots_by_filesystem.has_key(gfs2_snapshot.get_filesystem_name())):
-                snapshots_by_filesystem[gfs2_snapshot.get_filesystem_name()] = []
-            snapshots_by_filesystem[gfs2_snapshot.get_filesystem_name()].append(gfs2_snapshot)
+    snapshots = None
+    if (jobs > 1):
+        # Split the file into chunks that start on a "@" line and parse the
+        # chunks in worker processes. The chunks are returned in the order of
+        # the file, so the snapshots are added in the same order as reading the
+        # file from start to end.
+        chunks = get_file_chunks(path_to_filename, jobs)
+        message = "The file will be parsed in %d chunks: %s" %(len(chunks), path_to_filename)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+        if (len(chunks) > 1):
+            snapshots = []
+            pool = multiprocessing.Pool(min(jobs, len(chunks)), __init_worker)
+            try:
+                # A timeout is required on get() or control-c will not
+                # interrupt the wait on the results.
+                for chunk_snapshots in pool.map_async(__analyze_file_chunk_worker,
+                                                      [(path_to_filename, start_offset, end_offset,
+                                                        gfs2_filesystem_names, show_ended_process_and_tlocks)
+                                                       for (start_offset, end_offset) in chunks]).get(sys.maxint):
+                    snapshots += chunk_snapshots
+                pool.close()
+            except KeyboardInterrupt:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+    if (snapshots == None):
+        # The snapshots are read from the file one at a time, so only the lines
+        # of the current snapshot are held in memory while parsing.
+        snapshots = get_snapshots(path_to_filename, gfs2_filesystem_names,
+                                  show_ended_process_and_tlocks)
+    for gfs2_snapshot in snapshots:
+        if (not snapshots_by_filesystem.has_key(gfs2_snapshot.get_filesystem_name())):
+            snapshots_by_filesystem[gfs2_snapshot.get_filesystem_name()] = []
+        snapshots_by_filesystem[gfs2_snapshot.get_filesystem_name()].append(gfs2_snapshot)
+    return snapshots_by_filesystem
+
+def __analyze_file_chunk_worker(chunk):
+    # Runs in a worker process and returns the list of snapshots parsed from a
+    # chunk of the file.
+    (path_to_filename, start_offset, end_offset, gfs2_filesystem_names, show_ended_process_and_tlocks) = chunk
+    return list(get_snapshots_from_chunk(path_to_filename, start_offset, end_offset,
+                                         gfs2_filesystem_names, show_ended_process_and_tlocks))
+
+def __analyze_file_with_plugins(path_to_filename, jobs=1):
+    # Analyzes the file and runs the plugins for each filesystem found, then
+    # returns the warnings found and the snapshots for each filesystem. If jobs
+    # is greater than 1 then the file is parsed in chunks by that many worker
+    # processes. The snapshots are only kept when they are needed after the
+    # plugins have ran, else each snapshot is fed to the plugins as it is parsed
+    # and None is returned for the snapshots.
+    message ="The file will be analyzed: %s" %(path_to_filename)
+    logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+    snapshots_by_filesystem = None
+    if ((jobs > 1) or (enable_snapshots_registry) or (parseargs_ns.path_to_cache_dir)):
+        snapshots_by_filesystem = __get_snapshots_by_filesystem(path_to_filename, jobs)
+        snapshots = itertools.chain(*[snapshots_by_filesystem.get(filesystem_name) for
+                                      filesystem_name in snapshots_by_filesystem.keys()])
+    else:
+        snapshots = get_snapshots(path_to_filename, parseargs_ns.gfs2_filesystem_names,
+                                  parseargs_ns.show_ended_process_and_tlocks)
+    dispatchers_by_filesystem = {}
+    for snapshot in snapshots:
+        __plugins_feed(dispatchers_by_filesystem, snapshot)
+    message ="The analyzing of the file is complete."
+    logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+    # Loop over all the filesystems and plugins and save the warnings.
+    warnings = __plugins_finish(dispatchers_by_filesystem)
+    return (warnings, snapshots_by_filesystem)
+
+def __analyze_file_with_plugins_worker(path_to_filename):
+    # Runs in a worker process. The console output of the plugins is captured
+    # and returned with the warnings, so that the parent process can print the
+    # output of each file in order. The snapshots are only returned when they
+    # are needed for the multiple node analysis.
+    std_out = sys.stdout
+    sys.stdout = StringIO.StringIO()
+    try:
+        (warnings, snapshots_by_filesystem) = __analyze_file_with_plugins(path_to_filename)
+        if (not enable_snapshots_registry):
+            snapshots_by_filesystem = None
+        return (warnings, sys.stdout.getvalue(), snapshots_by_filesystem)
+    finally:
+        sys.stdout = std_out
+
+def __get_snapshots_by_filesystem(path_to_filename, jobs=1):
+    # Returns the snapshots for each filesystem in the file. The file is only
+    # parsed if it was not already parsed by the single node analysis and is
+    # not in the cache directory.
+    if (SNAPSHOTS_REGISTRY.has_key(path_to_filename)):
+        return SNAPSHOTS_REGISTRY.get(path_to_filename)
+    snapshots_by_filesystem = None
+    if (parseargs_ns.path_to_cache_dir):
+        snapshots_by_filesystem = load_snapshots(parseargs_ns.path_to_cache_dir, path_to_filename,
+                                                 parseargs_ns.gfs2_filesystem_names,
+                                                 parseargs_ns.show_ended_process_and_tlocks)
+    if (snapshots_by_filesystem == None):
+        snapshots_by_filesystem = __analyze_file(path_to_filename,
+                                                 parseargs_ns.gfs2_filesystem_names,
+                                                 parseargs_ns.show_ended_process_and_tlocks,
+                                                 jobs)
+        if (parseargs_ns.path_to_cache_dir):
+            save_snapshots(parseargs_ns.path_to_cache_dir, path_to_filename, snapshots_by_filesystem,
+                           parseargs_ns.gfs2_filesystem_names,
+                           parseargs_ns.show_ended_process_and_tlocks)
+    if (enable_snapshots_registry):
+        SNAPSHOTS_REGISTRY[path_to_filename] = snapshots_by_filesystem
     return snapshots_by_filesystem
 
+def __follow_file(path_to_filename):
+    # Follows a file that glocktop is still writing to. Each snapshot is fed to
+    # the plugins of its filesystem as soon as it is complete, and only the
+    # warnings that were not found before are printed. When control-c is
+    # pressed the output of the plugins is written like a normal run.
+    message = "The file will be followed for new snapshots (control-c to stop): %s" %(path_to_filename)
+    logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).info(message)
+    dispatchers_by_filesystem = {}
+    warnings = []
+    try:
+        for snapshot in parse_snapshots(get_lines_from_follow(path_to_filename),
+                                        parseargs_ns.gfs2_filesystem_names,
+                                        parseargs_ns.show_ended_process_and_tlocks):
+            new_warnings = []
+            for plugin in __plugins_feed(dispatchers_by_filesystem, snapshot):
+                for warning in plugin.get_warnings():
+                    if (not warning in warnings):
+                        warnings.append(warning)
+                        new_warnings.append(warning)
+            if (new_warnings and (not parseargs_ns.disable_std_out)):
+                print __get_warnings_text(new_warnings, colorize=True,
+                                          header="New Warnings Found (%s):" %(str(snapshot.get_date_time())))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        print ""
+        message = "The following of the file has stopped and the output for all the snapshots will be written."
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).info(message)
+    except (IOError, os.error):
+        message = "An error occured reading the file: %s." %(path_to_filename)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
+    __output_warnings(__plugins_finish(dispatchers_by_filesystem), parseargs_ns.path_to_dst_dir,
+                      disable_std_out=parseargs_ns.disable_std_out,
+                      html_format=enable_html_format)
+
+def __init_worker():
+    # The parent process handles control-c and will terminate the workers.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
 # ##############################################################################
 # Plugins
 # ##############################################################################
 def __get_plugins_class_names(is_multi_node_supported=False):
     if (is_multi_node_supported):
         return ["SnapshotsMultipleNodes",
-                "GlocksActivityMultipleNodes"]
+                "GlocksActivityMultipleNodes",
+                "GlocksWaitForMultipleNodes"]
     else:
         return ["GlocksActivity",
                 "GSStats",
@@ -191,7 +320,8 @@ def __get_plugins_class_names(is_multi_node_supported=False):
                 "GlocksWaitersTime",
                 "Pids",
                 "PidsFunction",
-                "GlocksDependencies"]
+                "GlocksDependencies",
+                "GlocksWaitFor"]
 
 def __get_plugins(snapshots, path_to_output_dir, options, enabled_plugins, is_multi_node_supported=False):
     classes = __get_plugins_class_names(is_multi_node_supported)
@@ -210,17 +340,49 @@ def __plugins_run(snapshots, path_to_output_dir,
                             enabled_plugins, is_multi_node_supported)
     for plugin in plugins:
         plugin.analyze()
-        plugin.write(html_format=enable_html_format)
-        if (not parseargs_ns.disable_std_out):
-            plugin.console()
-        if (enable_graphs):
-            plugin.graph(enable_png_format)
-        warnings += plugin.get_warnings()
+        warnings += __plugin_output(plugin, enable_html_format, enable_png_format, enable_graphs)
+    return warnings
+
+def __plugin_output(plugin, enable_html_format, enable_png_format, enable_graphs):
+    # Writes the output of a plugin that has analyzed its snapshots and returns
+    # the warnings found by the plugin.
+    plugin.write(html_format=enable_html_format)
+    if (not parseargs_ns.disable_std_out):
+        plugin.console()
+    if (enable_graphs):
+        plugin.graph(enable_png_format)
+    return plugin.get_warnings()
+
+def __plugins_feed(dispatchers_by_filesystem, snapshot):
+    # Feeds the snapshot to the plugins for the filesystem of the snapshot and
+    # returns those plugins. The plugins for a filesystem are created the first
+    # time a snapshot for the filesystem is found. The snapshot is walked once
+    # for all the plugins of the filesystem.
+    filesystem_name = snapshot.get_filesystem_name()
+    if (not dispatchers_by_filesystem.has_key(filesystem_name)):
+        path_to_output_dir = os.path.join(parseargs_ns.path_to_dst_dir, snapshot.get_hostname())
+        dispatcher = PluginsDispatcher(__get_plugins([], path_to_output_dir, options,
+                                                     parseargs_ns.plugins_to_enable))
+        dispatcher.begin()
+        dispatchers_by_filesystem[filesystem_name] = dispatcher
+    dispatcher = dispatchers_by_filesystem.get(filesystem_name)
+    dispatcher.feed(snapshot)
+    return dispatcher.get_plugins()
+
+def __plugins_finish(dispatchers_by_filesystem):
+    # Finishes the plugins that snapshots were fed to, then writes the output of
+    # the plugins and returns the warnings found.
+    warnings = []
+    for filesystem_name in dispatchers_by_filesystem.keys():
+        dispatcher = dispatchers_by_filesystem.get(filesystem_name)
+        dispatcher.finish()
+        for plugin in dispatcher.get_plugins():
+            warnings += __plugin_output(plugin, enable_html_format, enable_png_format, enable_graphs)
     return warnings
 
 def __print_plugins_description():
     plugins =  __get_plugins([], "", {}, [], False)
-    plugins += __get_plugins({}, "", {}, [], True)
+    plugins += __get_plugins([], "", {}, [], True)
     plugins_str = ""
     for plugin in plugins:
         plugins_str += "  %s: %s\n" %(ColorizeConsoleText.red(plugin.get_name()), plugin.get_description())
@@ -253,7 +415,7 @@ def __has_enabled_plugins(plugins_to_enable, is_multi_node_supported=False):
     else:
         plugins =  __get_plugins([], "", {}, [], False)
         if (is_multi_node_supported):
-            plugins = __get_plugins({}, "", {}, [], True)
+            plugins = __get_plugins([], "", {}, [], True)
         for plugin_name in plugins_to_enable:
              for plugin in plugins:
                  if (plugin_name.lower() == plugin.get_name().lower()):
@@ -262,7 +424,7 @@ def __has_enabled_plugins(plugins_to_enable, is_multi_node_supported=False):
 
 def __get_plugin_options(user_options):
     plugins =  __get_plugins([], "", {}, [], False)
-    plugins += __get_plugins({}, "", {}, [], True)
+    plugins += __get_plugins([], "", {}, [], True)
     options = {}
     for option in user_options:
         option_split = option.rsplit("=", 1)
@@ -341,6 +503,12 @@ def __get_args() :
     epilog += "# %s -p /tmp/glocktop_files/glocktop.node* \n\n" %(command_name)
     epilog += "Analyze a single file and disable html format and show ended processes.\n"
     epilog += "# %s -p /tmp/glocktop_files/glocktop.node1 -T -I \n\n" %(command_name)
+    epilog += "Analyze multiple files with 4 files analyzed at the same time.\n"
+    epilog += "# %s -p /tmp/glocktop_files/glocktop.node* -j 4 \n\n" %(command_name)
+    epilog += "Analyze multiple files and cache the parsed data for the next time the files are analyzed.\n"
+    epilog += "# %s -p /tmp/glocktop_files/glocktop.node* -c /tmp/glocktop_cache \n\n" %(command_name)
+    epilog += "Follow a file that glocktop is writing to and print the warnings for each new snapshot.\n"
+    epilog += "# %s -p /tmp/glocktop_files/glocktop.node1 -f \n\n" %(command_name)
     epilog += "Analyze a particular filesystem only.\n"
     epilog += "# %s -p /tmp/glocktop_files/glocktop.node1 -n mygfs2fs\n\n" %(command_name)
     epilog += "Analyze a single file and enable only a specific set of plugins and disable html format.\n"
@@ -402,6 +570,29 @@ def __get_args() :
                         help="only analyze a particular gfs2 filesystem",
                         metavar="<gfs2 filesystem name>",
                         default=[])
+    parser.add_argument("-j", "--jobs",
+                        action="store",
+                        type=int,
+                        dest="jobs",
+                        help="the number of files to analyze at the same time (a single file is parsed in chunks)",
+                        metavar="<number of jobs>",
+                        default=1)
+    parser.add_argument("-c", "--cache_dir",
+                        action=AbsolutePathAction,
+                        dest="path_to_cache_dir",
+                        help="the path to a directory where the parsed data is cached",
+                        metavar="<cache directory>",
+                        default="")
+    parser.add_argument("-C", "--invalidate_cache",
+                        action="store_true",
+                        dest="invalidate_cache",
+                        help="remove the cached parsed data for the files before analyzing them",
+                        default=False)
+    parser.add_argument("-f", "--follow",
+                        action="store_true",
+                        dest="follow",
+                        help="follow a file that glocktop is writing to and analyze each new snapshot",
+                        default=False)
     parser.add_argument("-A", "--disable_group_analysis",
                         action="store_false",
                         dest="enable_group_analysis",
@@ -458,19 +649,25 @@ if __name__ == "__main__":
         # #######################################################################
         def is_valid_glocktop_file(path_to_filename):
             try:
-                fin = open(path_to_filename)
-                for line in fin.readlines()[0:10]:
-                    if (line.startswith("@")):
-                        if (not parse_snapshot(line) == None):
-                            return True
-            except (UnicodeEncodeError, IOError):
+                # Compressed files are decompressed while reading.
+                fin = open_file(path_to_filename)
+                try:
+                    # Only read the first 10 lines instead of the whole file.
+                    for line in itertools.islice(fin, 10):
+                        if (line.startswith("@")):
+                            if (not parse_snapshot(line) == None):
+                                return True
+                finally:
+                    fin.close()
+            except (UnicodeEncodeError, IOError, EOFError):
                 return False
             return False
 
         path_to_filenames = []
         for filename in parseargs_ns.path_to_src_file:
             if (os.path.isfile(filename)):
-                if (is_valid_glocktop_file(filename)):
+                # A file that is followed might not have any snapshots yet.
+                if ((parseargs_ns.follow) or (is_valid_glocktop_file(filename))):
                     path_to_filenames.append(filename)
 
             elif (os.path.isdir(filename)):
@@ -489,6 +686,10 @@ if __name__ == "__main__":
             logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).info(message)
             sys.exit(1)
 
+        if (parseargs_ns.path_to_cache_dir and parseargs_ns.invalidate_cache):
+            for path_to_filename in path_to_filenames:
+                invalidate_snapshots(parseargs_ns.path_to_cache_dir, path_to_filename)
+
         # #######################################################################
         # Get the values for the plugin options
         # #######################################################################
@@ -504,34 +705,64 @@ if __name__ == "__main__":
             pass
 
         options = __get_plugin_options(parseargs_ns.plugins_options)
+        # The parsed snapshots are only kept in memory after the single node
+        # analysis if the multiple node analysis will use them.
+        enable_snapshots_registry = (parseargs_ns.enable_group_analysis and
+                                     __has_enabled_plugins(parseargs_ns.plugins_to_enable, True))
+        # #######################################################################
+        # Follow a single file that glocktop is still writing to.
+        # #######################################################################
+        if (parseargs_ns.follow):
+            if (not len(path_to_filenames) == 1):
+                message = "Only 1 file can be followed with the \"-f\" option."
+                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
+                sys.exit(1)
+            elif (get_compression_type(path_to_filenames[0])):
+                message = "A compressed file cannot be followed: %s" %(path_to_filenames[0])
+                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
+                sys.exit(1)
+            __follow_file(path_to_filenames[0])
+            sys.exit()
+
         # #######################################################################
         # Analyze the data if there are non-grouped plugins enabled
         # #######################################################################
         if (__has_enabled_plugins(parseargs_ns.plugins_to_enable, False)):
             # Save any warning that are found when plugins are ran.
             warnings = []
-            for path_to_filename in path_to_filenames:
-                message ="The file will be analyzed: %s" %(path_to_filename)
-                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-                snapshots_by_filesystem = __analyze_file(path_to_filename,
-                                                         parseargs_ns.gfs2_filesystem_names,
-                                                         parseargs_ns.show_ended_process_and_tlocks)
-                # Set the path to output dir.
-                path_to_dst_dir = ""
-                if (snapshots_by_filesystem.keys()):
-                    hostname = snapshots_by_filesystem[snapshots_by_filesystem.keys()[0]][0].get_hostname()
-                    path_to_dst_dir = os.path.join(parseargs_ns.path_to_dst_dir, hostname)
-                message ="The analyzing of the file is complete."
+            jobs = min(parseargs_ns.jobs, len(path_to_filenames))
+            if (jobs > 1):
+                # Each file is analyzed in a worker process. The results are
+                # returned in the same order as the files, so the output is the
+                # same as analyzing the files one after another.
+                message = "The files will be analyzed with %d jobs." %(jobs)
                 logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-
-                # Loop over all the filesystems and plugins and save the warnings.
-                for filesystem_name in snapshots_by_filesystem.keys():
-                    snapshots = snapshots_by_filesystem.get(filesystem_name)
-                    # All the warnings found on the filesystem after plugins have ran.
-                    warnings += __plugins_run(snapshots, path_to_dst_dir,
-                                              enable_html_format, enable_png_format,
-                                              enable_graphs,
-                                              parseargs_ns.plugins_to_enable)
+                pool = multiprocessing.Pool(jobs, __init_worker)
+                try:
+                    # A timeout is required on get() or control-c will not
+                    # interrupt the wait on the results.
+                    results = pool.map_async(__analyze_file_with_plugins_worker,
+                                             path_to_filenames).get(sys.maxint)
+                    pool.close()
+                except KeyboardInterrupt:
+                    pool.terminate()
+                    raise
+                finally:
+                    pool.join()
+                for (path_to_filename, result) in zip(path_to_filenames, results):
+                    (file_warnings, console_output, snapshots_by_filesystem) = result
+                    if (console_output):
+                        sys.stdout.write(console_output)
+                    warnings += file_warnings
+                    if (not snapshots_by_filesystem == None):
+                        SNAPSHOTS_REGISTRY[path_to_filename] = snapshots_by_filesystem
+            else:
+                # If there is only 1 file then the jobs are used to parse chunks
+                # of the file at the same time.
+                for path_to_filename in path_to_filenames:
+                    (file_warnings, snapshots_by_filesystem) = __analyze_file_with_plugins(path_to_filename,
+                                                                                           parseargs_ns.jobs)
+                    warnings += file_warnings
             # Output or write any warnings found.
             __output_warnings(warnings, parseargs_ns.path_to_dst_dir,
                               disable_std_out=parseargs_ns.disable_std_out,
@@ -540,66 +771,35 @@ if __name__ == "__main__":
         # #######################################################################
         # Analyze the data if there are grouped plugins enabled
         # #######################################################################
-        if (parseargs_ns.enable_group_analysis and __has_enabled_plugins(parseargs_ns.plugins_to_enable, True)):
-            # Map the hostname-filesystem -> file
-            filenames_for_hosts = {}
-            # Map the hostname -> filesystems found on the hostname
-            hosts_filesystems = {}
-            # Map the filesystem -> list of hostnames where that filesystem found.
-            filesystems_on_hosts={}
+        if (enable_snapshots_registry):
+            # Map the filesystem -> list of snapshots for all the hosts where
+            # that filesystem found. The snapshots that were parsed for the
+            # single node analysis are reused.
+            snapshots_for_filesystems = {}
             for path_to_filename in path_to_filenames:
-                chostname = get_hostname(path_to_filename)
-                cfilesystems = get_filesystems(path_to_filename,
-                                                parseargs_ns.gfs2_filesystem_names)
-                if (cfilesystems):
-                    filenames_for_hosts[chostname] = path_to_filename
-                    for filesystem in cfilesystems:
-                        if (not filesystems_on_hosts.has_key(filesystem)):
-                            filesystems_on_hosts[filesystem] = []
-                        filesystems_on_hosts[filesystem].append(chostname)
-                        if (not hosts_filesystems.has_key(chostname)):
-                            hosts_filesystems[chostname] = []
-                        hosts_filesystems[chostname].append(filesystem)
-
-                        fs_host_key = "%s-%s" %(chostname, filesystem)
-                        if (not filenames_for_hosts.has_key(fs_host_key)):
-                            filenames_for_hosts[fs_host_key] = []
-                        filenames_for_hosts[fs_host_key] = path_to_filename
-            if (filenames_for_hosts.keys()):
+                snapshots_by_filesystem = __get_snapshots_by_filesystem(path_to_filename, parseargs_ns.jobs)
+                for filesystem in snapshots_by_filesystem.keys():
+                    current_snapshots = snapshots_by_filesystem.get(filesystem)
+                    if (current_snapshots):
+                        message = "The snapshots will be analyzed for filesystem \"%s\" for " %(filesystem)
+                        message += "host \"%s\": %s" %(current_snapshots[0].get_hostname(), path_to_filename)
+                        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+                        if (not snapshots_for_filesystems.has_key(filesystem)):
+                            snapshots_for_filesystems[filesystem] = []
+                        snapshots_for_filesystems[filesystem] += current_snapshots
+            if (snapshots_for_filesystems.keys()):
                 # output directory is multiple_node/<filesystem_name>
                 path_to_dst_dir = os.path.join(os.path.join(parseargs_ns.path_to_dst_dir,
                                                             "multiple_nodes"))
-                for filesystem in filesystems_on_hosts.keys():
-                    snapshots_by_filesystem = []
-                    warnings = []
-                    for chostname in filesystems_on_hosts.get(filesystem):
-                        fs_host_key = "%s-%s" %(chostname, filesystem)
-                        path_to_filename = filenames_for_hosts.get(fs_host_key)
-                        if (not parseargs_ns.gfs2_filesystem_names or filesystem in parseargs_ns.gfs2_filesystem_names):
-                            message = "The file will be analyzed for filesystem \"%s\" for " %(filesystem)
-                            message += "host \"%s\": %s" %(chostname, path_to_filename)
-                            logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-                            current_snapshots = []
-                            try:
-                                current_snapshots = __analyze_file(path_to_filename,
-                                                                   [filesystem],
-                                                                   parseargs_ns.show_ended_process_and_tlocks).get(filesystem)
-                                message =  "The analyzing of the file is complete."
-                                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-                            except AttributeError:
-                                message = "There was no data found for the filesystem: %s" %(filesystem)
-                                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-                                continue
-                            if (current_snapshots):
-                                snapshots_by_filesystem += current_snapshots
-                    if (snapshots_by_filesystem):
-                        # All the warnings found on the filesystem after plugins have ran.
-                        warnings += __plugins_run(group_snapshots(snapshots_by_filesystem),
-                                                 path_to_dst_dir,
-                                                 enable_html_format, enable_png_format,
-                                                 enable_graphs,
-                                                 parseargs_ns.plugins_to_enable,
-                                                 is_multi_node_supported=True)
+                warnings = []
+                for filesystem in snapshots_for_filesystems.keys():
+                    # All the warnings found on the filesystem after plugins have ran.
+                    warnings += __plugins_run(group_snapshots(snapshots_for_filesystems.get(filesystem)),
+                                              path_to_dst_dir,
+                                              enable_html_format, enable_png_format,
+                                              enable_graphs,
+                                              parseargs_ns.plugins_to_enable,
+                                              is_multi_node_supported=True)
 
                 # Output or write any warnings found.
                 __output_warnings(warnings, path_to_dst_dir,
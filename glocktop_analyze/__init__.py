@@ -9,42 +9,49 @@
 MAIN_LOGGER_NAME = "glocktop_analyze"
 MAIN_LOGGER_FORMAT = "%(levelname)s %(message)s"
 
-from datetime import datetime
+import heapq
+from datetime import datetime, timedelta
+
 def group_snapshots(snapshots, max_time_difference=10):
-    # Returns map of snapshots grouped together. The key is the group count
-    # and value is a list of snapshots that were taken around the same time.
-    sorted_snapshots = sorted(snapshots, key=lambda x: x.get_date_time(), reverse=False)
-    def get_time_difference(dt1, dt2):
-        # dt1 is date_time that is newest and dt2 is the date_time that is oldest.
-        return int((dt1 -dt2).total_seconds())
+    # Returns a list of groups of snapshots that were taken around the same
+    # time in the order the groups were taken. Each group is a list of
+    # snapshots sorted by time with at most one snapshot for each host.
+    #
+    # The snapshots of each host are merged into a single stream sorted by time
+    # (snapshots taken at the same time are kept in the order they were
+    # given). A new group is started when the host of the snapshot already has
+    # a snapshot in the group or the snapshot was taken more than
+    # max_time_difference seconds after the first snapshot in the group.
+    snapshots_by_host = {}
+    hostnames = []
+    for index in range(0, len(snapshots)):
+        snapshot = snapshots[index]
+        hostname = snapshot.get_hostname()
+        if (not snapshots_by_host.has_key(hostname)):
+            snapshots_by_host[hostname] = []
+            hostnames.append(hostname)
+        snapshots_by_host[hostname].append((snapshot.get_date_time(), index, snapshot))
+    streams = []
+    for hostname in hostnames:
+        stream = snapshots_by_host.get(hostname)
+        # The snapshots of a host are usually already in time order.
+        for i in range(1, len(stream)):
+            if (stream[i][0] < stream[i - 1][0]):
+                stream.sort()
+                break
+        streams.append(stream)
 
-    if (sorted_snapshots):
-        group_index = 1
-        # Create the first group if there is a snapshot because no reason to
-        grouped_snapshots = {1:[]}
-        for snapshot in sorted_snapshots:
-            # Base time to compare snapshot times.
-            base_date_time = snapshot.get_date_time()
-            current_group = grouped_snapshots.get(group_index)
-            if (current_group):
-                base_date_time = grouped_snapshots.get(group_index)[0].get_date_time()
-            # Check to see if a new group should be created or if we need to
-            # add to existing one.
-            create_new_group = False
-            for snapshot_in_group in grouped_snapshots.get(group_index):
-                sg_hostname = snapshot_in_group.get_hostname()
-                if (snapshot.get_hostname() == sg_hostname):
-                    # If a host already has snapshot in there then do not
-                    # add to current one.
-                    create_new_group = True
-                elif (get_time_difference(snapshot.get_date_time(),
-                                          base_date_time) > max_time_difference):
-                    # If the difference in greater than max difference then
-                    # create a new group.
-                    create_new_group = True
-            if (create_new_group):
-                group_index += 1
-                grouped_snapshots[group_index] = [snapshot]
-            else:
-                grouped_snapshots[group_index].append(snapshot)
+    grouped_snapshots = []
+    group_hostnames = set()
+    # The time a snapshot has to be taken at or after to start a new group.
+    group_end_date_time = None
+    for (date_time, index, snapshot) in heapq.merge(*streams):
+        hostname = snapshot.get_hostname()
+        if ((group_end_date_time == None) or (hostname in group_hostnames) or
+            (date_time >= group_end_date_time)):
+            grouped_snapshots.append([])
+            group_hostnames = set()
+            group_end_date_time = date_time + timedelta(seconds=max_time_difference + 1)
+        grouped_snapshots[-1].append(snapshot)
+        group_hostnames.add(hostname)
     return grouped_snapshots
@@ -48,7 +48,11 @@ GLOCK_FLAGS_TYPE = {"l":"Locked",
                     "i":"Invalidate in Progress",
                     "r":"Reply Pending",
                     "I":"Initial",
-                    "F":"Frozen",}
+                    "F":"Frozen",
+                    "q":"Queued",
+                    "L":"LRU",
+                    "o":"Object",
+                    "b":"Blocking",}
 
 GLOCK_FLAGS_DESCRIPTIONS = {"l":"The glock is in the process of changing state.",
                            "D":"A demote request (local or remote).",
@@ -59,7 +63,11 @@ GLOCK_FLAGS_DESCRIPTIONS = {"l":"The glock is in the process of changing state."
                            "i":"In the process of invalidating pages under this glock.",
                            "r":"Reply received from remote node is awaiting processing.",
                            "I":"Set when DLM lock is associated with this glock.",
-                           "F":"Replies from remote nodes ignored - recovery is in progress."}
+                           "F":"Replies from remote nodes ignored - recovery is in progress.",
+                           "q":"The glock has had holders queued since it was last demoted.",
+                           "L":"The glock is on the LRU list.",
+                           "o":"An object (inode or resource group) is attached to the glock.",
+                           "b":"A blocking request is pending for the glock."}
 
 GLOCK_HOLDER_FLAGS_TYPE = {"t":"Try",
                            "T":"Try 1CB",
@@ -84,13 +92,76 @@ GLOCK_HOLDER_FLAGS_DESCRIPTION = {"t":"A try lock.",
                                   "H":"Indicates that request is granted.",
                                   "W":"Set while waiting for request to complete.",
                                   "F":"Set when holder is first to be granted for this glock."}
-class Glock():
-    def __init__(self, gtype, inode, state, demote_state, demote_time):
+
+# The flags of a glock and a holder are also kept as a bitmask, so that the
+# flags can be tested without searching the string of flags. Each flag has a
+# bit in the order of the flags in these strings.
+GLOCK_FLAGS_ORDER = "lDdpyfirIFqLob"
+GLOCK_HOLDER_FLAGS_ORDER = "tTeApaEcHWF"
+
+GLOCK_FLAGS_BITS = dict([(flag, 1 << index) for (index, flag) in enumerate(GLOCK_FLAGS_ORDER)])
+GLOCK_HOLDER_FLAGS_BITS = dict([(flag, 1 << index) for (index, flag) in enumerate(GLOCK_HOLDER_FLAGS_ORDER)])
+
+GLOCK_FLAG_LOCKED = GLOCK_FLAGS_BITS["l"]
+GLOCK_FLAG_DEMOTE = GLOCK_FLAGS_BITS["D"]
+GLOCK_FLAG_DEMOTE_PENDING = GLOCK_FLAGS_BITS["d"]
+GLOCK_FLAG_DEMOTE_IN_PROGRESS = GLOCK_FLAGS_BITS["p"]
+GLOCK_HOLDER_FLAG_HOLDER = GLOCK_HOLDER_FLAGS_BITS["H"]
+GLOCK_HOLDER_FLAG_WAIT = GLOCK_HOLDER_FLAGS_BITS["W"]
+
+# The bitmask for each string of flags that has been converted. There are only
+# a few different strings of flags in a file.
+__GLOCK_FLAGS_BITMASKS = {}
+__GLOCK_HOLDER_FLAGS_BITMASKS = {}
+
+def __get_flags_bitmask(flags, flags_bits, flags_bitmasks):
+    bitmask = flags_bitmasks.get(flags)
+    if (bitmask == None):
+        bitmask = 0
+        for flag in flags:
+            # Flags that are not known are ignored.
+            bitmask |= flags_bits.get(flag, 0)
+        flags_bitmasks[flags] = bitmask
+    return bitmask
+
+def get_glock_flags_bitmask(flags):
+    # Returns the bitmask of a string of glock flags, for example: "lDpfiIqo".
+    return __get_flags_bitmask(flags, GLOCK_FLAGS_BITS, __GLOCK_FLAGS_BITMASKS)
+
+def get_glock_holder_flags_bitmask(flags):
+    # Returns the bitmask of a string of glock holder flags, for example: "eEcH".
+    return __get_flags_bitmask(flags, GLOCK_HOLDER_FLAGS_BITS, __GLOCK_HOLDER_FLAGS_BITMASKS)
+
+# The function of a holder and each frame of a call trace are split into the
+# name of the function and its address, for example "gfs2_getattr+0x11/0x20" is
+# split into "gfs2_getattr" and "+0x11/0x20". The split of each function that
+# has been split is kept since the same functions are in most of the snapshots.
+__FUNCTIONS_SPLIT = {}
+
+def split_function(function):
+    # Returns a tuple of the interned name of the function and its interned
+    # address.
+    function_split = __FUNCTIONS_SPLIT.get(function)
+    if (function_split == None):
+        (name, separator, address) = function.partition("+")
+        function_split = (intern(name.strip()), intern(separator + address))
+        __FUNCTIONS_SPLIT[function] = function_split
+    return function_split
+
+# The classes for the glocks, holders and objects use __slots__ instead of a
+# __dict__ for each instance since there can be millions of them in a file.
+class Glock(object):
+    __slots__ = ("__type", "__inode", "__state", "__demote_state", "__demote_time",
+                 "__flags", "__flags_bitmask", "__holders", "__glock_object")
+
+    def __init__(self, gtype, inode, state, demote_state, demote_time, flags=""):
         self.__type = gtype
         self.__inode = inode
         self.__state = state
         self.__demote_state = demote_state
         self.__demote_time = demote_time
+        self.__flags = flags
+        self.__flags_bitmask = get_glock_flags_bitmask(flags)
 
         # This list contains the holder and other waiting to be holders(waiters)
         self.__holders = []
@@ -118,6 +189,28 @@ class Glock():
     def get_demote_time(self):
         return self.__demote_time
 
+    def get_flags(self):
+        return self.__flags
+
+    def get_flags_bitmask(self):
+        return self.__flags_bitmask
+
+    def has_flags(self, bitmask):
+        # Returns True if any of the flags in the bitmask are set.
+        return ((self.__flags_bitmask & bitmask) > 0)
+
+    def is_locked(self):
+        return ((self.__flags_bitmask & GLOCK_FLAG_LOCKED) > 0)
+
+    def is_demote_requested(self):
+        return ((self.__flags_bitmask & GLOCK_FLAG_DEMOTE) > 0)
+
+    def is_demote_pending(self):
+        return ((self.__flags_bitmask & GLOCK_FLAG_DEMOTE_PENDING) > 0)
+
+    def is_demote_in_progress(self):
+        return ((self.__flags_bitmask & GLOCK_FLAG_DEMOTE_IN_PROGRESS) > 0)
+
     def add_holder(self, holder):
         self.__holders.append(holder)
 
@@ -141,36 +234,71 @@ class Glock():
         # Returns GlockHolder that is holding the lock. If none is holding, then return None.
         holders = self.get_holders()
         if (holders):
-            if ("H" in holders[0].get_flags()):
+            if (holders[0].is_holder()):
                 return holders[0]
         return None
 
-class GlockHolder:
-    # The GlockHolder can be the holder of glock or waiter of glocks
-    def __init__(self, text, state, flags, error, pid, command, function):
-        self.__text = text
+class GlockHolder(object):
+    # The GlockHolder can be the holder of glock or waiter of glocks. The text
+    # of the line is created from the fields when it is needed instead of
+    # keeping the line and the fields. The module is the rest of the line after
+    # the function, for example: " [gfs2]".
+    #
+    # The names of the function and the functions in the call trace are split
+    # from their addresses when the holder is created, so that they are not
+    # split each time they are used. The call trace is a tuple that can be
+    # shared by the callers.
+    __slots__ = ("__state", "__flags", "__flags_bitmask", "__error", "__pid",
+                 "__command", "__function", "__function_address", "__module",
+                 "__call_trace", "__call_trace_addresses")
+
+    def __init__(self, state, flags, error, pid, command, function, module=""):
         self.__state = state
         self.__flags = flags
+        self.__flags_bitmask = get_glock_holder_flags_bitmask(flags)
         self.__error = error
         self.__pid = pid
         self.__command = command
-        self.__function = function
+        (self.__function, self.__function_address) = split_function(function)
+        self.__module = module
         # These lines give you the call trace (call stack) of the process that's
         # either holding or waiting to hold the glock.
-        self.__call_trace = []
+        self.__call_trace = ()
+        self.__call_trace_addresses = ()
 
     def __str__(self):
         return self.get_text()
 
     def get_text(self):
-        return self.__text
+        return "H: s:%s f:%s e:%s p:%s [%s] %s%s" %(self.__state, self.__flags, self.__error,
+                                                    self.__pid, self.__command,
+                                                    self.__function + self.__function_address,
+                                                    self.__module)
 
     def get_state(self):
         return self.__state
 
+    def get_module(self):
+        return self.__module
+
     def get_flags(self):
         return self.__flags
 
+    def get_flags_bitmask(self):
+        return self.__flags_bitmask
+
+    def has_flags(self, bitmask):
+        # Returns True if any of the flags in the bitmask are set.
+        return ((self.__flags_bitmask & bitmask) > 0)
+
+    def is_holder(self):
+        # Returns True if the request for the glock is granted.
+        return ((self.__flags_bitmask & GLOCK_HOLDER_FLAG_HOLDER) > 0)
+
+    def is_waiting(self):
+        # Returns True if the request for the glock is waiting to be granted.
+        return ((self.__flags_bitmask & GLOCK_HOLDER_FLAG_WAIT) > 0)
+
     def get_error(self):
         return self.__error
 
@@ -182,26 +310,29 @@ class GlockHolder:
 
     def get_function(self, include_function_address=False):
         if (include_function_address):
-            return self.__function
-        return self.__function.split("+", 1)[0].strip()
+            return self.__function + self.__function_address
+        return self.__function
 
     def get_call_trace(self, include_function_address=False):
+        # Returns a tuple of the functions in the call trace.
         if (include_function_address):
-            return call_trace
-        else:
-            call_trace = []
-            for ct in self.__call_trace:
-               call_trace.append(ct.split("+", 1)[0].strip())
-            return call_trace
+            return tuple([name + address for (name, address) in zip(self.__call_trace,
+                                                                    self.__call_trace_addresses)])
+        return self.__call_trace
 
     def add_call_trace(self, call_trace):
-        self.__call_trace = call_trace
+        # The call trace is a list of the functions with their addresses.
+        functions_split = [split_function(function) for function in call_trace]
+        self.__call_trace = tuple([name for (name, address) in functions_split])
+        self.__call_trace_addresses = tuple([address for (name, address) in functions_split])
 
 
-class GlockObject():
+class GlockObject(object):
     # The "I:" describes an inode associated with the lock, "R:" describes an
     # resource group associated with the glock, and "B:" describes a reservation
     # associated with a resource group.
+    __slots__ = ("__text",)
+
     def __init__(self, text):
         self.__text = text
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  0.1
+@copyright :  GPLv3
+"""
+import array
+import logging
+
+import glocktop_analyze
+
+try:
+    import numpy
+except (ImportError, NameError):
+    numpy = None
+    message = "Failed to import numpy. The glocks columns will be queried without numpy."
+    logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+
+class GlocksColumns():
+    # The counts and sums of the glocks in the snapshots, so that they can be
+    # computed without walking the snapshots, glocks and holders again. The
+    # type/inode of a glock is encoded as an id that is the index of the glock
+    # in self.__glocks.
+    #
+    # A running count or sum is kept for each glock id, so the memory used only
+    # depends on the number of different glocks and not the number of
+    # snapshots. If keep_rows is True then a row for each glock in each snapshot
+    # is also kept as columns of integers, so the counts for each snapshot can
+    # be queried. The rows grow with every snapshot, so they should only be
+    # kept for the plugins that need them. The rows are queried with numpy when
+    # it is installed.
+    #
+    # The same GlocksColumns can be shared by the plugins that are fed the same
+    # snapshots. A snapshot is only added once if it is added again right after
+    # it was added.
+    def __init__(self, keep_rows=False):
+        self.__keep_rows = keep_rows
+        self.__snapshots_count = 0
+        self.__last_snapshot = None
+
+        # The (glock type, glock inode) of each glock id and the id of each
+        # (glock type, glock inode).
+        self.__glocks = []
+        self.__glocks_ids = {}
+
+        # The running counts and sums for each glock id.
+        self.__glocks_in_snapshots = array.array("l")
+        self.__glocks_in_snapshots_with_holders_or_object = array.array("l")
+        self.__holders_count_sums = array.array("l")
+
+        # The snapshot index, glock id and demote time of each glock with a
+        # demote time greater than zero. The glocks of the last snapshot start
+        # at self.__last_snapshot_demote_row.
+        self.__demote_snapshots_index = array.array("l")
+        self.__demote_glocks_id = array.array("l")
+        self.__demote_times = array.array("l")
+        self.__last_snapshot_demote_row = 0
+
+        # The rows that are only kept when keep_rows is True.
+        self.__snapshots_date_time = []
+        self.__snapshots_index = array.array("l")
+        self.__glocks_id = array.array("l")
+        self.__holders_count = array.array("l")
+
+    def __get_column(self, column):
+        # The column is copied, so that the array can grow after the numpy
+        # array is created.
+        return numpy.frombuffer(column.tostring(), dtype=column.typecode)
+
+    def is_keeping_rows(self):
+        return self.__keep_rows
+
+    def add_snapshot(self, snapshot):
+        if (snapshot is self.__last_snapshot):
+            return
+        self.__last_snapshot = snapshot
+        snapshot_index = self.__snapshots_count
+        self.__snapshots_count += 1
+        self.__last_snapshot_demote_row = len(self.__demote_times)
+        if (self.__keep_rows):
+            self.__snapshots_date_time.append(snapshot.get_date_time())
+        glocks_ids = self.__glocks_ids
+        glocks_in_snapshots = self.__glocks_in_snapshots
+        glocks_in_snapshots_with_holders_or_object = self.__glocks_in_snapshots_with_holders_or_object
+        holders_count_sums = self.__holders_count_sums
+        for glock in snapshot.get_glocks():
+            gkey = (glock.get_type(), glock.get_inode())
+            glock_id = glocks_ids.get(gkey)
+            if (glock_id == None):
+                glock_id = len(self.__glocks)
+                glocks_ids[gkey] = glock_id
+                self.__glocks.append(gkey)
+                glocks_in_snapshots.append(0)
+                glocks_in_snapshots_with_holders_or_object.append(0)
+                holders_count_sums.append(0)
+            holders_count = len(glock.get_holders())
+            glocks_in_snapshots[glock_id] += 1
+            if ((holders_count > 0) or (not glock.get_glock_object() == None)):
+                glocks_in_snapshots_with_holders_or_object[glock_id] += 1
+            holders_count_sums[glock_id] += holders_count
+            demote_time = int(glock.get_demote_time())
+            if (demote_time > 0):
+                self.__demote_snapshots_index.append(snapshot_index)
+                self.__demote_glocks_id.append(glock_id)
+                self.__demote_times.append(demote_time)
+            if (self.__keep_rows):
+                self.__snapshots_index.append(snapshot_index)
+                self.__glocks_id.append(glock_id)
+                self.__holders_count.append(holders_count)
+
+    def get_snapshots_count(self):
+        return self.__snapshots_count
+
+    def get_snapshots_date_time(self):
+        # Only kept when keep_rows is True.
+        return self.__snapshots_date_time
+
+    def get_glocks_count(self):
+        return len(self.__glocks)
+
+    def get_glock(self, glock_id):
+        # Returns the (glock type, glock inode) of the glock id.
+        return self.__glocks[glock_id]
+
+    def get_glocks_in_snapshots(self, require_holders_or_object=False):
+        # Returns a list with the number of snapshots that each glock id is
+        # in. If require_holders_or_object is True then a glock is only counted
+        # when it has a holder, waiter or object.
+        if (require_holders_or_object):
+            return self.__glocks_in_snapshots_with_holders_or_object.tolist()
+        return self.__glocks_in_snapshots.tolist()
+
+    def get_holders_count_sums(self):
+        # Returns a list with the sum of the holders and waiters that each glock
+        # id had in all the snapshots.
+        return self.__holders_count_sums.tolist()
+
+    def get_holders_count_by_snapshot(self, glocks_id):
+        # Returns a map of each glock id in the list to a list of the number of
+        # holders and waiters the glock had in each snapshot. The count is None
+        # for the snapshots that the glock is not in. The rows have to be kept.
+        if (not numpy == None):
+            # The counts are assigned to a matrix with a row for each glock id
+            # and a column for each snapshot all at once.
+            glocks_id = sorted(set(glocks_id))
+            glocks_id_column = self.__get_column(self.__glocks_id)
+            rows = numpy.flatnonzero(numpy.in1d(glocks_id_column, glocks_id))
+            matrix_rows = numpy.zeros(len(self.__glocks), dtype=int)
+            matrix_rows[glocks_id] = numpy.arange(len(glocks_id))
+            matrix = numpy.empty((len(glocks_id), len(self.__snapshots_date_time)), dtype=object)
+            matrix[matrix_rows[glocks_id_column[rows]],
+                   self.__get_column(self.__snapshots_index)[rows]] = self.__get_column(self.__holders_count)[rows]
+            return dict(zip(glocks_id, matrix.tolist()))
+        holders_count_by_snapshot = {}
+        for glock_id in glocks_id:
+            holders_count_by_snapshot[glock_id] = [None] * len(self.__snapshots_date_time)
+        if (not holders_count_by_snapshot):
+            return holders_count_by_snapshot
+        for row in xrange(len(self.__glocks_id)):
+            glock_id = self.__glocks_id[row]
+            if (holders_count_by_snapshot.has_key(glock_id)):
+                holders_count_by_snapshot[glock_id][self.__snapshots_index[row]] = self.__holders_count[row]
+        return holders_count_by_snapshot
+
+    def get_demote_times_count(self, last_snapshot=False):
+        # Returns the number of glocks with a demote time greater than zero. If
+        # last_snapshot is True then only the glocks in the last snapshot that
+        # was added are counted.
+        if (last_snapshot):
+            return len(self.__demote_times) - self.__last_snapshot_demote_row
+        return len(self.__demote_times)
+
+    def get_demote_times(self, last_snapshot=False):
+        # Yields (snapshot index, glock id, demote time) for each glock with a
+        # demote time greater than zero in the order they were added. If
+        # last_snapshot is True then only the glocks in the last snapshot that
+        # was added are yielded.
+        start_row = 0
+        if (last_snapshot):
+            start_row = self.__last_snapshot_demote_row
+        for row in xrange(start_row, len(self.__demote_times)):
+            yield (self.__demote_snapshots_index[row], self.__demote_glocks_id[row],
+                   self.__demote_times[row])
@@ -6,3 +6,8 @@
 @version   :  0.1
 @copyright :  GPLv3
 """
+
+# The version of the parsed data. It is part of the key for the cached parsed
+# data, so it must be incremented when the parsers or the Snapshot, Glock,
+# GlockHolder or GlockObject classes change.
+PARSER_VERSION = 4
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+"""
+A cache of the parsed snapshots of a file. The snapshots for each filesystem
+are flattened into tuples of strings and numbers and saved with marshal in a
+cache directory, so that the file does not have to be parsed again when the
+file has not changed.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  0.1
+@copyright :  GPLv3
+"""
+import gc
+import os
+import sys
+import logging
+import hashlib
+import marshal
+import tempfile
+from datetime import datetime
+
+import glocktop_analyze
+from glocktop_analyze.parsers import PARSER_VERSION
+from glocktop_analyze.utilities import mkdirs
+from glocktop_analyze.snapshot import Snapshot, DLMActivity
+from glocktop_analyze.glock import Glock, GlockHolder, GlockObject
+from glocktop_analyze.glocks_stats import GlocksStats, GLOCK_TYPES, GLOCK_STATES
+
+CACHE_FILENAME_EXTENSION = ".cache"
+
+# #####################################################################
+# Convert the snapshots to and from tuples that marshal can write.
+# #####################################################################
+def __encode_glock_holder(glock_holder):
+    return (glock_holder.get_state(), glock_holder.get_flags(),
+            glock_holder.get_error(), glock_holder.get_pid(), glock_holder.get_command(),
+            glock_holder.get_function(include_function_address=True), glock_holder.get_module(),
+            list(glock_holder.get_call_trace(include_function_address=True)))
+
+def __decode_glock_holder(data):
+    (state, flags, error, pid, command, function, module, call_trace) = data
+    glock_holder = GlockHolder(state, flags, error, pid, command, function, module)
+    if (call_trace):
+        glock_holder.add_call_trace(call_trace)
+    return glock_holder
+
+def __encode_glock(glock):
+    glock_object = glock.get_glock_object()
+    if (not glock_object == None):
+        glock_object = glock_object.get_text()
+    return (glock.get_type(), glock.get_inode(), glock.get_state(),
+            glock.get_demote_state(), glock.get_demote_time(), glock.get_flags(),
+            [__encode_glock_holder(glock_holder) for glock_holder in glock.get_holders()],
+            glock_object)
+
+def __decode_glock(data):
+    (gtype, inode, state, demote_state, demote_time, flags, glock_holders, glock_object) = data
+    glock = Glock(gtype, inode, state, demote_state, demote_time, flags)
+    for glock_holder in glock_holders:
+        glock.add_holder(__decode_glock_holder(glock_holder))
+    if (not glock_object == None):
+        glock.add_glock_object(GlockObject(glock_object))
+    return glock
+
+def __encode_glocks_stats(glocks_stats):
+    if (glocks_stats == None):
+        return None
+    elif (not glocks_stats.has_stats()):
+        return []
+    return [(gtype, state, glocks_stats.get_stat(gtype, state))
+            for gtype in GLOCK_TYPES for state in GLOCK_STATES]
+
+def __decode_glocks_stats(data, filesystem_name, date_time):
+    if (data == None):
+        return None
+    glocks_stats = GlocksStats(filesystem_name, date_time)
+    for (gtype, state, stat) in data:
+        glocks_stats.add_stat(gtype, state, stat)
+    return glocks_stats
+
+def __encode_snapshot(snapshot, show_ended_process_and_tlocks):
+    # Only the glocks returned by get_glocks() are saved, since the glocks that
+    # are filtered out are never used.
+    dlm_activity = snapshot.get_dlm_activity()
+    if (not dlm_activity == None):
+        dlm_activity = (dlm_activity.get_dlm_dirtbl_size(), dlm_activity.get_dlm_rsbtbl_size(),
+                        dlm_activity.get_dlm_lkbtbl_size(), dlm_activity.get_waiter_count())
+    dt = snapshot.get_date_time()
+    return (snapshot.get_filesystem_name(), snapshot.get_hostname(),
+            (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond),
+            dlm_activity,
+            [__encode_glock(glock) for glock in snapshot.get_glocks()],
+            __encode_glocks_stats(snapshot.get_glocks_stats()))
+
+def __decode_snapshot(data, show_ended_process_and_tlocks):
+    (filesystem_name, hostname, date_time, dlm_activity, glocks, glocks_stats) = data
+    date_time = datetime(*date_time)
+    if (not dlm_activity == None):
+        dlm_activity = DLMActivity(*dlm_activity)
+    snapshot = Snapshot(filesystem_name, hostname, date_time, dlm_activity,
+                        show_ended_process_and_tlocks)
+    for glock in glocks:
+        snapshot.add_glock(__decode_glock(glock))
+    glocks_stats = __decode_glocks_stats(glocks_stats, filesystem_name, date_time)
+    if (not glocks_stats == None):
+        snapshot.add_glocks_stats(glocks_stats)
+    return snapshot
+
+# #####################################################################
+# Cache files
+# #####################################################################
+def __get_path_hash(path_to_filename):
+    return hashlib.sha1(os.path.abspath(path_to_filename)).hexdigest()
+
+def get_path_to_cache_file(path_to_cache_dir, path_to_filename,
+                           gfs2_filesystem_names=[], show_ended_process_and_tlocks=False):
+    # Returns the path to the cache file for the file or None if the file does
+    # not exist. The name of the cache file is the hash of the path to the file
+    # and the hash of the size, modification time, parser version and the
+    # options that change what is parsed. The marshal format can change between
+    # python versions, so the python version is part of the key.
+    try:
+        stat = os.stat(path_to_filename)
+    except (IOError, os.error):
+        return None
+    key = repr((stat.st_size, stat.st_mtime, PARSER_VERSION, sys.version_info[:2],
+                marshal.version, sorted(gfs2_filesystem_names), show_ended_process_and_tlocks))
+    filename = "%s-%s%s" %(__get_path_hash(path_to_filename),
+                           hashlib.sha1(key).hexdigest(),
+                           CACHE_FILENAME_EXTENSION)
+    return os.path.join(path_to_cache_dir, filename)
+
+def load_snapshots(path_to_cache_dir, path_to_filename,
+                   gfs2_filesystem_names=[], show_ended_process_and_tlocks=False):
+    # Returns the map of filesystem -> snapshots that was saved for the file or
+    # None if the file is not in the cache.
+    path_to_cache_file = get_path_to_cache_file(path_to_cache_dir, path_to_filename,
+                                                gfs2_filesystem_names, show_ended_process_and_tlocks)
+    if ((path_to_cache_file == None) or (not os.path.isfile(path_to_cache_file))):
+        return None
+    # The garbage collector is disabled while the objects are created because
+    # it would scan all the new objects over and over while loading, which
+    # takes longer than creating them.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        fin = open(path_to_cache_file, "rb")
+        try:
+            data = marshal.load(fin)
+        finally:
+            fin.close()
+        snapshots_by_filesystem = {}
+        for filesystem_name in data.keys():
+            snapshots_by_filesystem[filesystem_name] = [__decode_snapshot(snapshot, show_ended_process_and_tlocks)
+                                                        for snapshot in data.get(filesystem_name)]
+        message = "The parsed snapshots were loaded from the cache file: %s" %(path_to_cache_file)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+        return snapshots_by_filesystem
+    except (IOError, os.error, EOFError, ValueError, TypeError, AttributeError):
+        message = "The cache file could not be read and will be ignored: %s" %(path_to_cache_file)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).warning(message)
+    finally:
+        if (gc_enabled):
+            gc.enable()
+    return None
+
+def save_snapshots(path_to_cache_dir, path_to_filename, snapshots_by_filesystem,
+                   gfs2_filesystem_names=[], show_ended_process_and_tlocks=False):
+    # Saves the map of filesystem -> snapshots for the file. Any older cache
+    # files for the same file are removed. The cache file is written to a
+    # temporary file first, so a partial cache file is never read.
+    path_to_cache_file = get_path_to_cache_file(path_to_cache_dir, path_to_filename,
+                                                gfs2_filesystem_names, show_ended_process_and_tlocks)
+    if ((path_to_cache_file == None) or (not mkdirs(path_to_cache_dir))):
+        return False
+    invalidate_snapshots(path_to_cache_dir, path_to_filename)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        data = {}
+        for filesystem_name in snapshots_by_filesystem.keys():
+            data[filesystem_name] = [__encode_snapshot(snapshot, show_ended_process_and_tlocks)
+                                     for snapshot in snapshots_by_filesystem.get(filesystem_name)]
+    finally:
+        if (gc_enabled):
+            gc.enable()
+    try:
+        (fd, path_to_tmp_file) = tempfile.mkstemp(suffix=".tmp", dir=path_to_cache_dir)
+        try:
+            fout = os.fdopen(fd, "wb")
+            try:
+                marshal.dump(data, fout)
+            finally:
+                fout.close()
+            os.rename(path_to_tmp_file, path_to_cache_file)
+        except:
+            if (os.path.exists(path_to_tmp_file)):
+                os.remove(path_to_tmp_file)
+            raise
+        message = "The parsed snapshots were saved to the cache file: %s" %(path_to_cache_file)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
+        return True
+    except (IOError, os.error, ValueError):
+        message = "The cache file could not be written: %s" %(path_to_cache_file)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).warning(message)
+    return False
+
+def invalidate_snapshots(path_to_cache_dir, path_to_filename):
+    # Removes all the cache files for the file.
+    prefix = "%s-" %(__get_path_hash(path_to_filename))
+    if (not os.path.isdir(path_to_cache_dir)):
+        return
+    for filename in os.listdir(path_to_cache_dir):
+        if ((filename.startswith(prefix)) and (filename.endswith(CACHE_FILENAME_EXTENSION))):
+            try:
+                os.remove(os.path.join(path_to_cache_dir, filename))
+            except (IOError, os.error):
+                message = "The cache file could not be removed: %s" %(os.path.join(path_to_cache_dir, filename))
+                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).warning(message)
@@ -10,34 +10,43 @@
 import re
 from glocktop_analyze.glock import Glock, GlockHolder
 
-def parse_glock(line):
-    # This regex works glocktop output but does not work on regular glock dumps.
-    #regex = re.compile("^G:  s:(?P<state>\S+) n:(?P<type>\d)/(?P<inodeNumber>\S+)\s" + \
-    #                    "f:(?P<flags>\S*)\st:(?P<target>\S+)\sd:(?P<demote_state>\S+)/" + \
-    #                   "(?P<demote_time>\d+)( l:(?P<lvbs>\d+))?\sa:(?P<ails>\d+)" +\
-    #                   "( v:(?P<v>\d+))?\sr:(?P<refs>\d+)( m:(?P<hold>\d+))\s" + \
-    #                   "\((?P<glock_type>.*)\)")
-    #mo = regex.match(line)
-    #if mo:
-    #    return Glock(int(mo.group("type")), mo.group("inodeNumber"), mo.group("state"), mo.group("demote_time"))
+# The regexes are compiled once when the module is imported instead of every
+# time a line is parsed.
+
+# This regex works glocktop output but does not work on regular glock dumps.
+#REGEX_GLOCK = re.compile("^G:  s:(?P<state>\S+) n:(?P<type>\d)/(?P<inodeNumber>\S+)\s" + \
+#                         "f:(?P<flags>\S*)\st:(?P<target>\S+)\sd:(?P<demote_state>\S+)/" + \
+#                         "(?P<demote_time>\d+)( l:(?P<lvbs>\d+))?\sa:(?P<ails>\d+)" +\
+#                         "( v:(?P<v>\d+))?\sr:(?P<refs>\d+)( m:(?P<hold>\d+))\s" + \
+#                         "\((?P<glock_type>.*)\)")
+REGEX_GLOCK = re.compile("^G:  s:(?P<state>\S+) n:(?P<type>\d)/(?P<inodeNumber>\S+)\s" + \
+                         "f:(?P<flags>\S*)\st:(?P<target>\S+)\sd:(?P<demote_state>\S+)/" + \
+                         "(?P<demote_time>\d+)( l:(?P<lvbs>\d+))?\sa:(?P<ails>\d+)" +\
+                         "( v:(?P<v>\d+))?\sr:(?P<refs>\d+)(\sm:(?P<hold>\d+))" + \
+                         ".*")
 
-    regex = re.compile("^G:  s:(?P<state>\S+) n:(?P<type>\d)/(?P<inodeNumber>\S+)\s" + \
-                        "f:(?P<flags>\S*)\st:(?P<target>\S+)\sd:(?P<demote_state>\S+)/" + \
-                       "(?P<demote_time>\d+)( l:(?P<lvbs>\d+))?\sa:(?P<ails>\d+)" +\
-                       "( v:(?P<v>\d+))?\sr:(?P<refs>\d+)(\sm:(?P<hold>\d+))" + \
-                       ".*")
-    mo = regex.match(line)
+#REGEX_GLOCK_HOLDER = re.compile("^H: s:(\S+) f:(\S+) e:(\d+) p:(\d+) \[(\S+)\] (.+)")
+# The last group is the module at the end of the line, so that the line can be
+# created from the groups.
+REGEX_GLOCK_HOLDER = re.compile("^H: s:(\S+) f:(\S+) e:(\d+) p:(\d+) \[(\S+)\] (.+)( \[.*)")
+
+# The strings of the fields are interned since the same states, flags, pids,
+# commands and functions are found in most of the snapshots, so only one copy of
+# each string is kept in memory and the strings are cheap to compare and hash.
+# The plugins key their maps of pids with the (pid, command) tuple of the
+# interned strings instead of formatting them into one string.
+def parse_glock(line):
+    mo = REGEX_GLOCK.match(line)
     if mo:
-        return Glock(int(mo.group("type")), mo.group("inodeNumber"), mo.group("state"), mo.group("demote_state"), mo.group("demote_time"))
+        return Glock(int(mo.group("type")), intern(mo.group("inodeNumber")), intern(mo.group("state")),
+                     intern(mo.group("demote_state")), intern(mo.group("demote_time")),
+                     intern(mo.group("flags")))
     return None
-    parse_glock = staticmethod(parse_glock)
 
 def parse_glock_holder(line):
-    #regex = re.compile("^H: s:(\S+) f:(\S+) e:(\d+) p:(\d+) \[(\S+)\] (.+)")
-    regex = re.compile("^H: s:(\S+) f:(\S+) e:(\d+) p:(\d+) \[(\S+)\] (.+) \[.*")
-    mo = regex.match(line)
+    mo = REGEX_GLOCK_HOLDER.match(line)
     if mo:
-        return GlockHolder(line, mo.group(1), mo.group(2), mo.group(3),
-                           mo.group(4), mo.group(5), mo.group(6))
+        return GlockHolder(intern(mo.group(1)), intern(mo.group(2)), intern(mo.group(3)),
+                           intern(mo.group(4)), intern(mo.group(5)), intern(mo.group(6)),
+                           intern(mo.group(7)))
     return None
-    parse_glock_holder = staticmethod(parse_glock_holder)
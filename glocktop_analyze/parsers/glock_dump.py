@@ -19,6 +19,7 @@ import glocktop_analyze.glocks_stats
 
 from glocktop_analyze.parsers.glock import parse_glock,parse_glock_holder
 from glocktop_analyze.parsers.glocks_stats import parse_glocks_stats
+from glocktop_analyze.parsers.snapshot import parse_date_time
 
 def parse_snapshot(line, show_ended_process_and_tlocks=False):
     days_regex = "(?P<day>%s)" % '|'.join(calendar.day_abbr[0:])
@@ -32,7 +33,7 @@ def parse_snapshot(line, show_ended_process_and_tlocks=False):
     rem = re.compile(regex)
     mo = rem.match(line)
     if mo:
-        date_time = datetime.strptime("%s %s %s %s" %(mo.group("month"), mo.group("dow"), mo.group("year"), mo.group("time")), "%b %d %Y %H:%M:%S")
+        date_time = parse_date_time(mo.group("month"), mo.group("dow"), mo.group("year"), mo.group("time"))
         split_line = mo.group("hostname").strip().split("dlm:")
         hostname = split_line[0]
         # Check to see if DLM data is at end of string contained in hostname
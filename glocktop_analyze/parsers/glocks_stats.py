@@ -11,6 +11,8 @@ import re
 import locale
 locale.setlocale(locale.LC_NUMERIC, "")
 
+REGEX_GLOCKS_STATS = re.compile("(?P<glock_state>Unlocked|Locked|Held EX|Held SH|Held DF|G Waiting|P Waiting):\s*(?P<nondisk>\d+)\s*(?P<inode>\d+)\s*(?P<rgrp>\d+)\s*(?P<iopen>\d+)\s*(?P<flock>\d+)\s*(?P<quota>\d+)\s*(?P<journal>\d+)\s*(?P<total>\d+).*")
+
 def parse_glocks_stats(line):
     try:
         stat_line = line.split("S ")[1].strip()
@@ -19,9 +21,7 @@ def parse_glocks_stats(line):
     if ((stat_line.find("--") > 0) or (stat_line.find("Total") > 0)):
         return {}
     stats_map = {"glock_state":"", "nondisk":0, "inode":0, "rgrp":0, "iopen":0, "flock":0, "quota":0, "journal":0, "total":0}
-    regex = "(?P<glock_state>Unlocked|Locked|Held EX|Held SH|Held DF|G Waiting|P Waiting):\s*(?P<nondisk>\d+)\s*(?P<inode>\d+)\s*(?P<rgrp>\d+)\s*(?P<iopen>\d+)\s*(?P<flock>\d+)\s*(?P<quota>\d+)\s*(?P<journal>\d+)\s*(?P<total>\d+).*"
-    rem = re.compile(regex)
-    mo = rem.match(stat_line)
+    mo = REGEX_GLOCKS_STATS.match(stat_line)
     if mo:
         return mo.groupdict()
     elif (stat_line.startswith("DLM wait")):
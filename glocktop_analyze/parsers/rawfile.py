@@ -6,31 +6,253 @@
 @version   :  0.1
 @copyright :  GPLv3
 """
-from glocktop_analyze.utilities import get_data_from_file
-from glocktop_analyze.parsers.snapshot import parse_snapshot
+import os
+import mmap
+import time
+import logging
+
+import glocktop_analyze
+from glocktop_analyze.utilities import get_lines_from_file, get_compression_type, open_file
+from glocktop_analyze.parsers.snapshot import parse_snapshot, parse_snapshots, get_snapshot_format
 from glocktop_analyze.snapshot import Snapshot
 
+# The smallest chunk in bytes that a file will be split into for parsing the
+# chunks in parallel.
+MINIMUM_CHUNK_SIZE = 1024 * 1024
+
+# The number of seconds to wait for new lines when following a file.
+FOLLOW_POLL_SECONDS = 1
+# The number of seconds with no new lines after which the current snapshot is
+# assumed to be complete when following a file.
+FOLLOW_IDLE_SECONDS = 5
+
+def __open_mmap(path_to_filename):
+    # Returns a read only mmap of the file or None if the file is empty or
+    # could not be mapped.
+    try:
+        fin = open(path_to_filename, "rb")
+        try:
+            if (not os.fstat(fin.fileno()).st_size > 0):
+                return None
+            return mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            fin.close()
+    except (IOError, os.error, ValueError, mmap.error):
+        message = "An error occured reading the file: %s." %(path_to_filename)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
+    return None
+
+def __find_snapshots_offsets(mm):
+    # A generator that returns the byte offset of each "@" line in the mmap.
+    if (mm[0:1] == "@"):
+        yield 0
+    offset = mm.find("\n@")
+    while (offset >= 0):
+        yield offset + 1
+        offset = mm.find("\n@", offset + 1)
+
+def __find_snapshots_lines(path_to_filename):
+    # A generator that returns the (offset, "@" line) for each "@" line in the
+    # file. For compressed files the lines are read while decompressing and the
+    # offset is in the uncompressed data.
+    if (get_compression_type(path_to_filename)):
+        try:
+            fin = open_file(path_to_filename)
+            try:
+                offset = 0
+                for line in fin:
+                    if (line.startswith("@")):
+                        yield (offset, line)
+                    offset += len(line)
+            finally:
+                fin.close()
+        except (IOError, EOFError, os.error):
+            message = "An error occured reading the file: %s." %(path_to_filename)
+            logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
+        return
+    mm = __open_mmap(path_to_filename)
+    if (mm == None):
+        return
+    try:
+        for offset in __find_snapshots_offsets(mm):
+            end_offset = mm.find("\n", offset)
+            if (end_offset < 0):
+                end_offset = len(mm)
+            yield (offset, mm[offset:end_offset])
+    finally:
+        mm.close()
+
+def get_snapshots_headers(path_to_filename):
+    # A generator that returns a tuple for each "@" line in the file: (offset,
+    # filesystem name, hostname, date_time). The "@" lines are found in a mmap
+    # of the file, so the lines of the snapshots are never read. If the "@"
+    # line could not be parsed then the filesystem name, hostname and date_time
+    # are None.
+    snapshot_format = None
+    for (offset, line) in __find_snapshots_lines(path_to_filename):
+        line = line.strip()
+        if (snapshot_format == None):
+            snapshot_format = get_snapshot_format(line)
+        snapshot = parse_snapshot(line, snapshot_format=snapshot_format)
+        if (snapshot == None):
+            yield (offset, None, None, None)
+        else:
+            yield (offset, snapshot.get_filesystem_name(),
+                   snapshot.get_hostname(), snapshot.get_date_time())
+
+def get_snapshots_index(path_to_filename):
+    # Returns a list of tuples (offset, filesystem name, hostname, date_time)
+    # for each "@" line in the file.
+    return list(get_snapshots_headers(path_to_filename))
+
 def get_hostname(path_to_filename):
-    gfs2_snapshot = None
-    lines = get_data_from_file(path_to_filename)
-    for line in lines:
-        # @, G, H, I, R, B, U, C, S
-        if ((line.startswith("@")) or (not len(line) > 0)):
-            gfs2_snapshot = parse_snapshot(line)
-            if (not gfs2_snapshot == None):
-                return gfs2_snapshot.get_hostname()
+    # Only the "@" lines are parsed until the first one with a hostname.
+    for (offset, filesystem_name, hostname, date_time) in get_snapshots_headers(path_to_filename):
+        if (not hostname == None):
+            return hostname
     return ""
 
 def get_filesystems(path_to_filename, gfs2_filesystem_names):
     filesystems = []
-    gfs2_snapshot = None
-    lines = get_data_from_file(path_to_filename)
-    for line in lines:
-        # @, G, H, I, R, B, U, C, S
-        if ((line.startswith("@")) or (not len(line) > 0)):
-            gfs2_snapshot = parse_snapshot(line)
-            if (not gfs2_snapshot == None):
-                fs = gfs2_snapshot.get_filesystem_name()
-                if (not fs in filesystems):
-                    filesystems.append(fs)
+    for (offset, filesystem_name, hostname, date_time) in get_snapshots_headers(path_to_filename):
+        if ((not filesystem_name == None) and (not filesystem_name in filesystems)):
+            filesystems.append(filesystem_name)
     return filesystems
+
+def get_snapshots(path_to_filename, gfs2_filesystem_names=[], show_ended_process_and_tlocks=False):
+    # Returns a generator that reads the file one line at a time and returns
+    # one snapshot at a time. If there are filesystem names to filter on then
+    # only the parts of the file with snapshots for those filesystems are read,
+    # unless the file is compressed and has to be read from the start.
+    if ((gfs2_filesystem_names) and (not get_compression_type(path_to_filename))):
+        lines = get_lines_from_ranges(path_to_filename,
+                                      get_filesystems_ranges(path_to_filename,
+                                                             gfs2_filesystem_names))
+    else:
+        lines = get_lines_from_file(path_to_filename)
+    return parse_snapshots(lines, gfs2_filesystem_names, show_ended_process_and_tlocks)
+
+def get_filesystems_ranges(path_to_filename, gfs2_filesystem_names):
+    # Returns a list of (start offset, end offset) for the snapshots in the
+    # file that are for one of the filesystems. Snapshots that are next to each
+    # other are merged into a single range. The end offset of None means read
+    # to the end of the file.
+    ranges = []
+    snapshots_index = get_snapshots_index(path_to_filename)
+    for i in range(0, len(snapshots_index)):
+        (offset, filesystem_name, hostname, date_time) = snapshots_index[i]
+        if (not filesystem_name in gfs2_filesystem_names):
+            continue
+        end_offset = None
+        if (i + 1 < len(snapshots_index)):
+            end_offset = snapshots_index[i + 1][0]
+        if ((ranges) and (ranges[-1][1] == offset)):
+            ranges[-1] = (ranges[-1][0], end_offset)
+        else:
+            ranges.append((offset, end_offset))
+    return ranges
+
+def get_snapshots_offsets(path_to_filename):
+    # Returns the byte offset of each "@" line in the file. Compressed files
+    # cannot be read from an offset, so no offsets are returned for them.
+    if (get_compression_type(path_to_filename)):
+        return []
+    mm = __open_mmap(path_to_filename)
+    if (mm == None):
+        return []
+    try:
+        return list(__find_snapshots_offsets(mm))
+    finally:
+        mm.close()
+
+def get_file_chunks(path_to_filename, chunks_count, minimum_chunk_size=MINIMUM_CHUNK_SIZE):
+    # Returns a list of (start offset, end offset) that split the file into
+    # chunks of about the same size. Each chunk starts on a "@" line, so that
+    # the chunks can be parsed independently of each other. The end offset of
+    # the last chunk is None which means read to the end of the file. A
+    # compressed file is always a single chunk.
+    if (get_compression_type(path_to_filename)):
+        return [(0, None)]
+    try:
+        file_size = os.path.getsize(path_to_filename)
+    except (IOError, os.error):
+        return [(0, None)]
+    chunk_size = max(file_size / max(chunks_count, 1), minimum_chunk_size)
+    start_offsets = [0]
+    for offset in get_snapshots_offsets(path_to_filename):
+        if (offset - start_offsets[-1] >= chunk_size):
+            start_offsets.append(offset)
+    end_offsets = start_offsets[1:] + [None]
+    return zip(start_offsets, end_offsets)
+
+def get_lines_from_chunk(path_to_filename, start_offset, end_offset):
+    # A generator that returns the stripped lines between the two offsets.
+    try:
+        fin = open(path_to_filename, "r")
+        try:
+            fin.seek(start_offset)
+            offset = start_offset
+            while ((end_offset == None) or (offset < end_offset)):
+                line = fin.readline()
+                if (not line):
+                    break
+                offset += len(line)
+                yield line.strip()
+        finally:
+            fin.close()
+    except (IOError, os.error):
+        message = "An error occured reading the file: %s." %(path_to_filename)
+        logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
+
+def get_lines_from_ranges(path_to_filename, ranges):
+    # A generator that returns the stripped lines in each of the (start offset,
+    # end offset) ranges.
+    for (start_offset, end_offset) in ranges:
+        for line in get_lines_from_chunk(path_to_filename, start_offset, end_offset):
+            yield line
+
+def get_snapshots_from_chunk(path_to_filename, start_offset, end_offset,
+                             gfs2_filesystem_names=[], show_ended_process_and_tlocks=False):
+    # Returns a generator for the snapshots in a chunk of the file returned by
+    # get_file_chunks().
+    return parse_snapshots(get_lines_from_chunk(path_to_filename, start_offset, end_offset),
+                           gfs2_filesystem_names,
+                           show_ended_process_and_tlocks)
+
+def get_lines_from_follow(path_to_filename, poll_seconds=FOLLOW_POLL_SECONDS,
+                          idle_seconds=FOLLOW_IDLE_SECONDS):
+    # A generator that returns the stripped lines of the file and then waits
+    # for new lines to be appended to the file like "tail -f". It never ends.
+    # A line is only returned once its newline has been written. A snapshot is
+    # only complete when the next "@" line is found, so an empty line is
+    # returned once there have been no new lines for idle_seconds, which ends
+    # the current snapshot. If the file is truncated then it is read again
+    # from the start.
+    fin = open(path_to_filename, "r")
+    try:
+        partial_line = ""
+        idle_time = 0
+        is_idle = True
+        while (True):
+            line = fin.readline()
+            if (line):
+                partial_line += line
+                if (partial_line.endswith("\n")):
+                    yield partial_line.strip()
+                    partial_line = ""
+                    idle_time = 0
+                    is_idle = False
+                continue
+            if (os.fstat(fin.fileno()).st_size < fin.tell()):
+                message = "The file was truncated and will be read from the start: %s" %(path_to_filename)
+                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).warning(message)
+                fin.seek(0)
+                partial_line = ""
+                continue
+            if ((not is_idle) and (idle_time >= idle_seconds)):
+                yield ""
+                is_idle = True
+            time.sleep(poll_seconds)
+            idle_time += poll_seconds
+    finally:
+        fin.close()
@@ -20,37 +20,86 @@ import glocktop_analyze.glocks_stats
 from glocktop_analyze.parsers.glock import parse_glock,parse_glock_holder
 from glocktop_analyze.parsers.glocks_stats import parse_glocks_stats
 
-def parse_snapshot(line, show_ended_process_and_tlocks=False):
-    days_regex = "(?P<day>%s)" % '|'.join(calendar.day_abbr[0:])
-    months_regex = "(?P<month>%s)" % '|'.join(calendar.month_abbr[1:])
-    dow_regex = "(?P<dow>\d{1,2})"
-    time_regex = "(?P<time>\d{1,2}:\d\d:\d\d)"
-    year_regex = "(?P<year>\d{4})"
-    hostname_regex = "@(?P<hostname>.*)"
-
-    # old format
-    # regex = "^@ (?P<filesystem>\w+)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(days_regex, months_regex, dow_regex, time_regex, year_regex, hostname_regex)
-    # not sure about this format
-    # regex = "^@ (?P<filesystem>[a-z0-9-_]*)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(days_regex, months_regex, dow_regex, time_regex, year_regex, hostname_regex)
-    # new format
-    regex = "^@ (?P<filesystem>[A-Za-z0-9-_]*)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(days_regex, months_regex, dow_regex, time_regex, year_regex, hostname_regex)
-    rem = re.compile(regex)
-    mo = rem.match(line)
-    if (mo == None):
-        # old format, try it. My glock_merge needs to use same format as
-        # latest. Should keep this for older versions running in the wild.
-        regex = "^@ (?P<filesystem>\w+)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(days_regex, months_regex, dow_regex, time_regex, year_regex, hostname_regex)
-        rem = re.compile(regex)
-        mo = rem.match(line)
-
-    #if (mo == None):
-        # A glocktop would not parse because of day of week string and not sure why, but this regex allow to continue. It parses filesystem was empty string that messed up results. 
-    #    regex = "^@ (?P<filesystem>[a-z0-9-_]*).*\s%s\s*%s\s%s\s%s\s\s%s" %(months_regex, dow_regex, time_regex, year_regex, hostname_regex)
-    #    rem = re.compile(regex)
-    #    mo = rem.match(line)
+# The regexes are compiled once when the module is imported instead of every
+# time a line is parsed.
+DAYS_REGEX = "(?P<day>%s)" % '|'.join(calendar.day_abbr[0:])
+MONTHS_REGEX = "(?P<month>%s)" % '|'.join(calendar.month_abbr[1:])
+DOW_REGEX = "(?P<dow>\d{1,2})"
+TIME_REGEX = "(?P<time>\d{1,2}:\d\d:\d\d)"
+YEAR_REGEX = "(?P<year>\d{4})"
+HOSTNAME_REGEX = "@(?P<hostname>.*)"
+
+# not sure about this format
+# REGEX_SNAPSHOT = re.compile("^@ (?P<filesystem>[a-z0-9-_]*)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(DAYS_REGEX, MONTHS_REGEX, DOW_REGEX, TIME_REGEX, YEAR_REGEX, HOSTNAME_REGEX))
+# new format
+REGEX_SNAPSHOT = re.compile("^@ (?P<filesystem>[A-Za-z0-9-_]*)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(DAYS_REGEX, MONTHS_REGEX, DOW_REGEX,
+                                                                                          TIME_REGEX, YEAR_REGEX, HOSTNAME_REGEX))
+# old format, try it. My glock_merge needs to use same format as latest. Should
+# keep this for older versions running in the wild.
+REGEX_SNAPSHOT_OLD = re.compile("^@ (?P<filesystem>\w+)\s+%s\s%s\s*%s\s%s\s%s\s\s%s" %(DAYS_REGEX, MONTHS_REGEX, DOW_REGEX,
+                                                                           TIME_REGEX, YEAR_REGEX, HOSTNAME_REGEX))
+# The header formats in the order they are tried.
+REGEX_SNAPSHOT_FORMATS = [REGEX_SNAPSHOT, REGEX_SNAPSHOT_OLD]
+
+# A glocktop would not parse because of day of week string and not sure why,
+# but this regex allow to continue. It parses filesystem was empty string that
+# messed up results.
+# REGEX_SNAPSHOT = re.compile("^@ (?P<filesystem>[a-z0-9-_]*).*\s%s\s*%s\s%s\s%s\s\s%s" %(MONTHS_REGEX, DOW_REGEX, TIME_REGEX, YEAR_REGEX, HOSTNAME_REGEX))
+
+# dlm_regex = "(?P<dlm_dirtbl_size>\d+)/(?P<dlm_rsbtbl_size>\d+)/(?P<dlm_lkbtbl_size>\d+)\s\[(?P<dlm_activity>\*+).*"
+# Need when there is no hash table sizes.
+REGEX_DLM_ACTIVITY = re.compile("(?P<dlm_dirtbl_size>\d+|\s?)/(?P<dlm_rsbtbl_size>\d+|\s?)/(?P<dlm_lkbtbl_size>\d+|\s)\s\[(?P<dlm_activity>\*+).*")
+
+# The number of each month abbreviation that is matched by MONTHS_REGEX.
+MONTHS = dict([(month_abbr, month) for (month, month_abbr) in enumerate(calendar.month_abbr) if (month_abbr)])
+
+# glocktop writes a header for each filesystem every few seconds, so most
+# headers have the same date as the header before it and many have the same
+# time. The date and the date_time of the last header are kept so that only the
+# time has to be converted when the date has not changed.
+__LAST_DATE = (None, None)
+__LAST_DATE_TIME = (None, None)
+
+def parse_date_time(month, dow, year, time):
+    # Returns the datetime for the fields of the header, which is the same as
+    # datetime.strptime("%s %s %s %s" %(month, dow, year, time), "%b %d %Y %H:%M:%S").
+    global __LAST_DATE, __LAST_DATE_TIME
+    date_time_key = (month, dow, year, time)
+    (last_date_time_key, date_time) = __LAST_DATE_TIME
+    if (date_time_key == last_date_time_key):
+        return date_time
+    date_key = (month, dow, year)
+    (last_date_key, date) = __LAST_DATE
+    if (not date_key == last_date_key):
+        # Check that the date is valid before it is kept.
+        date = datetime(int(year), MONTHS[month], int(dow)).date()
+        __LAST_DATE = (date_key, date)
+    (hour, minute, second) = time.split(":")
+    date_time = datetime(date.year, date.month, date.day, int(hour), int(minute), int(second))
+    __LAST_DATE_TIME = (date_time_key, date_time)
+    return date_time
 
+def get_snapshot_format(line):
+    # Returns the compiled regex for the header format that matches the "@"
+    # line or None if no format matches.
+    for regex in REGEX_SNAPSHOT_FORMATS:
+        if (not regex.match(line) == None):
+            return regex
+    return None
+
+def parse_snapshot(line, show_ended_process_and_tlocks=False, snapshot_format=None):
+    # The snapshot_format is the regex returned by get_snapshot_format() for
+    # the file. If it does not match the line then all the formats are tried.
+    mo = None
+    if (not snapshot_format == None):
+        mo = snapshot_format.match(line)
+    if (mo == None):
+        for regex in REGEX_SNAPSHOT_FORMATS:
+            mo = regex.match(line)
+            if (not mo == None):
+                break
     if mo:
-        date_time = datetime.strptime("%s %s %s %s" %(mo.group("month"), mo.group("dow"), mo.group("year"), mo.group("time")), "%b %d %Y %H:%M:%S")
+        date_time = parse_date_time(mo.group("month"), mo.group("dow"), mo.group("year"), mo.group("time"))
         split_line = mo.group("hostname").strip().split("dlm:")
         hostname = split_line[0].strip()
         # Check to see if DLM data is at end of string contained in hostname
@@ -64,11 +113,7 @@ def parse_snapshot(line, show_ended_process_and_tlocks=False):
         # - 1 lock could have multiple waiters(or lines).
         dlm_activity = None
         if (len(split_line) == 2):
-            # dlm_regex = "(?P<dlm_dirtbl_size>\d+)/(?P<dlm_rsbtbl_size>\d+)/(?P<dlm_lkbtbl_size>\d+)\s\[(?P<dlm_activity>\*+).*"
-            # Need when there is no hash table sizes.
-            dlm_regex = "(?P<dlm_dirtbl_size>\d+|\s?)/(?P<dlm_rsbtbl_size>\d+|\s?)/(?P<dlm_lkbtbl_size>\d+|\s)\s\[(?P<dlm_activity>\*+).*"
-            rem_dlm = re.compile(dlm_regex)
-            mo_dlm = rem_dlm.match(split_line[1].strip())
+            mo_dlm = REGEX_DLM_ACTIVITY.match(split_line[1].strip())
             if mo_dlm:
                 # Default sizes for DLM hash tables which will be used if sizes
                 # not in output.
@@ -91,6 +136,13 @@ def parse_snapshot(line, show_ended_process_and_tlocks=False):
         return Snapshot(mo.group("filesystem"), hostname, date_time, dlm_activity, show_ended_process_and_tlocks)
     return None
 
+def __add_call_trace(glock, call_trace):
+    # The call trace is for the first holder of the glock.
+    if ((call_trace) and (not glock == None)):
+        glock_holders = glock.get_holders()
+        if (glock_holders):
+            glock_holders[0].add_call_trace(call_trace)
+
 def process_snapshot(snapshot, snapshot_lines):
     # Process any remaining items
     if (not snapshot == None):
@@ -99,10 +151,7 @@ def process_snapshot(snapshot, snapshot_lines):
         call_trace = []
         for sline in snapshot_lines:
             if (sline.startswith("G")):
-                if ((call_trace) and (not glock == None)):
-                    glock_holders = glock.get_holders()
-                    if (glock_holders):
-                        glock_holders[0].add_call_trace(call_trace)
+                __add_call_trace(glock, call_trace)
                 # Reset call trace.
                 call_trace = []
                 glock = parse_glock(sline)
@@ -142,6 +191,8 @@ def process_snapshot(snapshot, snapshot_lines):
                 # got ten processes waiting, or ten glocks that have ten
                 # processes waiting.
                 glocks_stats_lines.append(sline)
+        # The call trace of the last glock in the snapshot.
+        __add_call_trace(glock, call_trace)
         if (glocks_stats_lines):
             filesystem_name = snapshot.get_filesystem_name()
             date_time = snapshot.get_date_time()
@@ -153,3 +204,41 @@ def process_snapshot(snapshot, snapshot_lines):
                     for glock_type in glocktop_analyze.glocks_stats.GLOCK_TYPES:
                         glocks_stats.add_stat(glock_type, glock_state, int(stat_map.get(glock_type)))
             snapshot.add_glocks_stats(glocks_stats)
+
+def parse_snapshots(lines, gfs2_filesystem_names=[], show_ended_process_and_tlocks=False):
+    # A generator that returns each snapshot once all of its lines have been
+    # processed. Only the lines for the current snapshot are held in memory.
+    # The lines are split into snapshots on the "@" lines.
+    gfs2_snapshot = None
+    # The lines that are related to this snapshot of the filesystem. Including
+    # glocks, waiters, etc.
+    snapshot_lines = []
+    # The header format is found on the first "@" line and then used for the
+    # rest of the lines.
+    snapshot_format = None
+    for line in lines:
+        # @, G, H, I, R, B, U, C, S
+        if ((line.startswith("@")) or (not len(line) > 0)):
+            if (not gfs2_snapshot == None):
+                # Process any previous snapshot lines before starting a new
+                # one. All the glocks, holder/waiters, etc.
+                process_snapshot(gfs2_snapshot, snapshot_lines)
+                yield gfs2_snapshot
+            # Process the new snapshot
+            gfs2_snapshot = None
+            if (line):
+                if (snapshot_format == None):
+                    snapshot_format = get_snapshot_format(line)
+                gfs2_snapshot = parse_snapshot(line, show_ended_process_and_tlocks, snapshot_format)
+            if ((not gfs2_snapshot == None) and (gfs2_filesystem_names) and
+                (not gfs2_snapshot.get_filesystem_name().strip() in gfs2_filesystem_names)):
+                # Skip the lines for filesystems that are not going to be
+                # analyzed.
+                gfs2_snapshot = None
+            snapshot_lines = []
+        elif (not gfs2_snapshot == None):
+            snapshot_lines.append(line)
+    # Process any remaining items
+    if (not gfs2_snapshot == None):
+        process_snapshot(gfs2_snapshot, snapshot_lines)
+        yield gfs2_snapshot
@@ -9,6 +9,7 @@ from datetime import datetime
 import glocktop_analyze
 from glocktop_analyze.snapshot import Snapshot
 from glocktop_analyze.glocks_stats import GlocksStats, GlockStat
+from glocktop_analyze.glocks_columns import GlocksColumns
 from glocktop_analyze.utilities import LogWriter, mkdirs, write_to_file
 
 try:
@@ -22,6 +23,33 @@ except (ImportError, NameError):
 # Classes
 # #######################################################################
 class Plugin(object):
+    # The snapshots can be given when the plugin is created and then analyzed
+    # with analyze(), or they can be fed to the plugin one at a time:
+    #   plugin.begin()
+    #   plugin.feed(snapshot) for each snapshot in the order they were taken
+    #   plugin.finish()
+    # A plugin only keeps the data it needs from each snapshot that is fed to
+    # it, so the snapshots do not have to be held in memory.
+    #
+    # The default feed() walks the snapshot and calls the visit hooks:
+    #   visit_snapshot(snapshot)
+    #   visit_glock(snapshot, glock) for each glock
+    #   visit_glock_holder(snapshot, glock, glock_holder) for each holder
+    #   leave_snapshot(snapshot)
+    # A plugin should only override the hooks it needs, so that the
+    # PluginsDispatcher can walk a snapshot once for all the plugins. A plugin
+    # that overrides visit_snapshot() or feed() must call
+    # Plugin.visit_snapshot(self, snapshot).
+    #
+    # A plugin that sets GLOCKS_COLUMNS to True has the glocks of the snapshots
+    # that were fed to it added to a GlocksColumns that is returned by
+    # get_glocks_columns(). The GlocksColumns only keeps running counts of the
+    # glocks unless the plugin also sets GLOCKS_COLUMNS_ROWS to True, since a
+    # row for each glock in each snapshot grows with every snapshot. The
+    # PluginsDispatcher shares one GlocksColumns between its plugins.
+    GLOCKS_COLUMNS = False
+    GLOCKS_COLUMNS_ROWS = False
+
     def __init__(self, name, description, snapshots, title, path_to_output_dir, options, multiply_node_enabled=False):
         # A list of snapshots of a particular filesystem.
         self.__name = name
@@ -34,7 +62,11 @@ class Plugin(object):
         self.__options = {}
         self.__multiply_node_enabled = multiply_node_enabled
         self.__snapshots_start_time, self.__snapshots_end_time = self.get_snapshots_times(self.__snapshots)
-
+        # The filesystem name and hostname of the first snapshot fed to the
+        # plugin.
+        self.__filesystem_name = ""
+        self.__hostname = ""
+        self.__glocks_columns = None
 
         if hasattr(self, "OPTIONS"):
             # Populate the options with default value.
@@ -96,7 +128,9 @@ class Plugin(object):
         return ""
 
     def get_filesystem_name(self):
-        if (self.__snapshots):
+        if (self.__filesystem_name):
+            return self.__filesystem_name
+        elif (self.__snapshots):
             return self.__snapshots[0].get_filesystem_name()
         return ""
 
@@ -108,9 +142,13 @@ class Plugin(object):
         If multinode is enabled then None is returned since multinode could have
         multiple hostnames.
         """
-        if ((not self.__snapshots) or (self.is_multiply_node_enabled())):
+        if (self.is_multiply_node_enabled()):
             return ""
-        return self.__snapshots[0].get_hostname()
+        elif (self.__hostname):
+            return self.__hostname
+        elif (self.__snapshots):
+            return self.__snapshots[0].get_hostname()
+        return ""
 
     def get_snapshots_start_time(self):
         """
@@ -127,10 +165,27 @@ class Plugin(object):
     def get_warnings(self):
         return self.__warnings
 
+    def get_glocks_columns(self):
+        return self.__glocks_columns
+
+    def set_glocks_columns(self, glocks_columns):
+        self.__glocks_columns = glocks_columns
+
     def add_warning(self, admonition):
         if (not admonition in self.get_warnings()):
             self.__warnings.append(admonition)
 
+    def replace_warning(self, admonition, new_admonition):
+        # Replaces a warning that was added while the snapshots were fed with a
+        # warning that has what was found in all the snapshots. The new warning
+        # takes the place of the warning it replaces.
+        if (new_admonition in self.__warnings):
+            return
+        if (admonition in self.__warnings):
+            self.__warnings[self.__warnings.index(admonition)] = new_admonition
+        else:
+            self.__warnings.append(new_admonition)
+
     def console(self):
         pass
 
@@ -140,17 +195,68 @@ class Plugin(object):
     def graph(self, png_format=False):
         pass
 
-    def analyze(self):
+    def begin(self):
+        # Called before the first snapshot is fed to the plugin.
+        self.__snapshots_start_time = None
+        self.__snapshots_end_time = None
+        if (self.GLOCKS_COLUMNS):
+            self.__glocks_columns = GlocksColumns(keep_rows=self.GLOCKS_COLUMNS_ROWS)
+
+    def feed(self, snapshot):
+        # Called for each snapshot in the order the snapshots were taken.
+        self.visit_snapshot(snapshot)
+        for glock in snapshot.get_glocks():
+            self.visit_glock(snapshot, glock)
+            for glock_holder in glock.get_holders():
+                self.visit_glock_holder(snapshot, glock, glock_holder)
+        self.leave_snapshot(snapshot)
+
+    def visit_snapshot(self, snapshot):
+        # Called when a snapshot is fed to the plugin before its glocks are
+        # visited.
+        if (not self.__filesystem_name):
+            self.__filesystem_name = snapshot.get_filesystem_name()
+        if (not self.__hostname):
+            self.__hostname = snapshot.get_hostname()
+        date_time = snapshot.get_date_time()
+        if ((self.__snapshots_start_time == None) or (self.__snapshots_start_time > date_time)):
+            self.__snapshots_start_time = date_time
+        if ((self.__snapshots_end_time == None) or (self.__snapshots_end_time < date_time)):
+            self.__snapshots_end_time = date_time
+        if (not self.__glocks_columns == None):
+            self.__glocks_columns.add_snapshot(snapshot)
+
+    def visit_glock(self, snapshot, glock):
+        # Called for each glock in the snapshot.
+        pass
+
+    def visit_glock_holder(self, snapshot, glock, glock_holder):
+        # Called for each holder or waiter of the glock after the glock was
+        # visited.
+        pass
+
+    def leave_snapshot(self, snapshot):
+        # Called after all the glocks of the snapshot were visited.
+        pass
+
+    def finish(self):
+        # Called after the last snapshot was fed to the plugin.
         pass
 
+    def analyze(self):
+        # Feeds all the snapshots the plugin was created with to the plugin.
+        self.begin()
+        for snapshot in self.get_snapshots():
+            self.feed(snapshot)
+        self.finish()
+
 class PluginMultinode(Plugin):
     def __init__(self, name, description, grouped_snapshots, title, path_to_output_dir, options):
         self.__grouped_snapshots = grouped_snapshots
         # Create a list of all the snapshots for the parent plugin.
         snapshots = []
-        sorted_keys = sorted(self.__grouped_snapshots.keys())
-        for key in sorted_keys:
-            snapshots += self.__grouped_snapshots.get(key)
+        for gsnapshots in self.__grouped_snapshots:
+            snapshots += gsnapshots
         Plugin.__init__(self, name, description, snapshots, title, path_to_output_dir, options, multiply_node_enabled=True)
 
     def get_hostnames(self):
@@ -200,23 +306,101 @@ class PluginMultinode(Plugin):
                     snapshots.append(snapshot)
         return snapshots
 
+    def feed_group(self, snapshots):
+        # Called for each group of snapshots that were taken around the same
+        # time in the order of the groups.
+        for snapshot in snapshots:
+            self.feed(snapshot)
+
+    def analyze(self):
+        # Feeds all the groups of snapshots the plugin was created with to the
+        # plugin.
+        self.begin()
+        for gsnapshots in self.get_snapshots_by_group():
+            self.feed_group(gsnapshots)
+        self.finish()
+
     def get_snapshots_by_group(self):
-        # Returns map of snapshots grouped together. The key is the group count
-        # and value is a list of snapshots that were taken around the same time.
+        # Returns a list of the groups of snapshots in the order the groups were
+        # taken. Each group is a list of snapshots that were taken around the
+        # same time.
         return self.__grouped_snapshots
 
     def get_snapshots_sorted_by_time(self):
         sorted_snapshots = []
-        grouped_snapshots = self.get_snapshots_by_group()
-        group_count_sorted = grouped_snapshots.keys()
-        group_count_sorted.sort()
-        snapshots_table_by_group = ""
-        for group_count in group_count_sorted:
-            gsnapshots = grouped_snapshots.get(group_count)
-            for gsnapshot in gsnapshots:
-                sorted_snapshots.append(gsnapshot)
+        for gsnapshots in self.get_snapshots_by_group():
+            sorted_snapshots += gsnapshots
         return sorted_snapshots
 
+class PluginsDispatcher:
+    # Feeds the snapshots to a list of plugins by walking each snapshot, its
+    # glocks and the holders of each glock once, and calling the visit hooks of
+    # the plugins that override them. A plugin that overrides feed() is fed the
+    # snapshot instead.
+    def __init__(self, plugins):
+        self.__plugins = plugins
+        self.__feed_plugins = []
+        self.__snapshot_visitors = []
+        self.__glock_visitors = []
+        self.__glock_holder_visitors = []
+        self.__leave_snapshot_visitors = []
+        for plugin in plugins:
+            if (self.__is_overridden(plugin, "feed")):
+                self.__feed_plugins.append(plugin)
+                continue
+            # Every plugin has to visit the snapshot since Plugin records the
+            # snapshot times.
+            self.__snapshot_visitors.append(plugin)
+            if (self.__is_overridden(plugin, "visit_glock")):
+                self.__glock_visitors.append(plugin)
+            if (self.__is_overridden(plugin, "visit_glock_holder")):
+                self.__glock_holder_visitors.append(plugin)
+            if (self.__is_overridden(plugin, "leave_snapshot")):
+                self.__leave_snapshot_visitors.append(plugin)
+
+    def __is_overridden(self, plugin, method_name):
+        return (not getattr(type(plugin), method_name).im_func is getattr(Plugin, method_name).im_func)
+
+    def get_plugins(self):
+        return self.__plugins
+
+    def begin(self):
+        # The rows of the shared GlocksColumns are only kept if a plugin needs
+        # them.
+        glocks_columns = None
+        for plugin in self.__plugins:
+            if ((plugin.GLOCKS_COLUMNS) and (plugin.GLOCKS_COLUMNS_ROWS)):
+                glocks_columns = GlocksColumns(keep_rows=True)
+                break
+        for plugin in self.__plugins:
+            plugin.begin()
+            if (plugin.GLOCKS_COLUMNS):
+                if (glocks_columns == None):
+                    glocks_columns = plugin.get_glocks_columns()
+                plugin.set_glocks_columns(glocks_columns)
+
+    def feed(self, snapshot):
+        for plugin in self.__feed_plugins:
+            plugin.feed(snapshot)
+        for plugin in self.__snapshot_visitors:
+            plugin.visit_snapshot(snapshot)
+        glock_visitors = self.__glock_visitors
+        glock_holder_visitors = self.__glock_holder_visitors
+        if (glock_visitors or glock_holder_visitors):
+            for glock in snapshot.get_glocks():
+                for plugin in glock_visitors:
+                    plugin.visit_glock(snapshot, glock)
+                if (glock_holder_visitors):
+                    for glock_holder in glock.get_holders():
+                        for plugin in glock_holder_visitors:
+                            plugin.visit_glock_holder(snapshot, glock, glock_holder)
+        for plugin in self.__leave_snapshot_visitors:
+            plugin.leave_snapshot(snapshot)
+
+    def finish(self):
+        for plugin in self.__plugins:
+            plugin.finish()
+
 class Admonition:
     # A class that will hold a warning/notice about something found.
     def __init__(self, hostname, filesystem_name, wtype, description, uri=""):
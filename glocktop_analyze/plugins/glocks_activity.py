@@ -16,6 +16,8 @@ Options for this plugin:
 import logging
 import logging.handlers
 import os.path
+import tempfile
+import itertools
 
 import glocktop_analyze
 from glocktop_analyze.plugins import Plugin
@@ -33,64 +35,52 @@ class GlocksActivity(Plugin):
                         options)
         self.__glock_dump = []
         self.__mininum_waiter_count = int(self.get_option("mininum_waiter_count"))
+        # A list of the snapshot and glocks that had the minimum number of
+        # holder and waiters: (snapshot, [(glock, [holders], glock_object)]).
+        self.__glocks_activity = []
+        # The raw data for all the glocks is written to a temporary file as the
+        # snapshots are fed, so it is not held in memory.
+        self.__raw_file = None
+        self.__raw_data_found = False
+        # The glocks and raw data of the snapshot that is being visited.
+        self.__current_glocks = []
+        self.__current_raw_data = ""
 
     def __get_text(self, colorize=False):
         summary = ""
-        for snapshot in self.get_snapshots():
+        for (snapshot, glocks) in self.__glocks_activity:
             current_summary = ""
-            glocks = snapshot.get_glocks()
-            for glock in glocks:
-                glock_holders = glock.get_holders()
-                if (len(glock_holders) >= self.__mininum_waiter_count):
-                    current_summary += "  %s\n" %(glock)
-                    for holder in glock_holders:
-                        current_summary += "     %s\n" %(holder)
-                    if (not glock.get_glock_object() == None):
-                        current_summary += "     %s\n" %(glock.get_glock_object())
+            for (glock, glock_holders, glock_object) in glocks:
+                current_summary += "  %s\n" %(glock)
+                for holder in glock_holders:
+                    current_summary += "     %s\n" %(holder)
+                if (not glock_object == None):
+                    current_summary += "     %s\n" %(glock_object)
             if (current_summary):
-                current_summary_title = str(snapshot)
+                current_summary_title = snapshot
                 if (colorize):
-                    current_summary_title = ColorizeConsoleText.red(str(snapshot))
+                    current_summary_title = ColorizeConsoleText.red(snapshot)
                 summary += "%s\n%s\n" %(current_summary_title, current_summary)
         if (summary):
             return "%s: %s\n%s" %(self.get_title(), self.get_description(),
                                   summary.rstrip("----------------"))
         return ""
 
-    def __get_raw(self, colorize=False):
-        raw_data = ""
-        for snapshot in self.get_snapshots():
-            current_raw_data = ""
-            glocks = snapshot.get_glocks()
-            for glock in glocks:
-                glock_holders = glock.get_holders()
-                current_raw_data += "  %s\n" %(glock)
-                for holder in glock_holders:
-                    current_raw_data += "     %s\n" %(holder)
-                if (not glock.get_glock_object() == None):
-                    current_raw_data += "     %s\n" %(glock.get_glock_object())
-            if (current_raw_data.strip()):
-                raw_data += "%s\n  %s\n\n" %(str(snapshot), current_raw_data.strip())
-        return raw_data.strip()
-
     def __get_html(self, colorize=False):
         summary = ""
-        for snapshot in self.get_snapshots():
+        for (snapshot, glocks) in self.__glocks_activity:
             current_summary = ""
-            glocks = snapshot.get_glocks()
-            for glock in glocks:
-                glock_holders = glock.get_holders()
-                if (len(glock_holders) >= self.__mininum_waiter_count):
-                    current_summary += "<b>&nbsp;&nbsp;%s</b><BR/>" %(glock)
-                    for holder in glock_holders:
-                        current_summary += "&nbsp;&nbsp;&nbsp;&nbsp; %s<BR/>" %(holder)
-                    if (not glock.get_glock_object() == None):
-                        current_summary += "&nbsp;&nbsp;&nbsp;&nbsp; %s<BR/>" %(glock.get_glock_object())
-                    current_summary += "<BR/>"
+            for (glock, glock_holders, glock_object) in glocks:
+                current_summary += "<b>&nbsp;&nbsp;%s</b><BR/>" %(glock)
+                for holder in glock_holders:
+                    current_summary += "&nbsp;&nbsp;&nbsp;&nbsp; %s<BR/>" %(holder)
+                if (not glock_object == None):
+                    current_summary += "&nbsp;&nbsp;&nbsp;&nbsp; %s<BR/>" %(glock_object)
+                current_summary += "<BR/>"
             if (current_summary):
-                current_summary_title = str(snapshot)
+                current_summary_title = snapshot
                 if (colorize):
-                    current_summary_title = "<b><span class=\"red\">%s</span></b>" %(str(snapshot))
+                    current_summary_title = "<b><span class=\"red\">%s</span></b>" %(snapshot)
                 summary += "%s<BR/>%s" %(current_summary_title, current_summary)
         if (summary):
             header =  "<center><H3>Glock Activity between "
@@ -99,6 +89,46 @@ class GlocksActivity(Plugin):
             return header + summary
         return ""
 
+    def begin(self):
+        Plugin.begin(self)
+        self.__glocks_activity = []
+        if (not self.__raw_file == None):
+            self.__raw_file.close()
+        self.__raw_file = tempfile.TemporaryFile()
+        self.__raw_data_found = False
+
+    def visit_snapshot(self, snapshot):
+        Plugin.visit_snapshot(self, snapshot)
+        self.__current_glocks = []
+        self.__current_raw_data = ""
+
+    def visit_glock(self, snapshot, glock):
+        glock_holders = glock.get_holders()
+        if (len(glock_holders) >= self.__mininum_waiter_count):
+            glock_object = glock.get_glock_object()
+            if (not glock_object == None):
+                glock_object = str(glock_object)
+            self.__current_glocks.append((str(glock), [str(holder) for holder in glock_holders], glock_object))
+        current_raw_data = "  %s\n" %(glock)
+        for holder in glock_holders:
+            current_raw_data += "     %s\n" %(holder)
+        if (not glock.get_glock_object() == None):
+            current_raw_data += "     %s\n" %(glock.get_glock_object())
+        self.__current_raw_data += current_raw_data
+
+    def leave_snapshot(self, snapshot):
+        if (self.__current_glocks):
+            self.__glocks_activity.append((str(snapshot), self.__current_glocks))
+        current_raw_data = self.__current_raw_data
+        self.__current_glocks = []
+        self.__current_raw_data = ""
+        if (current_raw_data.strip()):
+            # The snapshots are separated by an empty line.
+            if (self.__raw_data_found):
+                self.__raw_file.write("\n\n")
+            self.__raw_file.write("%s\n  %s" %(str(snapshot), current_raw_data.strip()))
+            self.__raw_data_found = True
+
     def console(self):
         summary = self.__get_text(colorize=True)
         if (summary):
@@ -126,12 +156,13 @@ class GlocksActivity(Plugin):
             if (not write_to_file(path_to_output_file, wdata, append_to_file=False, create_file=True)):
                 message = "An error occurred writing to the file: %s" %(path_to_output_file)
                 logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-        raw_data = self.__get_raw()
-        if (raw_data):
+        if (self.__raw_data_found):
             filename = "%s-raw.txt" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
             path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
                                                             self.get_filesystem_name()), filename)
-            if (not write_to_file(path_to_output_file, "%s\n" %(raw_data),
+            # The temporary file is copied to the output file a line at a time.
+            self.__raw_file.seek(0)
+            if (not write_to_file(path_to_output_file, itertools.chain(self.__raw_file, ["\n"]),
                                   append_to_file=False, create_file=True)):
                 message = "An error occurred writing to the file: %s" %(path_to_output_file)
                 logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
@@ -16,6 +16,8 @@ Options for this plugin:
 import logging
 import logging.handlers
 import os.path
+import tempfile
+import itertools
 
 import glocktop_analyze
 from glocktop_analyze.plugins import PluginMultinode
@@ -32,52 +34,63 @@ class GlocksActivityMultipleNodes(PluginMultinode):
                                  grouped_snapshots, "Glocks Activity for Multiple Nodes", path_to_output_dir,
                                  options)
         self.__mininum_waiter_count = int(self.get_option("mininum_waiter_count"))
+        # A list of the snapshot and the summary of the glocks that had the
+        # minimum number of holder and waiters.
+        self.__glocks_activity = []
+        # The raw data for all the glocks is written to a temporary file as the
+        # snapshots are fed, so it is not held in memory.
+        self.__raw_file = None
+        self.__raw_data_found = False
 
     def __get_text(self, colorize=False):
         summary = ""
-        sorted_snapshots = self.get_snapshots_sorted_by_time()
-        for snapshot in sorted_snapshots:
-            current_summary = ""
-            glocks = snapshot.get_glocks()
-            for glock in glocks:
-                glock_holders = glock.get_holders()
-                if (len(glock_holders) >= self.__mininum_waiter_count):
-                    current_summary += "  %s\n" %(glock)
-                    for holder in glock_holders:
-                        current_summary += "     %s\n" %(holder)
-                    if (not glock.get_glock_object() == None):
-                        current_summary += "     %s\n" %(glock.get_glock_object())
-            current_summary_title = str(snapshot)
-            if (current_summary):
-                if (colorize):
-                    current_summary_title = ColorizeConsoleText.red(current_summary_title)
-                summary += "%s\n%s\n\n" %(current_summary_title, current_summary.strip())
+        for (current_summary_title, current_summary) in self.__glocks_activity:
+            if (colorize):
+                current_summary_title = ColorizeConsoleText.red(current_summary_title)
+            summary += "%s\n%s\n\n" %(current_summary_title, current_summary.strip())
         if (summary):
             return "%s: %s\n%s" %(self.get_title(), self.get_description(),
                                   summary.strip())
         return summary.strip()
 
-    def __get_raw(self, colorize=False):
-        raw_data = ""
-        sorted_snapshots = self.get_snapshots_sorted_by_time()
-        for snapshot in sorted_snapshots:
-            current_raw_data = ""
-            glocks = snapshot.get_glocks()
-            for glock in glocks:
-                glock_holders = glock.get_holders()
-                current_raw_data += "  %s\n" %(glock)
-                for holder in glock_holders:
-                    current_raw_data += "     %s\n" %(holder)
-                    if (not glock.get_glock_object() == None):
-                        current_raw_data += "     %s\n" %(glock.get_glock_object())
-            if (current_raw_data):
-                raw_data += "%s\n  %s\n\n" %(str(snapshot), current_raw_data.strip())
-        return raw_data.strip()
-
     def __get_html(self, colorize=False):
         summary = ""
         return ""
 
+    def begin(self):
+        PluginMultinode.begin(self)
+        self.__glocks_activity = []
+        if (not self.__raw_file == None):
+            self.__raw_file.close()
+        self.__raw_file = tempfile.TemporaryFile()
+        self.__raw_data_found = False
+
+    def visit_snapshot(self, snapshot):
+        PluginMultinode.visit_snapshot(self, snapshot)
+        current_summary = ""
+        current_raw_data = ""
+        for glock in snapshot.get_glocks():
+            glock_holders = glock.get_holders()
+            if (len(glock_holders) >= self.__mininum_waiter_count):
+                current_summary += "  %s\n" %(glock)
+                for holder in glock_holders:
+                    current_summary += "     %s\n" %(holder)
+                if (not glock.get_glock_object() == None):
+                    current_summary += "     %s\n" %(glock.get_glock_object())
+            current_raw_data += "  %s\n" %(glock)
+            for holder in glock_holders:
+                current_raw_data += "     %s\n" %(holder)
+                if (not glock.get_glock_object() == None):
+                    current_raw_data += "     %s\n" %(glock.get_glock_object())
+        if (current_summary):
+            self.__glocks_activity.append((str(snapshot), current_summary))
+        if (current_raw_data):
+            # The snapshots are separated by an empty line.
+            if (self.__raw_data_found):
+                self.__raw_file.write("\n\n")
+            self.__raw_file.write("%s\n  %s" %(str(snapshot), current_raw_data.strip()))
+            self.__raw_data_found = True
+
     def console(self):
         summary = self.__get_text(colorize=True)
         if (summary):
@@ -105,12 +118,13 @@ class GlocksActivityMultipleNodes(PluginMultinode):
             if (not write_to_file(path_to_output_file, wdata, append_to_file=False, create_file=True)):
                 message = "An error occurred writing to the file: %s" %(path_to_output_file)
                 logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-        raw_data = self.__get_raw()
-        if (raw_data):
+        if (self.__raw_data_found):
             filename = "%s-raw.txt" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
             path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
                                                             self.get_filesystem_name()), filename)
-            if (not write_to_file(path_to_output_file, "%s\n" %(raw_data),
+            # The temporary file is copied to the output file a line at a time.
+            self.__raw_file.seek(0)
+            if (not write_to_file(path_to_output_file, itertools.chain(self.__raw_file, ["\n"]),
                                   append_to_file=False, create_file=True)):
                 message = "An error occurred writing to the file: %s" %(path_to_output_file)
                 logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
@@ -7,12 +7,17 @@
   glock that has the holder flag set.
 
 Options for the plugin:
-
+* minimum_glock_seq: The minimum number of sequential snapshots to flag glock as
+  a pattern.
+* minimum_glocks_dep: The minimum number of dependencies for a glock.
+* maximum_snapshots: The maximum number of snapshots with glock dependencies
+  that are kept for the output. The most recent snapshots are kept and 0 keeps
+  all the snapshots.
 """
 import logging
 import logging.handlers
 import os.path
-import re
+from collections import deque
 
 import glocktop_analyze
 from glocktop_analyze.plugins import Plugin, Admonition
@@ -21,11 +26,21 @@ from glocktop_analyze.html import generate_footer
 from glocktop_analyze.html import generate_css_header
 
 class PidGlocksInSnapshot:
-    def __init__(self, list_of_pidglocks, hostname, filesystem_name, date_time):
-        self.__list_of_pidglocks = list_of_pidglocks
+    # The dependencies of the pids on the glocks in a snapshot. The dependencies
+    # are kept as (pid, command, glock type, glock inode, glock index) edges and
+    # the text of each glock is rendered once when it is added, so no
+    # references to the Glock objects are kept once the snapshot has been
+    # processed. The glock index is needed since the same glock type/inode can
+    # be dumped more than once in a snapshot.
+    def __init__(self, hostname, filesystem_name, date_time):
         self.__hostname = hostname
         self.__filesystem_name = filesystem_name
         self.__date_time  = date_time
+        self.__edges = []
+        # A tuple for each glock of the glock text, the holders text, the glock
+        # object text or None and if the glock has a holder with the holder flag
+        # set.
+        self.__glocks = []
 
     def __str__(self):
         rstring = "%s:%s @%s\n" %(self.get_hostname(),
@@ -42,8 +57,34 @@ class PidGlocksInSnapshot:
     def get_date_time(self):
         return self.__date_time
 
+    def get_edges(self):
+        return self.__edges
+
+    def get_glock(self, glock_index):
+        return self.__glocks[glock_index]
+
     def get_pidglocks(self):
-        return self.__list_of_pidglocks
+        # Returns a list of (pid, command, list of glock text tuples) in the
+        # order the pids were added.
+        list_of_pidglocks = []
+        for (pid, command, gtype, ginode, glock_index) in self.__edges:
+            if ((not list_of_pidglocks) or (not list_of_pidglocks[-1][0] == pid) or
+                (not list_of_pidglocks[-1][1] == command)):
+                list_of_pidglocks.append((pid, command, []))
+            list_of_pidglocks[-1][2].append(self.__glocks[glock_index])
+        return list_of_pidglocks
+
+    def add_glock(self, glock):
+        # Returns the glock index of the text of the glock that was added.
+        glock_object = glock.get_glock_object()
+        if (not glock_object == None):
+            glock_object = str(glock_object)
+        self.__glocks.append((str(glock), tuple([str(h) for h in glock.get_holders()]),
+                              glock_object, (not glock.get_glock_holder() == None)))
+        return len(self.__glocks) - 1
+
+    def add_edge(self, pid, command, glock_type, glock_inode, glock_index):
+        self.__edges.append((pid, command, glock_type, glock_inode, glock_index))
 
 class PidGlocks:
     # This object represents all glocks that have holder holding a glocks and is
@@ -76,27 +117,89 @@ class PidGlocks:
     def add_glock(self, glock):
         self.__glocks.append(glock)
 
+class GlockHolderSequence:
+    # The snapshots in a row that a pid had the holder flag set on a glock. The
+    # current run of sequential snapshots and the longest run are kept, so each
+    # snapshot is only looked at once.
+    def __init__(self, snapshot_index, date_time):
+        self.__start_index = snapshot_index
+        self.__end_index = snapshot_index
+        self.__start_time = date_time
+        self.__longest_length = 1
+        self.__longest_start_index = snapshot_index
+        self.__longest_start_time = date_time
+        self.__longest_end_time = date_time
+
+    def add(self, snapshot_index, date_time):
+        if (snapshot_index == self.__end_index):
+            return
+        elif (not snapshot_index == self.__end_index + 1):
+            # The run was broken, so a new run is started.
+            self.__start_index = snapshot_index
+            self.__start_time = date_time
+        self.__end_index = snapshot_index
+        length = self.get_length()
+        if (length > self.__longest_length):
+            self.__longest_length = length
+            self.__longest_start_index = self.__start_index
+            self.__longest_start_time = self.__start_time
+            self.__longest_end_time = date_time
+
+    def get_length(self):
+        # Returns the length of the current run of sequential snapshots.
+        return self.__end_index - self.__start_index + 1
+
+    def get_start_time(self):
+        return self.__start_time
+
+    def get_longest_length(self):
+        return self.__longest_length
+
+    def get_longest_start_index(self):
+        return self.__longest_start_index
+
+    def get_longest_start_time(self):
+        return self.__longest_start_time
+
+    def get_longest_end_time(self):
+        return self.__longest_end_time
+
 class GlocksDependencies(Plugin):
     OPTIONS = [("minimum_glock_seq", "The minimum number of sequential snapshots to flag glock as a pattern.", 3),
-               ("minimum_glocks_dep", "The minimum number of dependencies for a glock.", 1)]
+               ("minimum_glocks_dep", "The minimum number of dependencies for a glock.", 1),
+               ("maximum_snapshots", "The maximum number of snapshots with glock dependencies that are kept (0 keeps all).", 0)]
 
     def __init__(self, snapshots, path_to_output_dir, options):
         Plugin.__init__(self, "glocks_dependencies",
                         "A dependency graph of a glocks for a pid.",
                         snapshots, "Glocks Dependencies", path_to_output_dir,
                         options)
-        self.__glocks_dependencies_snapshots = []
+        self.__glocks_dependencies_snapshots = deque()
+        # The holder flag sequences that are tracked as snapshots are fed.
+        self.__glocks_holders_sequences = {}
+        # The warning that was added for each holder flag sequence when its run
+        # first reached the minimum, so it can be replaced in finish().
+        self.__glocks_holders_warnings = {}
+        self.__snapshot_index = 0
+        # The pids and the glocks with holder flag set that are found while
+        # visiting a snapshot.
+        self.__map_of_pidglocks = {}
+        self.__pids_with_holder_flag = []
         # Set minimum glocks dependency and add the glock itself with plus 1.
         self.__minimum_glocks_dep = self.get_option("minimum_glocks_dep") + 1
-
-    def __encode(self, pid, command):
-        # Not sure what guranteees no duplicates, that command will not be empty
-        # sometimes and not-empty other, etc.
-        return "%s-%s" %(pid, command)
-
-    def __decode(self, hashkey):
-        hashkey_split = hashkey.split("-")
-        return (hashkey_split[0], hashkey_split[1])
+        # The most recent snapshots with dependencies are kept when there is a
+        # maximum.
+        self.__maximum_snapshots = self.get_option("maximum_snapshots")
+        if (self.__maximum_snapshots <= 0):
+            self.__maximum_snapshots = None
+
+    def __get_glock_seq_warning(self, hostname, gtype, ginode, pid, sequence_text):
+        warning_msg =  "The glock \"%s/%s\" used by pid \"%s\" had the holder flag set " %(gtype, ginode, pid)
+        warning_msg += "in %s. " %(sequence_text)
+        warning_msg += "Possible performance degradation or hung detected. "
+        warning_msg += "One possible cause is filesystem has used more than 80% of free space."
+        return Admonition(hostname, self.get_filesystem_name(), "Glocks", warning_msg,
+                          "https://access.redhat.com/solutions/315953")
 
     def __get_text(self, colorize=False):
         # Need to add warning:
@@ -104,23 +207,21 @@ class GlocksDependencies(Plugin):
         for pidglocks_in_snapshot in self.__glocks_dependencies_snapshots:
             snapshot_summary = ""
             # Review all the glocks for a particular pid.
-            for pidglocks in pidglocks_in_snapshot.get_pidglocks():
+            for (pid, command, glocks) in pidglocks_in_snapshot.get_pidglocks():
                 pid_summary = ""
                 glock_holder_flag_found = 0
-                glocks = pidglocks.get_glocks()
                 if (len(glocks) >= self.__minimum_glocks_dep):
-                    for glock in glocks:
-                        pid_summary += "    %s\n" %(glock)
-                        for h in glock.get_holders():
+                    for (glock_text, holders_text, glock_object_text, has_glock_holder) in glocks:
+                        pid_summary += "    %s\n" %(glock_text)
+                        for h in holders_text:
                             pid_summary += "      %s\n" %(h)
-                        glock_object = glock.get_glock_object()
-                        if (not glock_object == None):
-                            pid_summary += "      %s\n" %(glock_object)
-                        if (not glock.get_glock_holder() == None):
+                        if (not glock_object_text == None):
+                            pid_summary += "      %s\n" %(glock_object_text)
+                        if (has_glock_holder):
                             glock_holder_flag_found += 1
                     if (pid_summary):
-                        pid_header =  "  pid: %s command: %s | " %(pidglocks.get_pid(), pidglocks.get_command())
-                        pid_header += "%d glocks associated with pid " %(len(pidglocks.get_glocks()))
+                        pid_header =  "  pid: %s command: %s | " %(pid, command)
+                        pid_header += "%d glocks associated with pid " %(len(glocks))
                         pid_header += "(%d glock holders)\n" %(glock_holder_flag_found)
                         if (colorize):
                             pid_header = ColorizeConsoleText.orange(pid_header)
@@ -141,30 +242,28 @@ class GlocksDependencies(Plugin):
         for pidglocks_in_snapshot in self.__glocks_dependencies_snapshots:
             snapshot_summary = ""
             # Review all the glocks for a particular pid.
-            for pidglocks in pidglocks_in_snapshot.get_pidglocks():
+            for (pid, command, glocks) in pidglocks_in_snapshot.get_pidglocks():
                 pid_summary = ""
                 glock_holder_flag_found = 0
-                glocks = pidglocks.get_glocks()
                 if (len(glocks) >= self.__minimum_glocks_dep):
-                    for glock in glocks:
-                        pid_summary += "<b>&nbsp;&nbsp;%s</b><BR/>" %(glock)
-                        for h in glock.get_holders():
+                    for (glock_text, holders_text, glock_object_text, has_glock_holder) in glocks:
+                        pid_summary += "<b>&nbsp;&nbsp;%s</b><BR/>" %(glock_text)
+                        for h in holders_text:
                             pid_summary += "&nbsp;&nbsp;&nbsp;&nbsp;%s<BR/>" %(h)
-                        glock_object = glock.get_glock_object()
-                        if (not glock_object == None):
-                            pid_summary += "&nbsp;&nbsp;&nbsp;&nbsp;%s<BR/>" %(glock_object)
-                        if (not glock.get_glock_holder() == None):
+                        if (not glock_object_text == None):
+                            pid_summary += "&nbsp;&nbsp;&nbsp;&nbsp;%s<BR/>" %(glock_object_text)
+                        if (has_glock_holder):
                             glock_holder_flag_found += 1
-                if (pid_summary):
-                    pid_header =  "<span class=\"orange\">&nbsp;&nbsp;pid: %s command: %s | " %(pidglocks.get_pid(), pidglocks.get_command())
-                    pid_header += "%d glocks associated with pid " %(len(pidglocks.get_glocks()))
-                    pid_header += "(%d glock holders)</span>" %(glock_holder_flag_found)
-                    snapshot_summary += "<b>%s</b><BR/>%s<BR/>" %(pid_header, pid_summary)
-                if (snapshot_summary):
-                    snapshot_header = "%s - %s @%s" %(pidglocks_in_snapshot.get_filesystem_name(),
-                                                             pidglocks_in_snapshot.get_date_time(),
-                                                             pidglocks_in_snapshot.get_hostname())
-                    summary += "<b><span class=\"red\">%s</span></b><BR/>%s" %(snapshot_header, snapshot_summary.strip())
+                    if (pid_summary):
+                        pid_header =  "<span class=\"orange\">&nbsp;&nbsp;pid: %s command: %s | " %(pid, command)
+                        pid_header += "%d glocks associated with pid " %(len(glocks))
+                        pid_header += "(%d glock holders)</span>" %(glock_holder_flag_found)
+                        snapshot_summary += "<b>%s</b><BR/>%s<BR/>" %(pid_header, pid_summary)
+            if (snapshot_summary):
+                snapshot_header = "%s - %s @%s" %(pidglocks_in_snapshot.get_filesystem_name(),
+                                                  pidglocks_in_snapshot.get_date_time(),
+                                                  pidglocks_in_snapshot.get_hostname())
+                summary += "<b><span class=\"red\">%s</span></b><BR/>%s" %(snapshot_header, snapshot_summary.strip())
         if (summary):
             header =  "<center><H3>Glocks Dependencies between "
             header += "%s and %s </H3></center>" %(self.get_snapshots_start_time().strftime("%Y-%m-%d %H:%M:%S"),
@@ -173,87 +272,88 @@ class GlocksDependencies(Plugin):
             summary = "%s%s" %(header, summary)
         return summary
 
-    def __get_pidglocks(self, snapshot):
-        map_of_pidglocks = {}
-        pids_with_holder_flag = []
+    def begin(self):
+        Plugin.begin(self)
+        self.__glocks_dependencies_snapshots = deque(maxlen=self.__maximum_snapshots)
+        self.__glocks_holders_sequences = {}
+        self.__glocks_holders_warnings = {}
+        self.__snapshot_index = 0
+
+    def visit_snapshot(self, snapshot):
+        Plugin.visit_snapshot(self, snapshot)
+        self.__snapshot_index += 1
+        self.__map_of_pidglocks = {}
+        self.__pids_with_holder_flag = []
+
+    def visit_glock(self, snapshot, glock):
+        # Find the glock with holder flag set and same glock type/name and
+        # pid, and add the snapshot to its sequence.
+        gh = glock.get_glock_holder()
+        if (not gh == None):
+            hashkey = (gh.get_pid(), gh.get_command(), glock.get_type(), glock.get_inode())
+            sequence = self.__glocks_holders_sequences.get(hashkey)
+            if (sequence == None):
+                sequence = GlockHolderSequence(self.__snapshot_index, snapshot.get_date_time())
+                self.__glocks_holders_sequences[hashkey] = sequence
+            else:
+                sequence.add(self.__snapshot_index, snapshot.get_date_time())
+            # The warning is added as soon as a run reaches the minimum, so it
+            # is found while a file is followed. It is replaced with the
+            # longest run in finish().
+            if ((gh.get_pid()) and (not self.__glocks_holders_warnings.has_key(hashkey)) and
+                (sequence.get_length() >= self.get_option("minimum_glock_seq"))):
+                sequence_text = "%d+ sequential snapshots (since %s)" %(sequence.get_length(), sequence.get_start_time())
+                admonition = self.__get_glock_seq_warning(snapshot.get_hostname(), glock.get_type(),
+                                                          glock.get_inode(), gh.get_pid(), sequence_text)
+                self.__glocks_holders_warnings[hashkey] = admonition
+                self.add_warning(admonition)
+
+    def visit_glock_holder(self, snapshot, glock, glock_holder):
         # Sort all the pids associated with a glock into bins.
-        for glock in snapshot.get_glocks():
-            for glock_holder in glock.get_holders():
-                hashkey = self.__encode(glock_holder.get_pid(), glock_holder.get_command())
-                if (not map_of_pidglocks.has_key(hashkey)):
-                    map_of_pidglocks[hashkey] = PidGlocks(glock_holder.get_pid(),
-                                                          glock_holder.get_command())
-                map_of_pidglocks[hashkey].add_glock(glock)
-                if (not glock.get_glock_holder() == None):
-                    # Add all the glocks that have has holder flag set. Do this
-                    # now, so I do not need to go through list a second time.
-                    if (not hashkey in pids_with_holder_flag):
-                        pids_with_holder_flag.append(hashkey)
+        hashkey = (glock_holder.get_pid(), glock_holder.get_command())
+        if (not self.__map_of_pidglocks.has_key(hashkey)):
+            self.__map_of_pidglocks[hashkey] = PidGlocks(glock_holder.get_pid(),
+                                                         glock_holder.get_command())
+        self.__map_of_pidglocks[hashkey].add_glock(glock)
+        if (not glock.get_glock_holder() == None):
+            # Add all the glocks that have has holder flag set. Do this
+            # now, so I do not need to go through list a second time.
+            if (not hashkey in self.__pids_with_holder_flag):
+                self.__pids_with_holder_flag.append(hashkey)
+
+    def leave_snapshot(self, snapshot):
         # Add all the flagged pids that had a glock with a holder ("h") flag
-        # to container for this snapshot.
-        list_of_pidglocks = []
-        for k in pids_with_holder_flag:
-            if (map_of_pidglocks.has_key(k)):
-                list_of_pidglocks.append(map_of_pidglocks.get(k))
-        return PidGlocksInSnapshot(list_of_pidglocks, snapshot.get_hostname(),
-                                   snapshot.get_filesystem_name(),
-                                   snapshot.get_date_time())
-
-    def __find_glock_seq(self):
-        def encode(pid, command, gtype, ginode):
-            return "%s-%s (%s/%s)" %(pid, command, gtype, ginode)
-        # Create a mapping of snapshot date_time and sequence it came in. This
-        # container will contain a key for date/time and value will be snapshot
-        # count when snapshot taken.
-        snapshots_date_time = {}
-        index = 1
-        # Find the glock with holder flag set and same glock type/name and pid.
-        gh_pid = {}
-        for snapshot in self.get_snapshots():
-            snapshots_date_time[snapshot.get_date_time()] = index
-            index += 1
-            for glock in snapshot.get_glocks():
-                gh = glock.get_glock_holder()
-                if (not gh == None):
-                    hashkey = encode(gh.get_pid(), gh.get_command(), glock.get_type(), glock.get_inode())
-                    if (not gh_pid.has_key(hashkey)):
-                        gh_pid[hashkey] = []
-                    gh_pid[hashkey].append(snapshot.get_date_time())
-
-        # Function that will return True if sequence found that meets minimum
-        # numbers of integers in list to qualify as a sequence.
-        def is_sequence(seq, minimum_sequence_size):
-            # If the lists are equal then sequence of numbers.
-            if (len(seq) >= minimum_sequence_size):
-                return seq == range(seq[0], seq[-1]+1)
-            return False
-
-        gh_pid_sequence = []
-        for key in gh_pid.keys():
-            gh_date_times = gh_pid.get(key)
-            indexes = []
-            for date_time in gh_date_times:
-                if (snapshots_date_time.has_key(date_time)):
-                    indexes.append(snapshots_date_time.get(date_time))
-                    if (is_sequence(indexes, self.get_option("minimum_glock_seq"))):
-                        gh_pid_sequence.append(key)
-        return gh_pid_sequence
-
-    def analyze(self):
-        for snapshot in self.get_snapshots():
-            pidglocks_in_snapshot = self.__get_pidglocks(snapshot)
-            if (pidglocks_in_snapshot.get_pidglocks()):
-                self.__glocks_dependencies_snapshots.append(pidglocks_in_snapshot)
-
-        for pidglocks_in_snapshot in self.__glocks_dependencies_snapshots:
+        # to container for this snapshot. Only the pids with enough glocks are
+        # kept since they are the only ones that are reported.
+        pidglocks_in_snapshot = PidGlocksInSnapshot(snapshot.get_hostname(),
+                                                    snapshot.get_filesystem_name(),
+                                                    snapshot.get_date_time())
+        # The glock index of each glock that was added, so a glock shared by
+        # pids is only rendered once.
+        glocks_index = {}
+        for k in self.__pids_with_holder_flag:
+            pidglocks = self.__map_of_pidglocks.get(k)
             # If more than one glock attached to pid then flag.
-            for pidglocks in pidglocks_in_snapshot.get_pidglocks():
-                glocks = pidglocks.get_glocks()
-                if (len(glocks) >= self.__minimum_glocks_dep):
-                    warning_msg =  "Possible lock contention detected on filesystem. "
-                    warning_msg += "Check the glock dependency output for pid \"%s\"." %(pidglocks.get_pid())
-                    self.add_warning(Admonition(snapshot.get_hostname(), self.get_filesystem_name(),
-                                                "Glocks", warning_msg, ""))
+            if ((not pidglocks == None) and (len(pidglocks.get_glocks()) >= self.__minimum_glocks_dep)):
+                for glock in pidglocks.get_glocks():
+                    glock_index = glocks_index.get(id(glock))
+                    if (glock_index == None):
+                        glock_index = pidglocks_in_snapshot.add_glock(glock)
+                        glocks_index[id(glock)] = glock_index
+                    pidglocks_in_snapshot.add_edge(pidglocks.get_pid(), pidglocks.get_command(),
+                                                   glock.get_type(), glock.get_inode(), glock_index)
+                warning_msg =  "Possible lock contention detected on filesystem. "
+                warning_msg += "Check the glock dependency output for pid \"%s\"." %(pidglocks.get_pid())
+                self.add_warning(Admonition(snapshot.get_hostname(), self.get_filesystem_name(),
+                                            "Glocks", warning_msg, ""))
+        if (pidglocks_in_snapshot.get_edges()):
+            self.__glocks_dependencies_snapshots.append(pidglocks_in_snapshot)
+        # The glocks of the snapshot are no longer referenced.
+        self.__map_of_pidglocks = {}
+        self.__pids_with_holder_flag = []
+
+    def finish(self):
+        Plugin.finish(self)
         # Find glocks that have appeared in sequential snapshots. This is
         # related to issue where inode is looking for resource group and cannot
         # find one because they are harder and harder to find.
@@ -262,24 +362,19 @@ class GlocksDependencies(Plugin):
         # sequence. This needs to be defined better for this one particular case
         # and the general case of lock sequential showing up.
         # https://access.redhat.com/solutions/315953
-        glocks_holders_in_sequence = self.__find_glock_seq()
-        if (glocks_holders_in_sequence):
-            def decode(s):
-                regex = re.compile("(?P<pid>\d+)-(?P<command>.*)\((?P<gtype>\d).(?P<ginode>.*)\)")
-                mo = regex.match(s.strip())
-                if (mo):
-                    return mo.group("pid"), mo.group("command"), mo.group("gtype"), mo.group("ginode")
-                return ("", "", "", "")
-
-            for g in glocks_holders_in_sequence:
-                pid, command, gtype, ginode = decode(g)
-                if (pid):
-                    warning_msg =  "The glock \"%s/%s\" used by pid \"%s\" had the holder flag set " %(gtype, ginode, pid)
-                    warning_msg += "in %d+ sequential snapshots. " %(self.get_option("minimum_glock_seq"))
-                    warning_msg += "Possible performance degradation or hung detected. "
-                    warning_msg += "One possible cause is filesystem has used more than 80% of free space."
-                    self.add_warning(Admonition(snapshot.get_hostname(), self.get_filesystem_name(),
-                                                "Glocks", warning_msg, "https://access.redhat.com/solutions/315953"))
+        #
+        # The warning that was added when the run of each glock and pid reached
+        # the minimum is replaced with the length and times of its longest run
+        # once all the snapshots are fed.
+        for (hashkey, admonition) in self.__glocks_holders_warnings.items():
+            (pid, command, gtype, ginode) = hashkey
+            sequence = self.__glocks_holders_sequences.get(hashkey)
+            sequence_text = "%d sequential snapshots (%s to %s)" %(sequence.get_longest_length(),
+                                                                  sequence.get_longest_start_time(),
+                                                                  sequence.get_longest_end_time())
+            self.replace_warning(admonition, self.__get_glock_seq_warning(admonition.get_hostname(), gtype,
+                                                                          ginode, pid, sequence_text))
+        self.__glocks_holders_warnings = {}
 
     def console(self):
         summary = self.__get_text(colorize=True)
@@ -18,6 +18,8 @@ from glocktop_analyze.html import generate_css_header, generate_table
 from glocktop_analyze.html import generate_footer
 
 class GlocksHighDemoteSeconds(Plugin):
+    GLOCKS_COLUMNS = True
+
     def __init__(self, snapshots, path_to_output_dir, options):
         Plugin.__init__(self, "glocks_high_demote_seconds",
                         "The glocks with demote time greater than zero seconds.",
@@ -46,24 +48,28 @@ class GlocksHighDemoteSeconds(Plugin):
 
         return ""
 
-    def analyze(self):
+    def begin(self):
+        Plugin.begin(self)
         self.__glocks_high_demote_seconds = {}
-        for snapshot in self.get_snapshots():
-            glock_high_demote_seconds_found = False
-            for glock in snapshot.get_glocks():
-                demote_time = int(glock.get_demote_time())
-                if (demote_time > 0):
-                    hashkey = self.__encode(glock.get_type(), glock.get_inode())
-                    if (not self.__glocks_high_demote_seconds.has_key(hashkey)):
-                        self.__glocks_high_demote_seconds[hashkey] = ""
-                    demote_time_str = "%s %d" %(self.__glocks_high_demote_seconds.get(hashkey),
-                                                demote_time)
-                    self.__glocks_high_demote_seconds[hashkey] = demote_time_str
-                    glock_high_demote_seconds_found = True
-            if (glock_high_demote_seconds_found):
-                warning_msg =  "There were glocks with demote time greater than zero."
-                self.add_warning(Admonition(snapshot.get_hostname(), self.get_filesystem_name(),
-                                            "Glocks", warning_msg, ""))
+
+    def leave_snapshot(self, snapshot):
+        # The last snapshot added to the columns is this snapshot.
+        if (self.get_glocks_columns().get_demote_times_count(last_snapshot=True) > 0):
+            warning_msg =  "There were glocks with demote time greater than zero."
+            self.add_warning(Admonition(snapshot.get_hostname(), self.get_filesystem_name(),
+                                        "Glocks", warning_msg, ""))
+
+    def finish(self):
+        Plugin.finish(self)
+        glocks_columns = self.get_glocks_columns()
+        for (snapshot_index, glock_id, demote_time) in glocks_columns.get_demote_times():
+            glock_type, glock_inode = glocks_columns.get_glock(glock_id)
+            hashkey = self.__encode(glock_type, glock_inode)
+            if (not self.__glocks_high_demote_seconds.has_key(hashkey)):
+                self.__glocks_high_demote_seconds[hashkey] = ""
+            demote_time_str = "%s %d" %(self.__glocks_high_demote_seconds.get(hashkey),
+                                        demote_time)
+            self.__glocks_high_demote_seconds[hashkey] = demote_time_str
 
     def console(self):
         summary = self.__get_text(colorize=True)
@@ -16,7 +16,6 @@ Options for the plugin:
 import logging
 import logging.handlers
 import os.path
-from operator import itemgetter
 
 import glocktop_analyze
 from glocktop_analyze.plugins import Plugin
@@ -25,6 +24,7 @@ from glocktop_analyze.html import generate_css_header, generate_table
 from glocktop_analyze.html import generate_footer
 
 class GlocksInSnapshots(Plugin):
+    GLOCKS_COLUMNS = True
     OPTIONS = [("mininum_glocks_in_snapshots",
                 "The mininum number of times a glock is found in all the snapshots.",
                 2)]
@@ -45,9 +45,14 @@ class GlocksInSnapshots(Plugin):
         hashkey_split = hashkey.split("/")
         return (hashkey_split[0], hashkey_split[1])
 
+    def __get_sorted_glocks_in_snapshots(self):
+        # The glocks that appeared in the same number of snapshots are sorted
+        # by glock type/inode.
+        return sorted(self.__glocks_in_snapshots.items(), key=lambda t: (-t[1], t[0]))
+
     def __get_text(self, colorize=False):
         table = []
-        for pair in sorted(self.__glocks_in_snapshots.items(), key=itemgetter(1), reverse=True):
+        for pair in self.__get_sorted_glocks_in_snapshots():
             if (pair[1] >= self.__minimum_glocks_in_snapshots):
                 table.append([self.get_hostname(), self.get_filesystem_name(), pair[0], pair[1]])
         if (table):
@@ -56,20 +61,20 @@ class GlocksInSnapshots(Plugin):
                                           tableize(table, ["Hostname", "Filesystem Name", "Glock Type/Glocks Inode",
                                                            "Number of Snapshots Appeared in"], colorize=colorize).strip())
 
-    def analyze(self):
-        for snapshot in self.get_snapshots():
-            # message = "There was %d glocks found on the filesystem: %s." %(len(snapshot.get_glocks()),
-            #                                                                self.get_filesystem_name())
-            # logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
-            for glock in snapshot.get_glocks():
-                # Require that glock is has at least an object of holder or
-                # waiter assoicated with it.
-                if (len(glock.get_holders()) or (not glock.get_glock_object() == None)):
-                    hashkey = self.__encode(glock.get_type(), glock.get_inode())
-                    if (not self.__glocks_in_snapshots.has_key(hashkey)):
-                        self.__glocks_in_snapshots[hashkey] = 0
-                    self.__glocks_in_snapshots[hashkey] += 1
+    def begin(self):
+        Plugin.begin(self)
+        self.__glocks_in_snapshots = {}
 
+    def finish(self):
+        Plugin.finish(self)
+        # Require that glock is has at least an object of holder or
+        # waiter assoicated with it.
+        glocks_columns = self.get_glocks_columns()
+        glocks_in_snapshots = glocks_columns.get_glocks_in_snapshots(require_holders_or_object=True)
+        for glock_id in range(0, len(glocks_in_snapshots)):
+            if (glocks_in_snapshots[glock_id] > 0):
+                glock_type, glock_inode = glocks_columns.get_glock(glock_id)
+                self.__glocks_in_snapshots[self.__encode(glock_type, glock_inode)] = glocks_in_snapshots[glock_id]
 
     def console(self):
         summary = self.__get_text(colorize=True)
@@ -91,7 +96,7 @@ class GlocksInSnapshots(Plugin):
                 path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
                                                                 self.get_filesystem_name()), filename)
                 table = []
-                for pair in sorted(self.__glocks_in_snapshots.items(), key=itemgetter(1), reverse=True):
+                for pair in self.__get_sorted_glocks_in_snapshots():
                     if (pair[1] >= self.__minimum_glocks_in_snapshots):
                         table.append([self.get_hostname(), self.get_filesystem_name(), pair[0], pair[1]])
                 bdata = generate_table(table,
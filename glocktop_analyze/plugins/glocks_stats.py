@@ -29,6 +29,8 @@ class GSStats(Plugin):
     def __init__(self, snapshots, path_to_output_dir, options):
         self.__gs_glocks_total_lowest = None
         self.__gs_glocks_total_highest = None
+        # The glocks stats for the snapshots that had stats.
+        self.__glocks_stats = []
         snapshots_with_stats = []
         for snapshot in snapshots:
             if (not snapshot.get_glocks_stats() == None):
@@ -40,17 +42,16 @@ class GSStats(Plugin):
     def __generate_graphs_by_glock_type(self, png_format=False):
         path_to_output_dir = os.path.join(os.path.join(self.get_path_to_output_dir(),
                                                        self.get_filesystem_name()), "graphs")
-        if (self.get_snapshots()):
+        if (self.__glocks_stats):
             path_to_image_files = []
             snapshot_date_time = []
             # This is graphing the states for differnt glock types. X is time, Y is
             # one of 8 glock states.
             for gtype in glocktop_analyze.glocks_stats.GLOCK_TYPES:
                 glock_states_stats = {}
-                for snapshot in self.get_snapshots():
-                    glocks_stats = snapshot.get_glocks_stats()
-                    if (not snapshot.get_date_time() in snapshot_date_time):
-                        snapshot_date_time.append(snapshot.get_date_time())
+                for glocks_stats in self.__glocks_stats:
+                    if (not glocks_stats.get_date_time() in snapshot_date_time):
+                        snapshot_date_time.append(glocks_stats.get_date_time())
                     states_stats = glocks_stats.get_stats_by_type(gtype)
                     for key in states_stats.keys():
                         if (glock_states_stats.has_key(key)):
@@ -68,17 +69,16 @@ class GSStats(Plugin):
     def __generate_graphs_by_glock_state(self, png_format=False):
         path_to_output_dir = os.path.join(os.path.join(self.get_path_to_output_dir(),
                                                        self.get_filesystem_name()), "graphs")
-        if (self.get_snapshots()):
+        if (self.__glocks_stats):
             path_to_image_files = []
             snapshot_date_time = []
             # This is graphing the states for differnt glock states. X is time, Y is
             # one of 7 glock types.
             for gstate in glocktop_analyze.glocks_stats.GLOCK_STATES:
                 glock_types_stats = {}
-                for snapshot in self.get_snapshots():
-                    glocks_stats = snapshot.get_glocks_stats()
-                    if (not snapshot.get_date_time() in snapshot_date_time):
-                        snapshot_date_time.append(snapshot.get_date_time())
+                for glocks_stats in self.__glocks_stats:
+                    if (not glocks_stats.get_date_time() in snapshot_date_time):
+                        snapshot_date_time.append(glocks_stats.get_date_time())
                     gtypes_stats = glocks_stats.get_stats_by_state(gstate)
                     for key in gtypes_stats.keys():
                         if (glock_types_stats.has_key(key)):
@@ -127,8 +127,7 @@ class GSStats(Plugin):
                 summary += "%s\n\n" %(tableize(glocks_stats_totals_table,
                                                ["Hostname", "Filesystem", "Glock Total Count", "Time Occurred"],
                                                colorize=colorize).strip())
-        for snapshot in self.get_snapshots():
-            glocks_stats = snapshot.get_glocks_stats()
+        for glocks_stats in self.__glocks_stats:
             formatted_table = tableize(glocks_stats.get_table(), ["Glock States"] +
                                        glocktop_analyze.glocks_stats.GLOCK_STATES, colorize=colorize).rstrip()
             if (colorize):
@@ -143,22 +142,31 @@ class GSStats(Plugin):
             return "%s: %s\n\n%s\n" %(self.get_title(), self.get_description(), summary.strip())
         return ""
 
-    def analyze(self):
-        for snapshot in self.get_snapshots():
-            glocks_stats = snapshot.get_glocks_stats()
-            formatted_table = tableize(glocks_stats.get_table(), ["Glock States"] +
-                                       glocktop_analyze.glocks_stats.GLOCK_TYPES, colorize=True).rstrip()
-
-            if (self.__gs_glocks_total_lowest == None):
-                self.__gs_glocks_total_lowest = glocks_stats
-            elif (glocks_stats.get_glocks_count() <= self.__gs_glocks_total_lowest.get_glocks_count()):
-                self.__gs_glocks_total_lowest = glocks_stats
-
-            if (self.__gs_glocks_total_highest == None):
-                self.__gs_glocks_total_highest = glocks_stats
-            elif (glocks_stats.get_glocks_count() >= self.__gs_glocks_total_highest.get_glocks_count()):
-                self.__gs_glocks_total_highest = glocks_stats
-
+    def begin(self):
+        Plugin.begin(self)
+        self.__gs_glocks_total_lowest = None
+        self.__gs_glocks_total_highest = None
+        self.__glocks_stats = []
+
+    def visit_snapshot(self, snapshot):
+        glocks_stats = snapshot.get_glocks_stats()
+        if (glocks_stats == None):
+            # Only the snapshots with stats are analyzed by this plugin.
+            return
+        Plugin.visit_snapshot(self, snapshot)
+        self.__glocks_stats.append(glocks_stats)
+        if (self.__gs_glocks_total_lowest == None):
+            self.__gs_glocks_total_lowest = glocks_stats
+        elif (glocks_stats.get_glocks_count() <= self.__gs_glocks_total_lowest.get_glocks_count()):
+            self.__gs_glocks_total_lowest = glocks_stats
+
+        if (self.__gs_glocks_total_highest == None):
+            self.__gs_glocks_total_highest = glocks_stats
+        elif (glocks_stats.get_glocks_count() >= self.__gs_glocks_total_highest.get_glocks_count()):
+            self.__gs_glocks_total_highest = glocks_stats
+
+    def finish(self):
+        Plugin.finish(self)
         if (not self.__gs_glocks_total_highest == None):
             if (self.__gs_glocks_total_highest.get_glocks_count() >
                 self.get_option("high_glocks_count_total")):
@@ -172,7 +180,7 @@ class GSStats(Plugin):
                 # all filesystems and do not want duplicates.
                 warning_msg =  "The number of total glocks on a snaphot of ALL gfs2 filesystem "
                 warning_msg += "exceeded: %s." %(high_glocks_count_total_comma)
-                self.add_warning(Admonition(snapshot.get_hostname(), "all filesystems", "Glocks",
+                self.add_warning(Admonition(self.get_hostname(), "all filesystems", "Glocks",
                                             warning_msg,
                                             "https://access.redhat.com/solutions/1603713"))
 
@@ -199,8 +207,7 @@ class GSStats(Plugin):
                                             ["Hostname", "Filesystem", "Time Occurred", "Glock Total Count"],
                                             title=title,
                                             description="")
-            for snapshot in self.get_snapshots():
-                glocks_stats = snapshot.get_glocks_stats()
+            for glocks_stats in self.__glocks_stats:
                 title =  "Glock stats at %s for filesystem: %s" %(glocks_stats.get_date_time().strftime("%Y-%m-%d %H:%M:%S"),
                                                                    self.get_filesystem_name())
                 bdata += generate_table(glocks_stats.get_table(),
@@ -218,7 +225,7 @@ class GSStats(Plugin):
                 logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
 
     def graph(self, png_format=False):
-        if (self.get_snapshots()):
+        if (self.__glocks_stats):
             path_to_image_files = self.__generate_graphs_by_glock_type(png_format=png_format)
             if (path_to_image_files):
                 generate_graph_index_page(os.path.join(self.get_path_to_output_dir(),
@@ -0,0 +1,216 @@
+#!/usr/bin/python
+"""
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+* This plugin outputs the wait-for graph of the pids in each snapshot. There is
+  an edge from a pid waiting on a glock to each pid holding the glock. The
+  cycles in the graph are possible deadlocks and the longest chain of pids
+  waiting on each other is where the contention is stacking up.
+
+Options for the plugin:
+* minimum_chain_length: The minimum number of pids in a chain of pids waiting on
+  each other that is reported.
+"""
+import logging
+import logging.handlers
+import os.path
+
+import glocktop_analyze
+from glocktop_analyze.plugins import Plugin, Admonition
+from glocktop_analyze.wait_for_graph import WaitForGraph
+from glocktop_analyze.utilities import ColorizeConsoleText, write_to_file
+from glocktop_analyze.html import generate_footer
+from glocktop_analyze.html import generate_css_header
+
+class WaitForInSnapshot:
+    # The cycles and the longest chain of the wait-for graph of a snapshot. Only
+    # the text of the pids and glocks are kept, so the graph and the glocks of
+    # the snapshot are freed once the snapshot has been processed.
+    def __init__(self, hostname, filesystem_name, date_time, cycles, longest_chain, pids_count):
+        self.__hostname = hostname
+        self.__filesystem_name = filesystem_name
+        self.__date_time  = date_time
+        # A list of the text of each cycle and its number of pids.
+        self.__cycles = cycles
+        # The text of the longest chain and its number of pids.
+        self.__longest_chain = longest_chain
+        self.__pids_count = pids_count
+
+    def get_hostname(self):
+        return self.__hostname
+
+    def get_filesystem_name(self):
+        return self.__filesystem_name
+
+    def get_date_time(self):
+        return self.__date_time
+
+    def get_cycles(self):
+        return self.__cycles
+
+    def get_longest_chain(self):
+        return self.__longest_chain
+
+    def get_pids_count(self):
+        return self.__pids_count
+
+class GlocksWaitFor(Plugin):
+    OPTIONS = [("minimum_chain_length", "The minimum number of pids in a chain of pids waiting on each other that is reported.", 3)]
+
+    def __init__(self, snapshots, path_to_output_dir, options):
+        Plugin.__init__(self, "glocks_wait_for",
+                        "The cycles and longest chain of pids waiting on a pid holding a glock.",
+                        snapshots, "Glocks Wait-For Graph", path_to_output_dir,
+                        options)
+        self.__wait_for_snapshots = []
+        # The wait-for graph of the snapshot being visited and the command of
+        # each pid in the graph.
+        self.__wait_for_graph = WaitForGraph()
+        self.__commands = {}
+        self.__minimum_chain_length = self.get_option("minimum_chain_length")
+
+    def __get_path_text(self, graph, pids, is_cycle=False):
+        # Returns the text of the pids where each pid waits on the next pid on
+        # the glock between them.
+        path_text = "%s (%s)" %(pids[0], self.__commands.get(pids[0]))
+        if (is_cycle):
+            pids = pids + [pids[0]]
+        for i in range(1, len(pids)):
+            path_text += " -[%s]-> %s (%s)" %(graph.get_edge_label(pids[i - 1], pids[i]),
+                                               pids[i], self.__commands.get(pids[i]))
+        return path_text
+
+    def __get_text(self, colorize=False):
+        summary = ""
+        for wait_for_in_snapshot in self.__wait_for_snapshots:
+            snapshot_summary = ""
+            for (cycle_text, pids_count) in wait_for_in_snapshot.get_cycles():
+                cycle_header = "  cycle of %d pids:" %(pids_count)
+                if (colorize):
+                    cycle_header = ColorizeConsoleText.orange(cycle_header)
+                snapshot_summary += "%s %s\n" %(cycle_header, cycle_text)
+            (chain_text, pids_count) = wait_for_in_snapshot.get_longest_chain()
+            if (chain_text):
+                chain_header = "  longest chain of %d pids:" %(pids_count)
+                if (colorize):
+                    chain_header = ColorizeConsoleText.orange(chain_header)
+                snapshot_summary += "%s %s\n" %(chain_header, chain_text)
+            snapshot_header = "%s - %s @%s | %d pids in wait-for graph" %(wait_for_in_snapshot.get_filesystem_name(),
+                                                                         wait_for_in_snapshot.get_date_time(),
+                                                                         wait_for_in_snapshot.get_hostname(),
+                                                                         wait_for_in_snapshot.get_pids_count())
+            if (colorize):
+                snapshot_header =  ColorizeConsoleText.red(snapshot_header)
+            summary += "%s\n%s\n" %(snapshot_header, snapshot_summary)
+        if (summary):
+            summary = "%s: %s\n%s" %(self.get_title(), self.get_description(), summary)
+        return summary
+
+    def __get_html(self, colorize=False):
+        summary = ""
+        for wait_for_in_snapshot in self.__wait_for_snapshots:
+            snapshot_summary = ""
+            for (cycle_text, pids_count) in wait_for_in_snapshot.get_cycles():
+                snapshot_summary += "<span class=\"orange\">&nbsp;&nbsp;cycle of %d pids:</span> " %(pids_count)
+                snapshot_summary += "%s<BR/>" %(cycle_text.replace(">", "&gt;"))
+            (chain_text, pids_count) = wait_for_in_snapshot.get_longest_chain()
+            if (chain_text):
+                snapshot_summary += "<span class=\"orange\">&nbsp;&nbsp;longest chain of %d pids:</span> " %(pids_count)
+                snapshot_summary += "%s<BR/>" %(chain_text.replace(">", "&gt;"))
+            snapshot_header = "%s - %s @%s | %d pids in wait-for graph" %(wait_for_in_snapshot.get_filesystem_name(),
+                                                                         wait_for_in_snapshot.get_date_time(),
+                                                                         wait_for_in_snapshot.get_hostname(),
+                                                                         wait_for_in_snapshot.get_pids_count())
+            summary += "<b><span class=\"red\">%s</span></b><BR/>%s<BR/>" %(snapshot_header, snapshot_summary)
+        if (summary):
+            header =  "<center><H3>Glocks Wait-For Graph between "
+            header += "%s and %s </H3></center>" %(self.get_snapshots_start_time().strftime("%Y-%m-%d %H:%M:%S"),
+                                                   self.get_snapshots_end_time().strftime("%Y-%m-%d %H:%M:%S"))
+            summary = "<center><b>%s:</b> %s</center><BR/>%s" %(self.get_title(), self.get_description(), summary)
+            summary = "%s%s" %(header, summary)
+        return summary
+
+    def begin(self):
+        Plugin.begin(self)
+        self.__wait_for_snapshots = []
+
+    def visit_snapshot(self, snapshot):
+        Plugin.visit_snapshot(self, snapshot)
+        self.__wait_for_graph = WaitForGraph()
+        self.__commands = {}
+
+    def visit_glock(self, snapshot, glock):
+        # Add an edge from each pid waiting on the glock to each pid holding
+        # the glock.
+        holders = glock.get_holders()
+        if (len(holders) < 2):
+            return
+        holding_pids = []
+        waiting_pids = []
+        for glock_holder in holders:
+            pid = glock_holder.get_pid()
+            if (glock_holder.is_holder()):
+                holding_pids.append(pid)
+            elif (glock_holder.is_waiting()):
+                waiting_pids.append(pid)
+            else:
+                continue
+            if (not self.__commands.has_key(pid)):
+                self.__commands[pid] = glock_holder.get_command()
+        if (holding_pids and waiting_pids):
+            label = "%s/%s" %(glock.get_type(), glock.get_inode())
+            for waiting_pid in waiting_pids:
+                for holding_pid in holding_pids:
+                    self.__wait_for_graph.add_edge(waiting_pid, holding_pid, label)
+
+    def leave_snapshot(self, snapshot):
+        graph = self.__wait_for_graph
+        if (not len(graph)):
+            return
+        components = graph.get_strongly_connected_components()
+        cycles = []
+        for cycle in graph.get_cycles(components):
+            cycles.append((self.__get_path_text(graph, cycle, is_cycle=True), len(cycle)))
+            warning_msg =  "Possible deadlock detected. The pids \"%s\" are waiting on " %(", ".join(cycle))
+            warning_msg += "glocks held by each other. Check the glocks wait-for graph output."
+            self.add_warning(Admonition(snapshot.get_hostname(), self.get_filesystem_name(),
+                                        "Glocks", warning_msg, ""))
+        longest_chain = ("", 0)
+        chain = graph.get_longest_chain(components)
+        if (len(chain) >= self.__minimum_chain_length):
+            longest_chain = (self.__get_path_text(graph, chain), len(chain))
+        if (cycles or longest_chain[0]):
+            self.__wait_for_snapshots.append(WaitForInSnapshot(snapshot.get_hostname(),
+                                                               snapshot.get_filesystem_name(),
+                                                               snapshot.get_date_time(),
+                                                               cycles, longest_chain, len(graph)))
+        # The graph of the snapshot is no longer needed.
+        self.__wait_for_graph = WaitForGraph()
+        self.__commands = {}
+
+    def console(self):
+        summary = self.__get_text(colorize=True)
+        if (summary):
+            print "%s\n" %(summary.rstrip())
+
+    def write(self, html_format=False):
+        wdata = ""
+        path_to_output_file = ""
+        if (not html_format):
+            wdata = self.__get_text(colorize=False)
+            filename = "%s.txt" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
+            path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
+                                                            self.get_filesystem_name()), filename)
+        else:
+            bdata = self.__get_html(colorize=False)
+            if (bdata):
+                wdata = "%s\n%s\n<BR/><HR/><BR/>%s" %(generate_css_header(), bdata, generate_footer())
+                filename = "%s.html" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
+                path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
+                                                                self.get_filesystem_name()), filename)
+        if (wdata):
+            if (not write_to_file(path_to_output_file, wdata, append_to_file=False, create_file=True)):
+                message = "An error occurred writing to the file: %s" %(path_to_output_file)
+                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
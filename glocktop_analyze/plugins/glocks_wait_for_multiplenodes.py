@@ -0,0 +1,223 @@
+#!/usr/bin/python
+"""
+@author    : Shane Bradley
+@contact   : sbradley@redhat.com
+@copyright : GPLv3
+
+* This plugin outputs the glocks that are held on one node while there are
+  waiters for the glock on other nodes for each group of snapshots taken around
+  the same time on multiple nodes. The glocks of the snapshots in a group are
+  joined on the glock type/inode with a map, so each glock is only looked at
+  once. The cycles and the longest chain of pids waiting on each other across
+  the nodes are found with the wait-for graph of the pids on all the nodes.
+
+Options for this plugin:
+* minimum_chain_length: The minimum number of pids in a chain of pids waiting on
+  each other across the nodes that is reported.
+* maximum_glocks_to_report: The maximum number of glocks held on one node with
+  waiters on other nodes that are reported for each group of snapshots.
+"""
+import logging
+import logging.handlers
+import os.path
+
+import glocktop_analyze
+from glocktop_analyze.plugins import PluginMultinode, Admonition
+from glocktop_analyze.wait_for_graph import WaitForGraph
+from glocktop_analyze.utilities import ColorizeConsoleText, write_to_file
+from glocktop_analyze.html import generate_css_header, generate_footer
+
+class GlocksWaitForMultipleNodes(PluginMultinode):
+    OPTIONS = [("minimum_chain_length",
+                "The minimum number of pids in a chain of pids waiting on each other across the nodes that is reported.",
+                3),
+               ("maximum_glocks_to_report",
+                "The maximum number of glocks held on one node with waiters on other nodes that are reported for each group of snapshots.",
+                10)]
+
+    def __init__(self, grouped_snapshots, path_to_output_dir, options):
+        PluginMultinode.__init__(self, "glocks_wait_for-multiple_nodes",
+                                 "The glocks held on one node with waiters on other nodes and the pids waiting on each other across the nodes.",
+                                 grouped_snapshots, "Glocks Wait-For Graph for Multiple Nodes", path_to_output_dir,
+                                 options)
+        self.__minimum_chain_length = self.get_option("minimum_chain_length")
+        self.__maximum_glocks_to_report = self.get_option("maximum_glocks_to_report")
+        # A list of the title of each group of snapshots and a tuple of the
+        # text of the glocks held across the nodes, the cycles and the longest
+        # chain for the group.
+        self.__wait_for_groups = []
+
+    def __is_cross_node_edge(self, waiter, holder):
+        # The nodes of the wait-for graph are (hostname, pid).
+        return (not waiter[0] == holder[0])
+
+    def __get_path_text(self, graph, commands, nodes, is_cycle=False):
+        # Returns the text of the pids where each pid waits on the next pid on
+        # the glock between them.
+        path_text = "%s:%s (%s)" %(nodes[0][0], nodes[0][1], commands.get(nodes[0]))
+        if (is_cycle):
+            nodes = nodes + [nodes[0]]
+        for i in range(1, len(nodes)):
+            path_text += " -[%s]-> %s:%s (%s)" %(graph.get_edge_label(nodes[i - 1], nodes[i]),
+                                                  nodes[i][0], nodes[i][1], commands.get(nodes[i]))
+        return path_text
+
+    def __get_text(self, colorize=False):
+        summary = ""
+        for (group_title, glocks_text, cycles_text, chain_text) in self.__wait_for_groups:
+            group_summary = ""
+            if (glocks_text):
+                group_summary += "  Glocks held on one node with waiters on other nodes:\n"
+                for glock_text in glocks_text:
+                    group_summary += "    %s\n" %(glock_text)
+            for cycle_text in cycles_text:
+                cycle_header = "  cycle across nodes:"
+                if (colorize):
+                    cycle_header = ColorizeConsoleText.orange(cycle_header)
+                group_summary += "%s %s\n" %(cycle_header, cycle_text)
+            if (chain_text):
+                chain_header = "  longest chain across nodes:"
+                if (colorize):
+                    chain_header = ColorizeConsoleText.orange(chain_header)
+                group_summary += "%s %s\n" %(chain_header, chain_text)
+            if (colorize):
+                group_title = ColorizeConsoleText.red(group_title)
+            summary += "%s\n%s\n" %(group_title, group_summary)
+        if (summary):
+            return "%s: %s\n%s" %(self.get_title(), self.get_description(),
+                                  summary.strip())
+        return summary.strip()
+
+    def __get_html(self, colorize=False):
+        summary = ""
+        for (group_title, glocks_text, cycles_text, chain_text) in self.__wait_for_groups:
+            group_summary = ""
+            if (glocks_text):
+                group_summary += "&nbsp;&nbsp;Glocks held on one node with waiters on other nodes:<BR/>"
+                for glock_text in glocks_text:
+                    group_summary += "&nbsp;&nbsp;&nbsp;&nbsp;%s<BR/>" %(glock_text)
+            for cycle_text in cycles_text:
+                group_summary += "<span class=\"orange\">&nbsp;&nbsp;cycle across nodes:</span> "
+                group_summary += "%s<BR/>" %(cycle_text.replace(">", "&gt;"))
+            if (chain_text):
+                group_summary += "<span class=\"orange\">&nbsp;&nbsp;longest chain across nodes:</span> "
+                group_summary += "%s<BR/>" %(chain_text.replace(">", "&gt;"))
+            summary += "<b><span class=\"red\">%s</span></b><BR/>%s<BR/>" %(group_title, group_summary)
+        if (summary):
+            summary = "<center><b>%s:</b> %s</center><BR/>%s" %(self.get_title(), self.get_description(), summary)
+        return summary
+
+    def begin(self):
+        PluginMultinode.begin(self)
+        self.__wait_for_groups = []
+
+    def feed_group(self, snapshots):
+        # Join the glocks with holders or waiters of all the snapshots in the
+        # group on the glock type/inode. The keys are kept in the order they
+        # were found, so the output does not depend on the order of the map.
+        glocks_by_key = {}
+        gkeys = []
+        for snapshot in snapshots:
+            self.visit_snapshot(snapshot)
+            hostname = snapshot.get_hostname()
+            for glock in snapshot.get_glocks():
+                if (glock.get_holders()):
+                    gkey = (glock.get_type(), glock.get_inode())
+                    joined_glocks = glocks_by_key.get(gkey)
+                    if (joined_glocks == None):
+                        glocks_by_key[gkey] = [(hostname, glock)]
+                        gkeys.append(gkey)
+                    else:
+                        joined_glocks.append((hostname, glock))
+
+        # Add an edge from each pid waiting on a glock on any node to each pid
+        # holding the glock on any node.
+        graph = WaitForGraph()
+        commands = {}
+        glocks_held_across_nodes = []
+        for gkey in gkeys:
+            joined_glocks = glocks_by_key[gkey]
+            holding_nodes = []
+            waiting_nodes = []
+            holding_glock_holders = []
+            for (hostname, glock) in joined_glocks:
+                for glock_holder in glock.get_holders():
+                    node = (hostname, glock_holder.get_pid())
+                    if (glock_holder.is_holder()):
+                        holding_nodes.append(node)
+                        holding_glock_holders.append((hostname, glock_holder))
+                    elif (glock_holder.is_waiting()):
+                        waiting_nodes.append(node)
+                    else:
+                        continue
+                    if (not commands.has_key(node)):
+                        commands[node] = glock_holder.get_command()
+            if ((not holding_nodes) or (not waiting_nodes)):
+                continue
+            label = "%s/%s" %(gkey[0], gkey[1])
+            for waiting_node in waiting_nodes:
+                for holding_node in holding_nodes:
+                    graph.add_edge(waiting_node, holding_node, label)
+            # The number of waiters on each node that does not hold the glock.
+            holding_hostnames = set([holding_node[0] for holding_node in holding_nodes])
+            remote_waiters = {}
+            for waiting_node in waiting_nodes:
+                if (not waiting_node[0] in holding_hostnames):
+                    remote_waiters[waiting_node[0]] = remote_waiters.get(waiting_node[0], 0) + 1
+            if (remote_waiters):
+                holders_text = ["%s in %s (pid %s [%s])" %(hostname, glock_holder.get_state(),
+                                                          glock_holder.get_pid(), glock_holder.get_command())
+                                for (hostname, glock_holder) in holding_glock_holders]
+                waiters_text = ", ".join(["%s (%d)" %(hostname, remote_waiters[hostname])
+                                          for hostname in sorted(remote_waiters.keys())])
+                glocks_held_across_nodes.append((sum(remote_waiters.values()), label,
+                                                 "%s: held by %s | waiters: %s" %(label, ", ".join(holders_text),
+                                                                                  waiters_text)))
+        # The glocks with the most waiters on other nodes are reported first.
+        glocks_held_across_nodes.sort(key=lambda t: (-t[0], t[1]))
+        glocks_text = [t[2] for t in glocks_held_across_nodes[:self.__maximum_glocks_to_report]]
+
+        cycles_text = []
+        chain_text = ""
+        if (len(graph)):
+            components = graph.get_strongly_connected_components()
+            for cycle in graph.get_cycles(components, required_edge=self.__is_cross_node_edge):
+                cycles_text.append(self.__get_path_text(graph, commands, cycle, is_cycle=True))
+                hostnames = sorted(set([node[0] for node in cycle]))
+                warning_msg =  "Possible deadlock detected across nodes. The pids \"%s\" " %(", ".join(["%s:%s" %(node) for node in cycle]))
+                warning_msg += "are waiting on glocks held by each other. Check the glocks wait-for graph output for multiple nodes."
+                self.add_warning(Admonition(", ".join(hostnames), self.get_filesystem_name(),
+                                            "Glocks", warning_msg, ""))
+            chain = graph.get_longest_chain(components, required_edge=self.__is_cross_node_edge)
+            if (len(chain) >= self.__minimum_chain_length):
+                chain_text = self.__get_path_text(graph, commands, chain)
+        if (glocks_text or cycles_text or chain_text):
+            group_title = "%s - %s" %(self.get_filesystem_name(),
+                                      ", ".join(["%s @%s" %(snapshot.get_date_time(), snapshot.get_hostname())
+                                                 for snapshot in snapshots]))
+            self.__wait_for_groups.append((group_title, glocks_text, cycles_text, chain_text))
+
+    def console(self):
+        summary = self.__get_text(colorize=True)
+        if (summary):
+            print "%s\n" %(summary.rstrip())
+
+    def write(self, html_format=False):
+        wdata = ""
+        path_to_output_file = ""
+        if (not html_format):
+            wdata = self.__get_text(colorize=False)
+            filename = "%s.txt" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
+            path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
+                                                            self.get_filesystem_name()), filename)
+        else:
+            filename = "%s.html" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
+            path_to_output_file = os.path.join(os.path.join(self.get_path_to_output_dir(),
+                                                            self.get_filesystem_name()), filename)
+            bdata = self.__get_html(colorize=True)
+            if (bdata):
+                wdata = "%s\n%s\n<BR/><HR/><BR/>%s" %(generate_css_header(), bdata, generate_footer())
+        if (wdata):
+            if (not write_to_file(path_to_output_file, wdata, append_to_file=False, create_file=True)):
+                message = "An error occurred writing to the file: %s" %(path_to_output_file)
+                logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).debug(message)
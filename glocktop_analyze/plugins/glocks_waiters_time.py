@@ -14,7 +14,6 @@ Options for plugin:
 import logging
 import logging.handlers
 import os.path
-from collections import OrderedDict
 
 import glocktop_analyze
 from glocktop_analyze.plugins import Plugin
@@ -22,6 +21,9 @@ from glocktop_analyze.plugins import generate_date_graphs
 from glocktop_analyze.html import generate_graph_index_page
 
 class GlocksWaitersTime(Plugin):
+    GLOCKS_COLUMNS = True
+    GLOCKS_COLUMNS_ROWS = True
+
     OPTIONS = [("mininum_waiter_count",
                 "The mininum number of holder + waiters that are required on a glock.",
                 2),
@@ -35,7 +37,8 @@ class GlocksWaitersTime(Plugin):
                         snapshots,
                         "Glocks Holder and Waiters Count over Time",
                         path_to_output_dir, options)
-        self.__glocks_holder_waiters_by_date = {}
+        self.__glocks_holder_waiters_by_snapshot = {}
+        self.__snapshots_dt = []
 
         self.__mininum_waiter_count = self.get_option("mininum_waiter_count")
         self.__maximum_glocks_to_graph = self.get_option("maximum_glocks_to_graph")
@@ -47,31 +50,14 @@ class GlocksWaitersTime(Plugin):
         hashkey_split = hashkey.split("/")
         return (hashkey_split[0], hashkey_split[1])
 
-    def __generate_graphs_glocks_holder_waiter(self, glocks_holder_waiters_by_date, snapshots_date_time, png_format=False):
+    def __generate_graphs_glocks_holder_waiter(self, glocks_holder_waiters_by_snapshot, snapshots_date_time, png_format=False):
         # The x-axis will be the snapshots_date_time. Each glock in the map has a
-        # value that is holder/waiter count at some date_time (we call gdt) instance
-        # that should be a value in the snapshots_date_time.  If there is no gdt
-        # instance for a date_time in snapshots_date_time then we set value at None
-        # in graph.
+        # list the same size as snapshots_date_time with the holder/waiter count
+        # of the glock in each snapshot. If the glock is not in a snapshot then
+        # the value is None in graph.
         path_to_image_files = []
-        if ((glocks_holder_waiters_by_date) and (snapshots_date_time)):
-            def get_index_in_list(date_time_list, date_time):
-                index = 0;
-                for index in range(0, len(date_time_list)):
-                    if (date_time_list[index] == date_time):
-                        return index
-                    index += 1
-                return -1
-
-            # Set the Y axis and create a list the same size as snapshots_date_time and set to None as each value.
-            y_axis = {}
-            for gkey in glocks_holder_waiters_by_date.keys():
-                if (not y_axis.has_key(gkey)):
-                    y_axis[gkey] = [None] * len(snapshots_date_time)
-                for t in glocks_holder_waiters_by_date.get(gkey):
-                    index_in_dt = get_index_in_list(snapshots_date_time, t[0])
-                    if (index_in_dt >= 0):
-                        y_axis[gkey][index_in_dt] = t[1]
+        if ((glocks_holder_waiters_by_snapshot) and (snapshots_date_time)):
+            y_axis = glocks_holder_waiters_by_snapshot
             path_to_output_dir = os.path.join(os.path.join(self.get_path_to_output_dir(),
                                                            self.get_filesystem_name()), "graphs")
             path_to_image_files += generate_date_graphs(path_to_output_dir,
@@ -82,58 +68,45 @@ class GlocksWaitersTime(Plugin):
                                                         png_format=png_format)
             return path_to_image_files
 
-    def analyze(self):
-        # A map of all the times these glocks showed up in snapshot.
-        glocks_holder_waiters_by_date = {}
+    def begin(self):
+        Plugin.begin(self)
+        # A map of the holder+waiters count of the glocks in each snapshot.
+        self.__glocks_holder_waiters_by_snapshot = {}
         # The date_time snapshots taken on filesystem
         self.__snapshots_dt = []
-        for snapshot in self.get_snapshots():
-            # Get glock stats
-            self.__snapshots_dt.append(snapshot.get_date_time())
-            for glock in snapshot.get_glocks():
-                # Unique key <filename_name>-<glock_type>/<glock_inode>
-                hashkey = self.__encode(glock.get_type(), glock.get_inode())
-                dt_holder_waiter_count = (snapshot.get_date_time(), len(glock.get_holders()))
-                if (not glocks_holder_waiters_by_date.has_key(hashkey)):
-                    glocks_holder_waiters_by_date[hashkey] = []
-                glocks_holder_waiters_by_date[hashkey] += [dt_holder_waiter_count]
 
-        # Only include the snapshot that have appeared more than once. There no
-        # reason to include a glock that will only graph a point.
-        for hashkey in glocks_holder_waiters_by_date.keys():
-            if (not len(glocks_holder_waiters_by_date.get(hashkey)) > 1):
-                try:
-                    del glocks_holder_waiters_by_date[hashkey]
-                except KeyError:
-                    pass
-        # Map the number of holder+waiters that a glock has over all the
-        # snapshots.
+    def finish(self):
+        Plugin.finish(self)
+        glocks_columns = self.get_glocks_columns()
+        self.__snapshots_dt = glocks_columns.get_snapshots_date_time()
+        # Only include the glocks that have appeared more than once. There no
+        # reason to include a glock that will only graph a point. Then map the
+        # number of holder+waiters that a glock has over all the snapshots.
+        glocks_in_snapshots = glocks_columns.get_glocks_in_snapshots()
+        holders_count_sums = glocks_columns.get_holders_count_sums()
+        glocks_id = {}
         glocks_holder_waiters_counter = {}
-        for hashkey in glocks_holder_waiters_by_date.keys():
-            hw_count = 0
-            for gtuple in glocks_holder_waiters_by_date.get(hashkey):
-                hw_count += gtuple[1]
-            if (hw_count > self.__mininum_waiter_count):
-                glocks_holder_waiters_counter[hashkey] = hw_count
+        for glock_id in range(0, len(glocks_in_snapshots)):
+            if ((glocks_in_snapshots[glock_id] > 1) and
+                (holders_count_sums[glock_id] > self.__mininum_waiter_count)):
+                glock_type, glock_inode = glocks_columns.get_glock(glock_id)
+                hashkey = self.__encode(glock_type, glock_inode)
+                glocks_id[hashkey] = glock_id
+                glocks_holder_waiters_counter[hashkey] = holders_count_sums[glock_id]
 
         # Only graph the glocks with highest holder+waiter count over all the
-        # snapshots.
-        glocks_highest_count = {}
-        index = 1
-        for t in reversed(OrderedDict(sorted(glocks_holder_waiters_counter.items(), key=lambda t: t[1]))):
-            if (index > self.__maximum_glocks_to_graph):
-                try:
-                    del glocks_holder_waiters_counter[t]
-                except KeyError:
-                    pass
-                index += 1
+        # snapshots. The glocks with the same count are sorted by type/inode.
+        glocks_highest_count = sorted(glocks_holder_waiters_counter.items(), key=lambda t: (-t[1], t[0]))
+        for t in glocks_highest_count[self.__maximum_glocks_to_graph:]:
+            del glocks_holder_waiters_counter[t[0]]
 
         # Map only glocks that had more than 1 holder+waiter so the possible items to graph is lower.
-        self.__glocks_holder_waiters_by_date = {key: glocks_holder_waiters_by_date[key] for key in glocks_holder_waiters_by_date if key in glocks_holder_waiters_counter.keys()}
+        holders_count_by_snapshot = glocks_columns.get_holders_count_by_snapshot([glocks_id[key] for key in glocks_holder_waiters_counter])
+        self.__glocks_holder_waiters_by_snapshot = {key: holders_count_by_snapshot[glocks_id[key]] for key in glocks_holder_waiters_counter}
 
     def graph(self, png_format=False):
-        if (self.__glocks_holder_waiters_by_date):
-            path_to_image_files = self.__generate_graphs_glocks_holder_waiter(self.__glocks_holder_waiters_by_date,
+        if (self.__glocks_holder_waiters_by_snapshot):
+            path_to_image_files = self.__generate_graphs_glocks_holder_waiter(self.__glocks_holder_waiters_by_snapshot,
                                                                               self.__snapshots_dt, png_format=png_format)
             if (path_to_image_files):
                 generate_graph_index_page(os.path.join(self.get_path_to_output_dir(),
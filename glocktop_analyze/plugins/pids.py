@@ -42,6 +42,11 @@ class Pids(Plugin):
                         snapshots, "Pids Stats", path_to_output_dir, options)
         self.__pids_in_snapshots = []
         self.__pids_using_multiple_glocks = []
+        # The counters that are updated as each snapshot is fed.
+        self.__pids_snapshot_count = {}
+        self.__pids_to_glocks = {}
+        # The "<type>/<inode>" of the glock whose holders are being visited.
+        self.__glock_type_inode = ""
 
         self.__mininum_snapshot_count = self.get_option("mininum_snapshot_count")
         self.__mininum_glocks_count = self.get_option("mininum_glocks_count")
@@ -51,15 +56,6 @@ class Pids(Plugin):
         for command in self.get_option("commands_to_ignore").split(","):
             self.__commands_to_ignore.append(command.strip())
 
-    def __encode(self, pid, command):
-        # Not sure what guranteees no duplicates, that command will not be empty
-        # sometimes and not-empty other, etc.
-        return "%s-%s" %(pid, command)
-
-    def __decode(self, hashkey):
-        hashkey_split = hashkey.split("-")
-        return (hashkey_split[0], hashkey_split[1])
-
     def __get_text(self, colorize=False):
         summary = ""
         if (self.__pids_in_snapshots):
@@ -78,37 +74,51 @@ class Pids(Plugin):
             summary =  "%s: %s\n\n%s\n" %(self.get_title(), self.get_description(), summary.strip())
         return summary
 
-    def analyze(self):
+    def begin(self):
+        Plugin.begin(self)
+        self.__pids_in_snapshots = []
+        self.__pids_using_multiple_glocks = []
+        self.__pids_snapshot_count = {}
+        self.__pids_to_glocks = {}
+
+    def visit_glock(self, snapshot, glock):
+        self.__glock_type_inode = "%s/%s" %(glock.get_type(), glock.get_inode())
+
+    def visit_glock_holder(self, snapshot, glock, glock_holder):
         # Need to create object to hold the pid, command,
-        pids_in_snapshots = {}
-        pids_to_glocks = {}
-        for snapshot in self.get_snapshots():
-            for glock in snapshot.get_glocks():
-                glock_type_inode = "%s/%s" %(glock.get_type(), glock.get_inode())
-                for glock_holder in glock.get_holders():
-                    hashkey = self.__encode(glock_holder.get_pid(), glock_holder.get_command())
-                    # Count the times a pid showed up in snapshot.
-                    if (not pids_in_snapshots.has_key(hashkey)):
-                        pids_in_snapshots[hashkey] = 0
-                    pids_in_snapshots[hashkey] += 1
-                    # Map pids and its glocks
-                    if (not pids_to_glocks.has_key(hashkey)):
-                        pids_to_glocks[hashkey] = ""
-                    if (not glock_type_inode in pids_to_glocks[hashkey]):
-                        pids_to_glocks[hashkey] += " %s" %(glock_type_inode)
+        pids_in_snapshots = self.__pids_snapshot_count
+        pids_to_glocks = self.__pids_to_glocks
+        glock_type_inode = self.__glock_type_inode
+        hashkey = (glock_holder.get_pid(), glock_holder.get_command())
+        # Count the times a pid showed up in snapshot.
+        if (not pids_in_snapshots.has_key(hashkey)):
+            pids_in_snapshots[hashkey] = 0
+        pids_in_snapshots[hashkey] += 1
+        # Map pids and its glocks
+        if (not pids_to_glocks.has_key(hashkey)):
+            pids_to_glocks[hashkey] = ""
+        if (not glock_type_inode in pids_to_glocks[hashkey]):
+            pids_to_glocks[hashkey] += " %s" %(glock_type_inode)
+
+    def finish(self):
+        Plugin.finish(self)
+        pids_in_snapshots = self.__pids_snapshot_count
+        pids_to_glocks = self.__pids_to_glocks
         # Create structure for pids showing in snapshots.
-        ordered_dict = OrderedDict(sorted(pids_in_snapshots.items(), key=lambda t: t[1], reverse=True))
+        # The pids with the same count are sorted by pid and command, so that the
+        # order does not depend on the order of the keys in the dict.
+        ordered_dict = OrderedDict(sorted(pids_in_snapshots.items(), key=lambda t: (-t[1], t[0])))
         for i in range(0, len(ordered_dict)):
             items = ordered_dict.items()[i]
-            (pid, command) = self.__decode(items[0])
+            (pid, command) = items[0]
             if (not command in self.__commands_to_ignore):
                 if (items[1] >= self.__mininum_snapshot_count):
                     self.__pids_in_snapshots.append([self.get_filesystem_name(), pid, command, items[1]])
 
-        ordered_dict = OrderedDict(sorted(pids_to_glocks.items(), key=lambda t: len(t[1]), reverse=True))
+        ordered_dict = OrderedDict(sorted(pids_to_glocks.items(), key=lambda t: (-len(t[1]), t[0])))
         for i in range(0, len(ordered_dict)):
             items = ordered_dict.items()[i]
-            (pid, command) = self.__decode(items[0])
+            (pid, command) = items[0]
             if (len(items[1].split()) >= self.__mininum_glocks_count):
                 # Change to string instead of list for value. do like glocks_high_demote_seconds.
                 self.__pids_using_multiple_glocks.append([self.get_filesystem_name(), pid, command, len(items[1].split()), items[1]])
@@ -37,65 +37,57 @@ class PidsFunction(Plugin):
         for command in self.get_option("commands_to_ignore").split(","):
             self.__commands_to_ignore.append(command.strip())
 
-    def __encode(self, pid, command):
-        # Not sure what guranteees no duplicates, that command will not be empty
-        # sometimes and not-empty other, etc.
-        return "%s-%s" %(pid, command)
-
-    def __decode(self, hashkey):
-        hashkey_split = hashkey.split("-")
-        return (hashkey_split[0], hashkey_split[1])
-
     def __get_text(self, colorize=False):
         summary = ""
         for gfs2_function in self.__gfs2_functions.keys():
             glocks = self.__gfs2_functions.get(gfs2_function)
-            for glock in glocks:
-                glock_hw = glock.get_holders()[0]
+            for (glock, glock_hw, call_trace) in glocks:
                 print glock
                 print "  %s" %(glock_hw)
-                for ct in glock_hw.get_call_trace():
+                for ct in call_trace:
                     print "  --> %s" %(ct)
                 print
         if (summary):
             summary =  "%s: %s\n\n%s\n" %(self.get_title(), self.get_description(), summary.strip())
         return summary
 
-    def analyze(self):
-        # Need to create object to hold the pid, command,
-        pids_in_snapshots = {}
-        pids_to_glocks = {}
-        for snapshot in self.get_snapshots():
-            for glock in snapshot.get_glocks():
-                if (glock.get_holders()):
-                    call_trace = glock.get_holders()[0].get_call_trace()
-                    if (call_trace):
-                        for gfs2_function in self.__gfs2_functions.keys():
-                            if (gfs2_function in call_trace):
-                                self.__gfs2_functions[gfs2_function].append(glock)
-                """
-                glock_type_inode = "%s/%s" %(glock.get_type(), glock.get_inode())
-                for glock_holder in glock.get_holders():
+    def begin(self):
+        Plugin.begin(self)
+        self.__gfs2_functions = {"gfs2_inplace_reserve":[], "gfs2_inplace_reserve":[]}
+
+    def visit_glock(self, snapshot, glock):
+        if (glock.get_holders()):
+            call_trace = glock.get_holders()[0].get_call_trace()
+            if (call_trace):
+                for gfs2_function in self.__gfs2_functions.keys():
+                    if (gfs2_function in call_trace):
+                        # Only the strings that are printed are kept, so the
+                        # snapshot is not held in memory.
+                        self.__gfs2_functions[gfs2_function].append((str(glock), str(glock.get_holders()[0]),
+                                                                     call_trace))
+        """
+            glock_type_inode = "%s/%s" %(glock.get_type(), glock.get_inode())
+            for glock_holder in glock.get_holders():
+                print glock_holder.get_function()
+                if (glock_holder.get_function() in self.__gfs2_functions.keys()):
                     print glock_holder.get_function()
-                    if (glock_holder.get_function() in self.__gfs2_functions.keys()):
-                        print glock_holder.get_function()
-                    hashkey = self.__encode(glock_holder.get_pid(), glock_holder.get_command())
-                    # Count the times a pid showed up in snapshot.
-                    if (not pids_in_snapshots.has_key(hashkey)):
-                        pids_in_snapshots[hashkey] = 0
-                    pids_in_snapshots[hashkey] += 1
-                    # Map pids and its glocks
-                    if (not pids_to_glocks.has_key(hashkey)):
-                        pids_to_glocks[hashkey] = ""
-                    if (not glock_type_inode in pids_to_glocks[hashkey]):
-                        pids_to_glocks[hashkey] += " %s" %(glock_type_inode)
-                """
+                hashkey = (glock_holder.get_pid(), glock_holder.get_command())
+                # Count the times a pid showed up in snapshot.
+                if (not pids_in_snapshots.has_key(hashkey)):
+                    pids_in_snapshots[hashkey] = 0
+                pids_in_snapshots[hashkey] += 1
+                # Map pids and its glocks
+                if (not pids_to_glocks.has_key(hashkey)):
+                    pids_to_glocks[hashkey] = ""
+                if (not glock_type_inode in pids_to_glocks[hashkey]):
+                    pids_to_glocks[hashkey] += " %s" %(glock_type_inode)
+            """
         """
         # Create structure for pids showing in snapshots.
         ordered_dict = OrderedDict(sorted(pids_in_snapshots.items(), key=lambda t: t[1], reverse=True))
         for i in range(0, len(ordered_dict)):
             items = ordered_dict.items()[i]
-            (pid, command) = self.__decode(items[0])
+            (pid, command) = items[0]
             if (not command in self.__commands_to_ignore):
                     self.__pids_in_snapshots.append([self.get_filesystem_name(), pid, command, items[1]])
         """
@@ -10,12 +10,17 @@
 * This plugin outputs the filesystem name, time when snapshot taken when dlm
   activity is greater than zero.
 
+* This plugin outputs the number of glocks that had the demote (D), demote
+  pending (d) or demote in progress (p) flag set in each snapshot that had at
+  least one of these glocks.
+
 """
 import logging
 import logging.handlers
 import os.path
 
 import glocktop_analyze
+from glocktop_analyze.glock import GLOCK_FLAG_DEMOTE, GLOCK_FLAG_DEMOTE_PENDING, GLOCK_FLAG_DEMOTE_IN_PROGRESS
 from glocktop_analyze.plugins import Plugin
 from glocktop_analyze.utilities import ColorizeConsoleText, write_to_file, tableize
 from glocktop_analyze.html import generate_css_header, generate_table
@@ -27,17 +32,23 @@ class Snapshots(Plugin):
                         "The stats for the snapshots and dlm activity.",
                         snapshots, "Snapshot Stats", path_to_output_dir,
                         options)
-        self.__start_time = self.get_snapshots_start_time()
-        self.__stop_time = self.get_snapshots_end_time()
         self.__snapshot_count = 0
         self.__dlm_activity = []
+        self.__glocks_demoting = []
+
+    def __get_glocks_demoting_table(self):
+        table = []
+        for (date_time, demote_count, demote_pending_count, demote_in_progress_count) in self.__glocks_demoting:
+            table.append([self.get_hostname(), self.get_filesystem_name(), date_time, str(demote_count),
+                          str(demote_pending_count), str(demote_in_progress_count)])
+        return table
 
     def __get_text(self, colorize=False):
         summary = ""
-        if (self.get_snapshots()):
+        if (self.__snapshot_count > 0):
             snapshots_summary = tableize([[self.get_hostname(), self.get_filesystem_name(),
-                                           str(self.__snapshot_count), self.__start_time,
-                                           self.__stop_time]],
+                                           str(self.__snapshot_count), self.get_snapshots_start_time(),
+                                           self.get_snapshots_end_time()]],
                                          ["Hostname", "Filesystem", "Snapshots",
                                           "Start Time", "Stop Time"], colorize=colorize).strip()
             if (snapshots_summary):
@@ -49,17 +60,50 @@ class Snapshots(Plugin):
                                             colorize=colorize).strip()
             if (dlm_activity_summary):
                 summary += "\nThe snapshots that contained at least 1 DLM waiter.\n%s\n" %(dlm_activity_summary)
+        if (self.__glocks_demoting):
+            glocks_demoting_summary = tableize(self.__get_glocks_demoting_table(),
+                                               ["Hostname", "Filesystem", "Snapshot Time", "Demote (D)",
+                                                "Demote Pending (d)", "Demote in Progress (p)"],
+                                               colorize=colorize).strip()
+            if (glocks_demoting_summary):
+                summary += "\nThe number of glocks with a demote flag set in the snapshots that contained at least 1 of them.\n%s\n" %(glocks_demoting_summary)
 
         if (summary):
             return "%s: %s\n%s\n" %(self.get_title(), self.get_description(), summary)
         return ""
 
-    def analyze(self):
-        for snapshot in self.get_snapshots():
-            self.__snapshot_count += 1
-            dlm_activity = snapshot.get_dlm_activity()
-            if (not dlm_activity == None):
-                self.__dlm_activity.append([self.get_hostname(), self.get_filesystem_name(), snapshot.get_date_time(), dlm_activity.get_waiter_count()])
+    def begin(self):
+        Plugin.begin(self)
+        self.__snapshot_count = 0
+        self.__dlm_activity = []
+        self.__glocks_demoting = []
+
+    def visit_snapshot(self, snapshot):
+        Plugin.visit_snapshot(self, snapshot)
+        self.__snapshot_count += 1
+        dlm_activity = snapshot.get_dlm_activity()
+        if (not dlm_activity == None):
+            self.__dlm_activity.append([self.get_hostname(), self.get_filesystem_name(), snapshot.get_date_time(), dlm_activity.get_waiter_count()])
+        # Count the glocks with each of the demote flags set with the bitmask of
+        # the flags of the glock.
+        demote_flags = GLOCK_FLAG_DEMOTE | GLOCK_FLAG_DEMOTE_PENDING | GLOCK_FLAG_DEMOTE_IN_PROGRESS
+        demote_count = 0
+        demote_pending_count = 0
+        demote_in_progress_count = 0
+        for glock in snapshot.get_glocks():
+            flags_bitmask = glock.get_flags_bitmask()
+            if (flags_bitmask & demote_flags):
+                if (flags_bitmask & GLOCK_FLAG_DEMOTE):
+                    demote_count += 1
+                if (flags_bitmask & GLOCK_FLAG_DEMOTE_PENDING):
+                    demote_pending_count += 1
+                if (flags_bitmask & GLOCK_FLAG_DEMOTE_IN_PROGRESS):
+                    demote_in_progress_count += 1
+        if ((demote_count > 0) or (demote_pending_count > 0) or (demote_in_progress_count > 0)):
+            # Only the counts are kept since there can be a row for every
+            # snapshot.
+            self.__glocks_demoting.append((snapshot.get_date_time(), demote_count, demote_pending_count,
+                                           demote_in_progress_count))
 
     def console(self):
         summary = self.__get_text(colorize=True)
@@ -78,7 +122,7 @@ class Snapshots(Plugin):
             bdata = ""
             if (self.__snapshot_count > 0):
                 bdata += generate_table([[self.get_hostname(), self.get_filesystem_name(), str(self.__snapshot_count),
-                                          self.__start_time, self.__stop_time]],
+                                          self.get_snapshots_start_time(), self.get_snapshots_end_time()]],
                                         ["Hostname", "Filesystem", "Snapshots", "Start Time", "Stop Time"],
                                         title="Snapshots Taken",
                                         description="The number of snapshots taken and the time that first and the last snapshot taken.")
@@ -88,6 +132,12 @@ class Snapshots(Plugin):
                                         ["Hostname", "Filesystem", "Snapshot Time", "Number of DLM Waiters"],
                                         title="DLM Waiter Count",
                                         description="The number of DLM waiters for a snapshot. Only snapshots with DLM waiter count higher than 0 displayed.")
+            if (self.__glocks_demoting):
+                bdata += generate_table(self.__get_glocks_demoting_table(),
+                                        ["Hostname", "Filesystem", "Snapshot Time", "Demote (D)",
+                                         "Demote Pending (d)", "Demote in Progress (p)"],
+                                        title="Glocks Demoting",
+                                        description="The number of glocks with the demote (D), demote pending (d) or demote in progress (p) flag set for a snapshot. Only snapshots with at least 1 of these glocks displayed.")
             if (bdata):
                 wdata = "%s\n%s\n%s" %(generate_css_header(include_css_table=True), bdata, generate_footer())
                 filename = "%s.html" %(self.get_title().lower().replace(" - ", "-").replace(" ", "_"))
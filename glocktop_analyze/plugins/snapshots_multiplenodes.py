@@ -27,12 +27,17 @@ class SnapshotsMultipleNodes(PluginMultinode):
                                  grouped_snapshots, "Snapshot Stats for Multiple Nodes", path_to_output_dir,
                                  options)
 
+        # The hostnames in the order that they were first fed.
+        self.__hostnames = []
         self.__start_time_for_hosts = {}
         self.__stop_time_for_hosts = {}
         self.__snapshot_count_for_hosts = {}
         self.__dlm_activity_for_hosts = {}
         self.__gs_glocks_total_lowest = {}
         self.__gs_glocks_total_highest = {}
+        # A list of rows for each group of snapshots taken around the same
+        # time.
+        self.__snapshots_table_by_group = []
 
     def __get_glocks_count_table(self, hostname, glocks_stats_lowest, glocks_stats_highest):
         try:
@@ -62,8 +67,8 @@ class SnapshotsMultipleNodes(PluginMultinode):
         snapshots_table = []
         dlm_activity_table = []
         glocks_stats_totals_table = []
-        for hostname in self.get_hostnames():
-            if (self.get_snapshots(hostname)):
+        for hostname in self.__hostnames:
+            if (self.__snapshot_count_for_hosts.get(hostname, 0) > 0):
                 snapshots_table.append([hostname, self.get_filesystem_name(),
                                         str(self.__snapshot_count_for_hosts.get(hostname)),
                                         str(self.__start_time_for_hosts.get(hostname)),
@@ -100,56 +105,70 @@ class SnapshotsMultipleNodes(PluginMultinode):
                                             "Number of DLM Waiters"],
                                            colorize).strip())
         # Group the snapshots together based on time snapshot taken.
-        grouped_snapshots = self.get_snapshots_by_group()
-        group_count_sorted = grouped_snapshots.keys()
-        group_count_sorted.sort()
         snapshots_table_by_group = ""
-        for group_count in group_count_sorted:
-            gsnapshots = grouped_snapshots.get(group_count)
-            gtable = []
-            for gsnapshot in gsnapshots:
-                gtable.append([gsnapshot.get_hostname(),
-                               gsnapshot.get_filesystem_name(),
-                               gsnapshot.get_date_time()])
+        for gtable in self.__snapshots_table_by_group:
             snapshots_table_by_group  +=  "%s\n\n" %(tableize(gtable, ["Hostname", "Filesystem",
                                                                       "Snapshot Time"], colorize)).strip()
         if (snapshots_table_by_group):
             summary += "Snapshots Grouped by Time Snapshot Taken\n%s" %(snapshots_table_by_group)
         return summary
 
-    def analyze(self):
-        for hostname in self.get_hostnames():
-            date_time = self.get_snapshots_start_time(hostname)
-            if (not date_time == None):
-                self.__start_time_for_hosts[hostname] = date_time
-            date_time = self.get_snapshots_end_time(hostname)
-            if (not date_time == None):
-                self.__stop_time_for_hosts[hostname] = date_time
-            self.__snapshot_count_for_hosts[hostname] = len(self.get_snapshots(hostname))
-
-        for snapshot in self.get_snapshots():
-            hostname = snapshot.get_hostname()
-            dlm_activity = snapshot.get_dlm_activity()
-            if (not dlm_activity == None):
-                if (not self.__dlm_activity_for_hosts.has_key(hostname)):
-                    self.__dlm_activity_for_hosts[hostname] = []
-                    dlm_activity_data = [hostname,
-                                         self.get_filesystem_name(),
-                                         snapshot.get_date_time(),
-                                         dlm_activity.get_waiter_count()]
-                    self.__dlm_activity_for_hosts[hostname].append(dlm_activity_data)
-            # Get the lowest and  highest glock totals
-            glocks_stats = snapshot.get_glocks_stats()
-            if (not glocks_stats == None):
-                if (not self.__gs_glocks_total_lowest.has_key(hostname)):
-                    self.__gs_glocks_total_lowest[hostname] = glocks_stats
-                elif (glocks_stats.get_glocks_count() <= self.__gs_glocks_total_lowest[hostname].get_glocks_count()):
-                    self.__gs_glocks_total_lowest[hostname] = glocks_stats
-
-                if (not self.__gs_glocks_total_highest.has_key(hostname)):
-                    self.__gs_glocks_total_highest[hostname] = glocks_stats
-                elif (glocks_stats.get_glocks_count() >= self.__gs_glocks_total_highest[hostname].get_glocks_count()):
-                    self.__gs_glocks_total_highest[hostname] = glocks_stats
+    def begin(self):
+        PluginMultinode.begin(self)
+        self.__hostnames = []
+        self.__start_time_for_hosts = {}
+        self.__stop_time_for_hosts = {}
+        self.__snapshot_count_for_hosts = {}
+        self.__dlm_activity_for_hosts = {}
+        self.__gs_glocks_total_lowest = {}
+        self.__gs_glocks_total_highest = {}
+        self.__snapshots_table_by_group = []
+
+    def feed_group(self, snapshots):
+        gtable = []
+        for gsnapshot in snapshots:
+            gtable.append([gsnapshot.get_hostname(),
+                           gsnapshot.get_filesystem_name(),
+                           gsnapshot.get_date_time()])
+        self.__snapshots_table_by_group.append(gtable)
+        PluginMultinode.feed_group(self, snapshots)
+
+    def visit_snapshot(self, snapshot):
+        PluginMultinode.visit_snapshot(self, snapshot)
+        hostname = snapshot.get_hostname()
+        date_time = snapshot.get_date_time()
+        if (not hostname in self.__hostnames):
+            self.__hostnames.append(hostname)
+            self.__snapshot_count_for_hosts[hostname] = 0
+        if ((not self.__start_time_for_hosts.has_key(hostname)) or
+            (date_time < self.__start_time_for_hosts.get(hostname))):
+            self.__start_time_for_hosts[hostname] = date_time
+        if ((not self.__stop_time_for_hosts.has_key(hostname)) or
+            (date_time > self.__stop_time_for_hosts.get(hostname))):
+            self.__stop_time_for_hosts[hostname] = date_time
+        self.__snapshot_count_for_hosts[hostname] += 1
+
+        dlm_activity = snapshot.get_dlm_activity()
+        if (not dlm_activity == None):
+            if (not self.__dlm_activity_for_hosts.has_key(hostname)):
+                self.__dlm_activity_for_hosts[hostname] = []
+                dlm_activity_data = [hostname,
+                                     self.get_filesystem_name(),
+                                     snapshot.get_date_time(),
+                                     dlm_activity.get_waiter_count()]
+                self.__dlm_activity_for_hosts[hostname].append(dlm_activity_data)
+        # Get the lowest and  highest glock totals
+        glocks_stats = snapshot.get_glocks_stats()
+        if (not glocks_stats == None):
+            if (not self.__gs_glocks_total_lowest.has_key(hostname)):
+                self.__gs_glocks_total_lowest[hostname] = glocks_stats
+            elif (glocks_stats.get_glocks_count() <= self.__gs_glocks_total_lowest[hostname].get_glocks_count()):
+                self.__gs_glocks_total_lowest[hostname] = glocks_stats
+
+            if (not self.__gs_glocks_total_highest.has_key(hostname)):
+                self.__gs_glocks_total_highest[hostname] = glocks_stats
+            elif (glocks_stats.get_glocks_count() >= self.__gs_glocks_total_highest[hostname].get_glocks_count()):
+                self.__gs_glocks_total_highest[hostname] = glocks_stats
 
     def console(self):
         summary = self.__get_text(colorize=True)
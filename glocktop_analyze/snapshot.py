@@ -18,6 +18,13 @@ class Snapshot():
         self.__show_ended_process_and_tlocks = show_ended_process_and_tlocks
 
         self.__glocks = []
+        # The glocks without ended processes and tlocks. It is created the
+        # first time get_glocks() is called after a glock was added.
+        self.__glocks_filtered = None
+        # A map of the (type, inode) of a glock to the glock for the glocks
+        # returned by get_glocks(). It is created the first time find_glock() is
+        # called after a glock was added.
+        self.__glocks_index = None
         self.__glocks_stats = None
 
 
@@ -38,16 +45,22 @@ class Snapshot():
 
     def add_glock(self, glock):
         self.__glocks.append(glock)
+        self.__glocks_filtered = None
+        self.__glocks_index = None
 
     def get_glocks(self):
+        # The list that is returned should not be modified since the same list
+        # is returned until a glock is added.
         if (not self.__show_ended_process_and_tlocks):
-            glocks_not_ended_process = []
-            for g in self.__glocks:
-                if (not g == None):
-
-                    if (not ((g.has_ended_process()) or (g.get_type() == 1))):
-                        glocks_not_ended_process.append(g)
-            return glocks_not_ended_process
+            if (self.__glocks_filtered == None):
+                glocks_not_ended_process = []
+                for g in self.__glocks:
+                    if (not g == None):
+
+                        if (not ((g.has_ended_process()) or (g.get_type() == 1))):
+                            glocks_not_ended_process.append(g)
+                self.__glocks_filtered = glocks_not_ended_process
+            return self.__glocks_filtered
         return self.__glocks
 
     def get_glock_holders(self):
@@ -60,10 +73,15 @@ class Snapshot():
         return glock_holders
 
     def find_glock(self, glock_type, glock_inode):
-        for glock in self.get_glocks():
-            if ((glock_type == str(glock.get_type())) and (glock_inode == str(glock.get_inode()))):
-                return glock
-        return None
+        # Returns the glock with the type and inode or None if the glock is not
+        # in this snapshot. The type and inode can be strings or integers.
+        if (self.__glocks_index == None):
+            glocks_index = {}
+            for glock in self.get_glocks():
+                # The first glock found is returned if there are duplicates.
+                glocks_index.setdefault((str(glock.get_type()), str(glock.get_inode())), glock)
+            self.__glocks_index = glocks_index
+        return self.__glocks_index.get((str(glock_type), str(glock_inode)))
 
     def get_glocks_stats(self):
         return self.__glocks_stats
@@ -74,6 +92,16 @@ class Snapshot():
     def get_dlm_activity(self):
         return self.__dlm_activity
 
+def find_glock_in_snapshots(snapshots, glock_type, glock_inode):
+    # Returns a list of (snapshot, glock) for the snapshots that have the glock
+    # with the type and inode, in the order of the snapshots.
+    snapshots_glock = []
+    for snapshot in snapshots:
+        glock = snapshot.find_glock(glock_type, glock_inode)
+        if (not glock == None):
+            snapshots_glock.append((snapshot, glock))
+    return snapshots_glock
+
 class DLMActivity():
     def __init__(self, dlm_dirtbl_size, dlm_rsbtbl_size, dlm_lkbtbl_size, waiter_count):
         self.__dlm_dirtbl_size = dlm_dirtbl_size
@@ -14,12 +14,26 @@ import os
 import os.path
 import re
 import locale
+import gzip
+import bz2
 from copy import deepcopy
 import copy
 locale.setlocale(locale.LC_NUMERIC, "")
 import textwrap
 
 import glocktop_analyze
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+# The first bytes of a compressed file and the compression type.
+COMPRESSION_MAGIC_BYTES = [("\x1f\x8b", "gz"),
+                           ("BZh", "bz2"),
+                           ("\xfd7zXZ\x00", "xz")]
 
 # ##############################################################################
 # Classes
@@ -362,23 +376,58 @@ def tableize(rows, header, colorize=True):
             formatted_table += row_string + "\n"
     return formatted_table
 
+def get_compression_type(path_to_filename):
+    # Returns the compression type of the file found with the magic bytes at the
+    # start of the file or an empty string if the file is not compressed.
+    try:
+        fin = open(path_to_filename, "rb")
+        try:
+            magic_bytes = fin.read(6)
+        finally:
+            fin.close()
+    except (IOError, os.error):
+        return ""
+    for (magic, compression_type) in COMPRESSION_MAGIC_BYTES:
+        if (magic_bytes.startswith(magic)):
+            return compression_type
+    return ""
+
+def open_file(path_to_filename):
+    # Returns a file object for reading the file. If the file is compressed
+    # then the file object decompresses the data as it is read, so the
+    # uncompressed data is never written to disk or fully held in memory. An
+    # IOError is raised if the file cannot be read.
+    compression_type = get_compression_type(path_to_filename)
+    if (compression_type == "gz"):
+        return gzip.GzipFile(path_to_filename, "rb")
+    elif (compression_type == "bz2"):
+        return bz2.BZ2File(path_to_filename, "r")
+    elif (compression_type == "xz"):
+        if (lzma == None):
+            raise IOError("The python module lzma (backports.lzma) is required to read xz files: %s" %(path_to_filename))
+        return lzma.LZMAFile(path_to_filename, "r")
+    return open(path_to_filename, "r")
+
 def get_data_from_file(path_to_filename, strip_leading_character=True) :
+    return list(get_lines_from_file(path_to_filename, strip_leading_character))
+
+def get_lines_from_file(path_to_filename, strip_leading_character=True) :
+    # A generator that returns one line at a time, so the file is never fully
+    # read into memory. Compressed files are decompressed while reading.
     if (len(path_to_filename) > 0) :
         try:
-            fin = open(path_to_filename, "r")
-            data = fin.readlines()
-            fin.close()
-            mod_data = []
-            for line in data:
-                if (strip_leading_character):
-                    mod_data.append(line.strip())
-                else:
-                    mod_data.append(line.rstrip())
-            return mod_data
-        except (IOError, os.error):
+            fin = open_file(path_to_filename)
+            try:
+                for line in fin:
+                    if (strip_leading_character):
+                        yield line.strip()
+                    else:
+                        yield line.rstrip()
+            finally:
+                fin.close()
+        except (IOError, EOFError, os.error):
             message = "An error occured reading the file: %s." %(path_to_filename)
             logging.getLogger(glocktop_analyze.MAIN_LOGGER_NAME).error(message)
-    return []
 
 def mkdirs(path_to_dir):
     if (os.path.isdir(path_to_dir)):
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+"""
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  0.1
+@copyright :  GPLv3
+"""
+from collections import deque
+
+class WaitForGraph():
+    # A wait-for graph where there is an edge from a waiter to each holder of
+    # the glock that it is waiting on. The nodes can be any hashable key, for
+    # example a pid. Each edge has the label of the first glock that was added
+    # for the edge.
+    #
+    # The strongly connected components are found with an iterative version of
+    # Tarjan's algorithm, so the graph is walked once and the depth of the
+    # graph is not limited by the recursion limit.
+    def __init__(self):
+        # The nodes in the order they were added.
+        self.__nodes = []
+        # A map of each node to the list of nodes that it waits on.
+        self.__edges = {}
+        # A map of (waiter, holder) to the label of the edge.
+        self.__edges_labels = {}
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def add_node(self, node):
+        if (not self.__edges.has_key(node)):
+            self.__nodes.append(node)
+            self.__edges[node] = []
+
+    def add_edge(self, waiter, holder, label=None):
+        if (self.__edges_labels.has_key((waiter, holder))):
+            return
+        self.add_node(waiter)
+        self.add_node(holder)
+        self.__edges[waiter].append(holder)
+        self.__edges_labels[(waiter, holder)] = label
+
+    def get_nodes(self):
+        return self.__nodes
+
+    def get_edges(self, node):
+        # Returns the list of nodes that the node waits on.
+        return self.__edges.get(node, [])
+
+    def get_edges_count(self):
+        return len(self.__edges_labels)
+
+    def get_edge_label(self, waiter, holder):
+        return self.__edges_labels.get((waiter, holder))
+
+    def get_strongly_connected_components(self):
+        # Returns a list of the strongly connected components. Each component is
+        # a list of nodes. A component is returned before any component that
+        # waits on it, so the nodes a component waits on are always in a
+        # component that comes before it.
+        edges = self.__edges
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in self.__nodes:
+            if (index.has_key(root)):
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            # The nodes being walked with an iterator of the nodes they wait on
+            # that have not been walked yet.
+            work = [(root, iter(edges[root]))]
+            while (work):
+                node, successors = work[-1]
+                for successor in successors:
+                    if (not index.has_key(successor)):
+                        index[successor] = lowlink[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(edges[successor])))
+                        break
+                    elif ((successor in on_stack) and (index[successor] < lowlink[node])):
+                        lowlink[node] = index[successor]
+                else:
+                    # All the nodes that the node waits on have been walked.
+                    work.pop()
+                    if ((work) and (lowlink[node] < lowlink[work[-1][0]])):
+                        lowlink[work[-1][0]] = lowlink[node]
+                    if (lowlink[node] == index[node]):
+                        component = []
+                        while (True):
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if (member == node):
+                                break
+                        components.append(component)
+        return components
+
+    def __get_path(self, start, end, members):
+        # Returns the shortest list of nodes in members that starts with the
+        # start node where each node waits on the next node and the last node
+        # waits on the end node.
+        parents = {start: None}
+        queue = deque([start])
+        while (queue):
+            node = queue.popleft()
+            for successor in self.__edges[node]:
+                if (successor == end):
+                    path = [node]
+                    while (not parents[path[-1]] == None):
+                        path.append(parents[path[-1]])
+                    path.reverse()
+                    return path
+                elif ((successor in members) and (not parents.has_key(successor))):
+                    parents[successor] = node
+                    queue.append(successor)
+        return []
+
+    def get_cycles(self, components=None, required_edge=None):
+        # Returns a list of cycles with one cycle for each strongly connected
+        # component that has more than one node or a node that waits on
+        # itself. Each cycle is a list of nodes where each node waits on the
+        # next node and the last node waits on the first node.
+        #
+        # If required_edge is not None then it is called with (waiter, holder)
+        # and only the cycles with an edge that it returns True for are
+        # returned. The cycle starts with the waiter of that edge.
+        if (components == None):
+            components = self.get_strongly_connected_components()
+        cycles = []
+        nodes_order = None
+        for component in components:
+            if ((len(component) > 1) or (component[0] in self.__edges[component[0]])):
+                if (nodes_order == None):
+                    nodes_order = dict(zip(self.__nodes, range(0, len(self.__nodes))))
+                members = set(component)
+                component = sorted(component, key=nodes_order.get)
+                if (required_edge == None):
+                    # The cycle starts with the node of the component that was
+                    # added first.
+                    cycles.append(self.__get_path(component[0], component[0], members))
+                    continue
+                for waiter in component:
+                    holders = [holder for holder in self.__edges[waiter]
+                               if ((holder in members) and (required_edge(waiter, holder)))]
+                    if (holders):
+                        if (holders[0] == waiter):
+                            cycles.append([waiter])
+                        else:
+                            cycles.append([waiter] + self.__get_path(holders[0], waiter, members))
+                        break
+        return cycles
+
+    def get_longest_chain(self, components=None, required_edge=None):
+        # Returns the longest list of nodes where each node waits on the next
+        # node. The edges inside of a strongly connected component are not
+        # followed, so the chain does not contain a cycle.
+        #
+        # If required_edge is not None then it is called with (waiter, holder)
+        # and the longest chain with an edge that it returns True for is
+        # returned. An empty list is returned if there is no chain with that
+        # edge.
+        if (components == None):
+            components = self.get_strongly_connected_components()
+        component_of_node = {}
+        for component_index in range(0, len(components)):
+            for node in components[component_index]:
+                component_of_node[node] = component_index
+        # The components are in the order that the nodes they wait on come
+        # first, so the chain length of the nodes waited on is already known.
+        # The length of the longest chain of a node that has a required edge
+        # is 0 when there is no such chain.
+        chain_length = {}
+        next_node = {}
+        required_chain_length = {}
+        required_next_node = {}
+        for component_index in range(0, len(components)):
+            for node in components[component_index]:
+                length = 1
+                required_length = 0
+                for successor in self.__edges[node]:
+                    if (component_of_node[successor] == component_index):
+                        continue
+                    if (chain_length[successor] + 1 > length):
+                        length = chain_length[successor] + 1
+                        next_node[node] = successor
+                    if (not required_edge == None):
+                        # A chain with a required edge either starts with the
+                        # required edge or the rest of the chain has one.
+                        if ((required_chain_length[successor] > 0) and
+                            (required_chain_length[successor] + 1 > required_length)):
+                            required_length = required_chain_length[successor] + 1
+                            required_next_node[node] = (successor, True)
+                        if ((chain_length[successor] + 1 > required_length) and
+                            (required_edge(node, successor))):
+                            required_length = chain_length[successor] + 1
+                            required_next_node[node] = (successor, False)
+                chain_length[node] = length
+                required_chain_length[node] = required_length
+        chain = []
+        if (required_edge == None):
+            for node in self.__nodes:
+                if ((not chain) or (chain_length[node] > chain_length[chain[0]])):
+                    chain = [node]
+            while (chain and next_node.has_key(chain[-1])):
+                chain.append(next_node[chain[-1]])
+            return chain
+        for node in self.__nodes:
+            if ((required_chain_length[node] > 0) and
+                ((not chain) or (required_chain_length[node] > required_chain_length[chain[0]]))):
+                chain = [node]
+        # Follow the chain until the required edge, then follow the longest
+        # chain.
+        is_required = True
+        while (chain):
+            if (is_required):
+                if (not required_next_node.has_key(chain[-1])):
+                    break
+                successor, is_required = required_next_node[chain[-1]]
+            elif (next_node.has_key(chain[-1])):
+                successor = next_node[chain[-1]]
+            else:
+                break
+            chain.append(successor)
+        return chain